@@ -73,8 +73,8 @@ def main():
     # Check Ollama
     print("🔍 Checking Ollama...")
     try:
-        import requests
-        response = requests.get('http://localhost:11434/api/tags', timeout=2)
+        from core import http_client
+        response = http_client.get('http://localhost:11434/api/tags', timeout=2, retry=False)
         if response.status_code == 200:
             print("✅ Ollama is running!")
             print("ℹ️  Note: If Ollama is slow, fallback templates will be used\n")
@@ -0,0 +1 @@
+"""Offline benchmarks for JARVIS (run with: python -m benchmarks.run)"""
@@ -0,0 +1,72 @@
+"""
+Benchmark corpus: English, Hindi and Hinglish commands
+Each entry is what the user says plus the tool calls the fake Ollama
+server answers with (none = plain chat reply). Commands the intent router
+handles directly never reach the server.
+"""
+
+from typing import Any, Dict, List
+
+
+def _call(name: str, **arguments) -> Dict[str, Any]:
+    return {"name": name, "arguments": arguments}
+
+
+CORPUS: List[Dict[str, Any]] = [
+    # --- English ---
+    {"text": "what time is it", "lang": "en", "tool_calls": [_call("get_current_time")]},
+    {"text": "what's today's date", "lang": "en", "tool_calls": [_call("get_current_date")]},
+    {"text": "play some relaxing music", "lang": "en",
+     "tool_calls": [_call("play_music", query="relaxing music")]},
+    {"text": "search google for the best biryani recipe", "lang": "en",
+     "tool_calls": [_call("google_search", search_term="best biryani recipe")]},
+    {"text": "what's the weather in Mumbai", "lang": "en", "tool_calls": [_call("get_weather", city="Mumbai")]},
+    {"text": "open github.com", "lang": "en", "tool_calls": [_call("open_website", url="https://github.com")]},
+    {"text": "remember that my wifi password is sunshine42", "lang": "en",
+     "tool_calls": [_call("remember_fact", key="wifi password", value="sunshine42")]},
+    {"text": "what did I tell you about my wifi password", "lang": "en",
+     "tool_calls": [_call("search_memory", query="wifi password")]},
+    {"text": "take a screenshot", "lang": "en", "tool_calls": [_call("take_screenshot")]},
+    {"text": "tell me the time and the weather in Delhi", "lang": "en",
+     "tool_calls": [_call("get_current_time"), _call("get_weather", city="Delhi")]},
+    {"text": "explain what a binary search tree is", "lang": "en", "tool_calls": []},
+    {"text": "how are you doing today", "lang": "en", "tool_calls": []},
+    {"text": "summarize the file notes.txt", "lang": "en",
+     "tool_calls": [_call("summarize_file", filepath="notes.txt")]},
+
+    # --- Hindi (Devanagari) ---
+    {"text": "समय क्या हुआ है", "lang": "hi", "tool_calls": [_call("get_current_time")]},
+    {"text": "आज की तारीख बताओ", "lang": "hi", "tool_calls": [_call("get_current_date")]},
+    {"text": "गाना बजाओ", "lang": "hi", "tool_calls": [_call("play_music")]},
+    {"text": "दिल्ली का मौसम कैसा है", "lang": "hi", "tool_calls": [_call("get_weather", city="Delhi")]},
+    {"text": "यूट्यूब खोलो", "lang": "hi", "tool_calls": [_call("play_youtube")]},
+    {"text": "गूगल पर क्रिकेट स्कोर खोजो", "lang": "hi",
+     "tool_calls": [_call("google_search", search_term="cricket score")]},
+    {"text": "मुझे एक कहानी सुनाओ", "lang": "hi", "tool_calls": []},
+    {"text": "याद रखना कि मेरी चाबी दराज में है", "lang": "hi",
+     "tool_calls": [_call("remember_fact", key="chabi", value="daraaz me")]},
+
+    # --- Hinglish ---
+    {"text": "youtube kholo aur gaana bajao", "lang": "hinglish", "tool_calls": [_call("play_youtube")]},
+    {"text": "arijit singh ka gaana bajao", "lang": "hinglish",
+     "tool_calls": [_call("play_music", query="arijit singh")]},
+    {"text": "kya time hua hai", "lang": "hinglish", "tool_calls": [_call("get_current_time")]},
+    {"text": "aaj ki date batao", "lang": "hinglish", "tool_calls": [_call("get_current_date")]},
+    {"text": "jaipur ka mausam batao", "lang": "hinglish", "tool_calls": [_call("get_weather", city="Jaipur")]},
+    {"text": "volume thoda badhao", "lang": "hinglish", "tool_calls": [_call("adjust_volume", direction="up")]},
+    {"text": "google pe python tutorial search karo", "lang": "hinglish",
+     "tool_calls": [_call("google_search", search_term="python tutorial")]},
+    {"text": "yaad rakhna ki kal meeting 10 baje hai", "lang": "hinglish",
+     "tool_calls": [_call("remember_fact", key="meeting", value="kal 10 baje")]},
+    {"text": "meeting kab hai yaad hai kya", "lang": "hinglish",
+     "tool_calls": [_call("search_memory", query="meeting")]},
+    {"text": "screenshot le lo", "lang": "hinglish", "tool_calls": [_call("take_screenshot")]},
+    {"text": "mujhe machine learning samjhao", "lang": "hinglish", "tool_calls": []},
+    {"text": "trending hindi songs chalao", "lang": "hinglish",
+     "tool_calls": [_call("play_trending_song", language="hindi")]},
+]
+
+
+def script_for(corpus: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fake-server script for a corpus"""
+    return {item["text"]: {"tool_calls": item["tool_calls"]} for item in corpus}
@@ -0,0 +1,235 @@
+"""
+Local stand-in for the Ollama HTTP API
+Speaks enough of /api/tags, /api/chat and /api/generate (streaming and
+non-streaming) for JarvisEngine to run unchanged against it, with:
+- Scripted tool calls per user command
+- Configurable latency: prompt processing per 1k tokens, time to first token, per-token time
+- Counters for requests, prompt tokens and tool calls the engine didn't offer
+"""
+
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+DEFAULT_REPLY = "Done! Anything else I can help you with?"
+
+
+def script_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class FakeOllamaServer:
+    """
+    Usage:
+        script = {"gaana bajao": {"tool_calls": [{"name": "play_music", "arguments": {}}]}}
+        with FakeOllamaServer(script, token_ms=5) as server:
+            os.environ["OLLAMA_HOST"] = server.url
+            ...
+    """
+
+    def __init__(self, script: Optional[Dict[str, Dict[str, Any]]] = None, model: str = "llama3.2",
+                 host: str = "127.0.0.1", port: int = 0, prompt_ms_per_1k: float = 0.0,
+                 first_token_ms: float = 0.0, token_ms: float = 0.0):
+        """
+        Args:
+            script: User command -> {"tool_calls": [{"name", "arguments"}], "reply": str}
+            model: Model name reported by /api/tags
+            host, port: Bind address (port 0 picks a free port)
+            prompt_ms_per_1k: Simulated prompt evaluation time per 1000 prompt tokens
+            first_token_ms: Simulated delay before the first generated token
+            token_ms: Simulated delay per generated token
+        """
+        self.script = {script_key(text): entry for text, entry in (script or {}).items()}
+        self.model = model
+        self.prompt_ms_per_1k = prompt_ms_per_1k
+        self.first_token_ms = first_token_ms
+        self.token_ms = token_ms
+
+        self.stats = {"requests": 0, "chat": 0, "generate": 0, "prompt_tokens": 0,
+                      "tool_calls": 0, "unoffered_tool_calls": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+
+    def chat_turn(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Scripted assistant message for the conversation so far"""
+        last_user = None
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].get("role") == "user":
+                last_user = index
+                break
+        if last_user is None:
+            return {"role": "assistant", "content": DEFAULT_REPLY}
+
+        entry = self.script.get(script_key(messages[last_user].get("content") or ""), {})
+        tool_results = [m for m in messages[last_user + 1:] if m.get("role") == "tool"]
+        calls = entry.get("tool_calls") or []
+        if calls and not tool_results:
+            offered = {(tool.get("function") or {}).get("name") for tool in tools or []}
+            self._count(tool_calls=len(calls),
+                        unoffered_tool_calls=sum(1 for call in calls if call["name"] not in offered))
+            return {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{"function": {"name": call["name"], "arguments": call.get("arguments", {})}}
+                               for call in calls]
+            }
+        return {"role": "assistant", "content": entry.get("reply") or DEFAULT_REPLY}
+
+    def prompt_tokens(self, *parts: Any) -> int:
+        return sum(len(json.dumps(part, ensure_ascii=False)) for part in parts if part) // 4
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, delayed ACKs add ~40 ms per request
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, payload: Dict[str, Any], status: int = 200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                server._count(requests=1)
+                if self.path.rstrip("/") == "/api/tags":
+                    self._send_json({"models": [{
+                        "name": f"{server.model}:latest",
+                        "model": f"{server.model}:latest",
+                        "modified_at": _now(),
+                        "size": 0,
+                        "digest": "0" * 64,
+                        "details": {"format": "gguf", "family": "llama"}
+                    }]})
+                elif self.path.rstrip("/") == "/api/version":
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                server._count(requests=1)
+                request = self._read_json()
+                path = self.path.rstrip("/")
+                if path == "/api/chat":
+                    server._count(chat=1)
+                    message = server.chat_turn(request.get("messages") or [], request.get("tools"))
+                    prompt_tokens = server.prompt_tokens(request.get("messages"), request.get("tools"))
+                    self._respond(request, prompt_tokens, message=message)
+                elif path == "/api/generate":
+                    server._count(generate=1)
+                    prompt_tokens = server.prompt_tokens(request.get("system"), request.get("prompt"))
+                    self._respond(request, prompt_tokens, text=DEFAULT_REPLY)
+                elif path == "/api/pull":
+                    self._send_json({"status": "success"})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def _respond(self, request: Dict[str, Any], prompt_tokens: int,
+                         message: Optional[Dict[str, Any]] = None, text: Optional[str] = None):
+                server._count(prompt_tokens=prompt_tokens)
+                started = time.perf_counter()
+                time.sleep((server.prompt_ms_per_1k * prompt_tokens / 1000 + server.first_token_ms) / 1000)
+
+                content = message["content"] if message is not None else text
+                tokens = [word + " " for word in content.split()] or [""]
+                final = {
+                    "model": request.get("model", server.model),
+                    "created_at": _now(),
+                    "done": True,
+                    "done_reason": "stop",
+                    "prompt_eval_count": prompt_tokens,
+                    "eval_count": len(tokens),
+                }
+
+                if not request.get("stream", True):
+                    time.sleep(server.token_ms * len(tokens) / 1000)
+                    final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                    if message is not None:
+                        final["message"] = message
+                    else:
+                        final["response"] = content
+                    self._send_json(final)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in tokens:
+                    time.sleep(server.token_ms / 1000)
+                    chunk = {"model": final["model"], "created_at": _now(), "done": False}
+                    if message is not None:
+                        chunk["message"] = {"role": "assistant", "content": token}
+                    else:
+                        chunk["response"] = token
+                    self._write_chunk(chunk)
+                final["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                if message is not None:
+                    # Tool calls arrive with the final chunk, like Ollama's
+                    final["message"] = {"role": "assistant", "content": "",
+                                        **({"tool_calls": message["tool_calls"]} if message.get("tool_calls") else {})}
+                else:
+                    final["response"] = ""
+                self._write_chunk(final)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
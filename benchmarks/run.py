@@ -0,0 +1,346 @@
+"""
+Offline end-to-end latency benchmark for JarvisEngine
+
+Runs the English/Hindi/Hinglish corpus through the real engine, registry
+and skills against a local fake Ollama server, then reports:
+- Startup: imports, skill loading, engine init
+- Per-stage latency percentiles (from the per-turn traces)
+- End-to-end latency per language, throughput and memory
+- Micro timings for the intent router and Hinglish normalizer
+- Routing: turns whose called tools (direct route or LLM) differ from the
+  corpus's expected tool_calls
+
+Tools run in dry-run mode (arguments are validated, the skill isn't
+called) unless --execute-tools is given.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --rounds 5 --token-ms 20 --prompt-ms-per-1k 400 --json results.json
+    python -m benchmarks.run --baseline results.json      # exit code 1 on regressions or misroutes
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import CORPUS, script_for
+from benchmarks.fake_ollama import FakeOllamaServer
+
+SKILLS_DIR = str(Path(__file__).parent.parent / "skill")
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    from core.tracing import percentile
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+def _walk(span: Dict[str, Any]):
+    yield span
+    for child in span.get("children", []):
+        yield from _walk(child)
+
+
+def _dry_run_tools(registry) -> int:
+    """Swap every skill function for a stub; argument validation still runs"""
+    registry.get_all_functions()
+    for name, (function, validator) in list(registry._dispatch.items()):
+        registry._dispatch[name] = (
+            lambda _name=name, **kwargs: {"status": "success", "tool": _name, "dry_run": True},
+            validator
+        )
+    return len(registry._dispatch)
+
+
+def _record_tool_calls(registry, calls: List[str]):
+    """
+    Append the name of every tool the engine runs (direct route or LLM) to
+    calls. Unknown tools and rejected arguments raise before the append.
+    """
+    execute_skill = registry.execute_skill
+
+    def recording(function_name, function_args=None):
+        result = execute_skill(function_name, function_args)
+        calls.append(function_name)
+        return result
+
+    registry.execute_skill = recording
+
+
+def _rss_mb() -> float:
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+def _micro(texts: List[str], rounds: int = 200) -> Dict[str, float]:
+    """Microseconds per utterance for the routing front end (uncached paths)"""
+    from core.intent_router import intent_router
+    from core.indian_language import indian_language
+
+    results = {}
+    for name, function in (("intent_router.route", intent_router.route),
+                           ("intent_router.categorize", intent_router.categorize),
+                           ("indian_language.analyze", indian_language._analyze_uncached)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                function(text)
+        results[name] = round((time.perf_counter() - start) / (rounds * len(texts)) * 1e6, 2)
+    return results
+
+
+def run(args) -> Dict[str, Any]:
+    corpus = [item for item in CORPUS if item["lang"] in args.langs]
+    workdir = tempfile.mkdtemp(prefix="jarvis-bench-")
+
+    # Isolated state: memory DB, recall index and traces live in a temp home
+    os.environ["HOME"] = workdir
+    os.environ["JARVIS_MEMORY_DB"] = os.path.join(workdir, "memory.db")
+    os.environ["JARVIS_TRACE_FILE"] = os.path.join(workdir, "traces.jsonl")
+    os.environ.setdefault("OLLAMA_MODEL", "llama3.2")
+
+    server = FakeOllamaServer(
+        script_for(corpus),
+        model=os.environ["OLLAMA_MODEL"],
+        prompt_ms_per_1k=args.prompt_ms_per_1k,
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms
+    ).start()
+    os.environ["OLLAMA_HOST"] = server.url
+
+    if args.trace_memory:
+        tracemalloc.start()
+    startup = {}
+    start = time.perf_counter()
+    from core.registry import SkillRegistry
+    from core.engine import JarvisEngine
+    from core.tracing import tracer
+    startup["import_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    registry = SkillRegistry(lazy=args.lazy)
+    registry.load_skills(SKILLS_DIR)
+    startup["skill_load_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    engine = JarvisEngine(registry)
+    startup["engine_init_ms"] = (time.perf_counter() - start) * 1000
+    # Connect + warm-up run in the background; measured separately from the turns
+    if engine.model_manager is not None:
+        engine.model_manager.wait_ready(60)
+    startup["model_ready_ms"] = (time.perf_counter() - start) * 1000
+    engine.direct_routing = not args.no_direct_routing
+
+    if not args.execute_tools:
+        _dry_run_tools(registry)
+    called: List[str] = []
+    _record_tool_calls(registry, called)
+
+    def ask(text: str) -> str:
+        on_token = (lambda token: None) if args.stream else None
+        if args.use_async:
+            return engine.submit_query(text, on_token=on_token).result()
+        return engine.process_query(text, on_token=on_token)
+
+    for _ in range(args.warmup):
+        for item in corpus:
+            ask(item["text"])
+
+    stage_samples: Dict[str, List[float]] = {}
+    e2e: Dict[str, List[float]] = {"all": []}
+    prompt_tokens: List[int] = []
+    errors = 0
+    misroutes: Dict[str, Dict[str, Any]] = {}
+    run_start = time.perf_counter()
+    for _ in range(args.rounds):
+        for item in corpus:
+            called.clear()
+            start = time.perf_counter()
+            try:
+                ask(item["text"])
+            except Exception as e:
+                errors += 1
+                print(f"⚠️  {item['text']!r} failed: {e}")
+            elapsed = (time.perf_counter() - start) * 1000
+            # Names only: routed commands fill arguments differently than the scripted LLM
+            expected = sorted({call["name"] for call in item["tool_calls"]})
+            if sorted(set(called)) != expected:
+                misroutes[item["text"]] = {
+                    "expected": expected,
+                    "called": sorted(set(called)),
+                    # Expected tools no loaded skill provides (see skill_failures)
+                    "unregistered": [name for name in expected if not registry.has_tool(name)]
+                }
+            e2e["all"].append(elapsed)
+            e2e.setdefault(item["lang"], []).append(elapsed)
+
+            trace = tracer.recent(1)
+            if trace:
+                for span in _walk(trace[-1]):
+                    stage_samples.setdefault(span["name"], []).append(span["wall_ms"])
+                prompt_tokens.append(trace[-1].get("attrs", {}).get("prompt_tokens") or 0)
+    wall = time.perf_counter() - run_start
+
+    peak = 0
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    server.stop()
+
+    queries = len(e2e["all"])
+    return {
+        "config": {
+            "rounds": args.rounds, "queries": queries, "langs": args.langs, "stream": args.stream,
+            "async": args.use_async, "lazy": args.lazy, "direct_routing": engine.direct_routing,
+            "prompt_ms_per_1k": args.prompt_ms_per_1k, "first_token_ms": args.first_token_ms,
+            "token_ms": args.token_ms, "tools": len(registry.list_tools())
+        },
+        "startup_ms": {key: round(value, 1) for key, value in startup.items()},
+        "stages": {name: _summary(values) for name, values in sorted(stage_samples.items())},
+        "end_to_end": {lang: _summary(values) for lang, values in e2e.items()},
+        "throughput_qps": round(queries / wall, 2) if wall else 0.0,
+        "errors": errors,
+        "routing": {"commands": len(corpus), "mismatches": misroutes},
+        "skill_failures": [{"file": entry["file"], "status": entry["status"], "error": entry["error"]}
+                           for entry in registry.load_report.failures()],
+        "memory_mb": {"python_peak": round(peak / (1024 * 1024), 1) if peak else None,
+                      "rss_peak": round(_rss_mb(), 1)},
+        "llm": {
+            "chat_requests": server.stats["chat"],
+            "avg_prompt_tokens_per_turn": round(sum(prompt_tokens) / len(prompt_tokens)) if prompt_tokens else 0,
+            "unoffered_tool_calls": server.stats["unoffered_tool_calls"],
+            "tool_calls": server.stats["tool_calls"],
+        },
+        "micro_us": _micro([item["text"] for item in corpus]),
+    }
+
+
+def print_report(results: Dict[str, Any]):
+    config = results["config"]
+    print("\n" + "=" * 72)
+    print(f"JARVIS benchmark - {config['queries']} queries, {config['tools']} tools, "
+          f"stream={config['stream']} async={config['async']} lazy={config['lazy']}")
+    print("=" * 72)
+
+    startup = results["startup_ms"]
+    print(f"\nStartup: import {startup['import_ms']:.0f} ms | skills {startup['skill_load_ms']:.0f} ms | "
+          f"engine {startup['engine_init_ms']:.0f} ms | model ready {startup.get('model_ready_ms', 0):.0f} ms")
+
+    print(f"\n{'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stat in results["stages"].items():
+        print(f"{name:<16}{stat['count']:>7}{stat['p50_ms']:>10.2f}{stat['p95_ms']:>10.2f}"
+              f"{stat['p99_ms']:>10.2f}{stat['max_ms']:>10.2f}")
+
+    print(f"\n{'end to end':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for lang, stat in results["end_to_end"].items():
+        print(f"{lang:<16}{stat['count']:>7}{stat['p50_ms']:>10.2f}{stat['p95_ms']:>10.2f}"
+              f"{stat['p99_ms']:>10.2f}{stat['max_ms']:>10.2f}")
+
+    llm = results["llm"]
+    memory = results["memory_mb"]
+    print(f"\nThroughput: {results['throughput_qps']} queries/s | errors: {results['errors']}")
+    print(f"LLM: {llm['chat_requests']} chat requests, ~{llm['avg_prompt_tokens_per_turn']} prompt tokens/turn, "
+          f"{llm['unoffered_tool_calls']}/{llm['tool_calls']} tool calls needed a tool that wasn't sent")
+    routing = results["routing"]
+    mismatches = routing["mismatches"]
+    print(f"Routing: {routing['commands'] - len(mismatches)}/{routing['commands']} commands called the expected tools")
+    for text, mismatch in mismatches.items():
+        missing = f" (not registered: {', '.join(mismatch['unregistered'])})" if mismatch.get("unregistered") else ""
+        print(f"   ❌ {text!r}: expected {mismatch['expected'] or 'no tools'}, "
+              f"called {mismatch['called'] or 'no tools'}{missing}")
+    if results["skill_failures"]:
+        print(f"⚠️  {len(results['skill_failures'])} skill files failed to load - their tools can't be routed to:")
+        for failure in results["skill_failures"]:
+            print(f"   {failure['file']}: {failure['status']} - {failure['error']}")
+    python_peak = f"{memory['python_peak']} MB" if memory['python_peak'] is not None else "n/a (--trace-memory)"
+    print(f"Memory: RSS peak {memory['rss_peak']} MB | Python heap peak {python_peak}")
+    print("Micro (µs/utterance): " + ", ".join(f"{name} {value}" for name, value in results["micro_us"].items()))
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    p95 regressions beyond the threshold (and at least 1 ms) against a
+    baseline run, plus every misrouted command
+    """
+    regressions = [f"routing/{text}: expected {mismatch['expected']}, called {mismatch['called']}"
+                   for text, mismatch in results.get("routing", {}).get("mismatches", {}).items()]
+    for section in ("stages", "end_to_end"):
+        for name, stat in results[section].items():
+            before = baseline.get(section, {}).get(name)
+            if not before:
+                continue
+            if stat["p95_ms"] > before["p95_ms"] * (1 + threshold) and stat["p95_ms"] - before["p95_ms"] >= 1.0:
+                regressions.append(f"{section}/{name}: p95 {before['p95_ms']:.1f} -> {stat['p95_ms']:.1f} ms")
+    for name, value in results["startup_ms"].items():
+        before = baseline.get("startup_ms", {}).get(name)
+        if before and value > before * (1 + threshold) and value - before >= 5.0:
+            regressions.append(f"startup/{name}: {before:.0f} -> {value:.0f} ms")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline JarvisEngine latency benchmark")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument("--warmup", type=int, default=1, help="Unrecorded passes first")
+    parser.add_argument("--langs", default="en,hi,hinglish", help="Comma-separated corpus languages")
+    parser.add_argument("--stream", action="store_true", help="Stream replies (on_token)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use the async engine API")
+    parser.add_argument("--lazy", action="store_true", help="Lazy skill loading")
+    parser.add_argument("--no-direct-routing", action="store_true", help="Send every command to the LLM")
+    parser.add_argument("--execute-tools", action="store_true", help="Really run skills (side effects!)")
+    parser.add_argument("--prompt-ms-per-1k", type=float, default=0.0, help="Fake prompt eval time per 1k tokens")
+    parser.add_argument("--first-token-ms", type=float, default=0.0, help="Fake time to first token")
+    parser.add_argument("--token-ms", type=float, default=0.0, help="Fake time per generated token")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Track the Python heap peak with tracemalloc (slows every stage)")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95 growth vs baseline")
+    args = parser.parse_args(argv)
+    args.langs = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+
+    results = run(args)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        changed = [key for key, value in results["config"].items()
+                   if key not in ("rounds", "queries") and baseline.get("config", {}).get(key) != value]
+        if changed:
+            print(f"\n⚠️  Baseline was run with different settings ({', '.join(changed)}) - not a like-for-like comparison")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,30 @@ import os
 import sys
 import ast
 import json
+import hashlib
 import traceback
+import time
 import subprocess
-import requests
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from core import http_client
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 from ollama import Client
+from core.llm_cache import llm_cache, KEEP_ALIVE
+from core.fix_cache import fix_cache, error_fingerprint, normalize_message
+from core.lazy import LazyInstance
+
+# Seconds all web research for one fix may take together; whatever has
+# arrived by then goes into the prompt
+RESEARCH_DEADLINE = float(os.environ.get("JARVIS_RESEARCH_DEADLINE", "5"))
+# How long search results are reused for the same query
+RESEARCH_TTL = float(os.environ.get("JARVIS_RESEARCH_TTL", str(24 * 3600)))
+
+
+def _content_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
 
 class AdvancedSelfCoder:
     """
@@ -29,7 +47,9 @@ class AdvancedSelfCoder:
         self.client = None
         self.model = "llama3.2"  # Fast local model for code generation
         self.fix_history: List[Dict] = []
-        self.code_cache: Dict[str, str] = {}
+        self.research_deadline = RESEARCH_DEADLINE
+        self._research_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
         
         # Initialize Ollama client
         try:
@@ -47,7 +67,53 @@ class AdvancedSelfCoder:
         except Exception as e:
             print(f"⚠️  Self-Coder initialization failed: {e}")
     
-    def _search_error_solution(self, error_type: str, error_msg: str) -> str:
+    @property
+    def research_pool(self) -> ThreadPoolExecutor:
+        # Searches that miss the deadline finish here in the background and still fill the cache
+        if self._research_pool is None:
+            with self._pool_lock:
+                if self._research_pool is None:
+                    self._research_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fix-research")
+        return self._research_pool
+    
+    def _research(self, error_type: str, error_msg: str) -> Dict[str, Future]:
+        """
+        Start every web search for this error at once; each result is cached
+        by (source, normalized query) for RESEARCH_TTL
+        """
+        timeout = max(1.0, self.research_deadline)
+        key_msg = normalize_message(error_msg)
+        searches = {
+            "web": self._search_error_solution,
+            "stackoverflow": self._search_stackoverflow,
+        }
+        return {
+            source: self.research_pool.submit(
+                llm_cache.cached, f"research:{source}", f"{error_type} {key_msg}",
+                lambda search=search: search(error_type, error_msg, timeout), ttl=RESEARCH_TTL
+            )
+            for source, search in searches.items()
+        }
+    
+    def _collect_research(self, futures: Dict[str, Future], deadline: float) -> str:
+        """Research text from the searches that finished before the deadline (perf_counter time)"""
+        done, pending = wait(futures.values(), timeout=max(0.0, deadline - time.perf_counter()))
+        if pending:
+            print(f"⏱️  {len(pending)} web search(es) missed the {self.research_deadline:.0f}s deadline - continuing without them")
+        
+        results = {}
+        for source, future in futures.items():
+            if future in done and not future.exception():
+                results[source] = future.result() or ""
+        
+        internet_research = ""
+        if results.get("web"):
+            internet_research += f"\n📚 Web Solutions:\n{results['web']}\n"
+        if results.get("stackoverflow"):
+            internet_research += f"\n💡 StackOverflow Solutions:\n{results['stackoverflow']}\n"
+        return internet_research
+    
+    def _search_error_solution(self, error_type: str, error_msg: str, timeout: float = 10) -> str:
         """
         Search internet for error solutions using DuckDuckGo
         """
@@ -63,7 +129,8 @@ class AdvancedSelfCoder:
                 "no_html": 1
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            # No retries: a slow search is dropped at the deadline anyway
+            response = http_client.get(url, params=params, timeout=timeout, retry=False)
             data = response.json()
             
             # Extract relevant information
@@ -83,7 +150,7 @@ class AdvancedSelfCoder:
             print(f"⚠️  Internet search failed: {e}")
             return ""
     
-    def _search_stackoverflow(self, error_type: str, error_msg: str) -> str:
+    def _search_stackoverflow(self, error_type: str, error_msg: str, timeout: float = 10) -> str:
         """
         Search StackOverflow-like solutions via Google
         """
@@ -95,7 +162,7 @@ class AdvancedSelfCoder:
             }
             
             url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=timeout, retry=False)
             
             # Extract snippets (basic scraping)
             from bs4 import BeautifulSoup
@@ -124,38 +191,46 @@ class AdvancedSelfCoder:
         Returns:
             True if fix was successful, False otherwise
         """
+        # Known errors resolve from the fix cache - no web search or LLM call
+        fingerprint = error_fingerprint(error)
+        known = fix_cache.lookup(fingerprint)
+        if fix_cache.is_unfixable(known):
+            print(f"⏭️  Known unfixable {type(error).__name__} - skipping AI fix")
+            return False
+        cached = fix_cache.known_fix(known)
+        if cached and cached['method'] == "ai" and cached['detail'].get('code') and file_path:
+            replayed = self._replay_fix(fingerprint, file_path, cached['detail'])
+            if replayed is not None:
+                return replayed
+        
         if not self.client:
             return False
         
         print(f"\n🤖 Advanced Self-Coder analyzing error...")
+        start = time.perf_counter()
+        fixed = False
         
         try:
             # Get error details
             error_type = type(error).__name__
             error_msg = str(error)
-            error_trace = traceback.format_exc()
             
-            # Search internet for solutions
+            # Search internet for solutions - all sources at once, sharing one deadline
             print(f"🌐 Searching internet for solutions...")
-            web_solutions = self._search_error_solution(error_type, error_msg)
-            stackoverflow_solutions = self._search_stackoverflow(error_type, error_msg)
-            
-            # Combine web research
-            internet_research = ""
-            if web_solutions:
-                internet_research += f"\n📚 Web Solutions:\n{web_solutions}\n"
-            if stackoverflow_solutions:
-                internet_research += f"\n💡 StackOverflow Solutions:\n{stackoverflow_solutions}\n"
+            research = self._research(error_type, error_msg)
+            deadline = start + self.research_deadline
             
-            if internet_research:
-                print(f"✅ Found solutions from internet")
-            
-            # Read current code if file path provided
+            # Gather the rest of the prompt while the searches run
+            error_trace = traceback.format_exc()
             current_code = ""
             if file_path and os.path.exists(file_path):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     current_code = f.read()
             
+            internet_research = self._collect_research(research, deadline)
+            if internet_research:
+                print(f"✅ Found solutions from internet")
+            
             # Generate fix using LLM + Internet research
             fix_code = self._generate_fix(
                 error_type, 
@@ -177,15 +252,62 @@ class AdvancedSelfCoder:
             
             # Apply fix
             if file_path:
-                return self._apply_fix(file_path, fix_code)
+                fixed = self._apply_fix(file_path, fix_code)
+                if fixed:
+                    # The fix is a whole file - remember which version it was made from
+                    fix_cache.record_success(fingerprint, "ai",
+                                             {"code": fix_code, "file": file_path, "base": _content_hash(current_code)},
+                                             (time.perf_counter() - start) * 1000)
+                return fixed
             else:
                 print("✅ Fix generated but no file path to apply")
                 print(f"📝 Generated fix:\n{fix_code}")
+                fixed = True
                 return True
                 
         except Exception as e:
             print(f"❌ Self-Coder error: {e}")
             return False
+        
+        finally:
+            if not fixed:
+                fix_cache.record_failure(fingerprint, (time.perf_counter() - start) * 1000)
+    
+    def _replay_fix(self, fingerprint: Dict[str, str], file_path: str, detail: Dict) -> Optional[bool]:
+        """
+        Re-apply the fix that resolved this error before.
+        Returns None when it can't be replayed safely (the file has changed
+        since the fix was made) and a fresh fix should be generated.
+        """
+        start = time.perf_counter()
+        fix_code = detail['code']
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                current_code = f.read()
+        except OSError:
+            current_code = None
+        
+        # The fix is already in place and the error still happened - it doesn't work
+        if current_code == fix_code:
+            print("⚠️  Cached fix is already applied but the error persists")
+            fix_cache.record_failure(fingerprint, (time.perf_counter() - start) * 1000)
+            return False
+        
+        # The cached fix replaces the whole file; writing it over a different
+        # version would silently revert every edit made since
+        if current_code is None or detail.get('base') != _content_hash(current_code):
+            print(f"⚠️  {file_path} changed since the cached fix was made - generating a new one")
+            return None
+        
+        print(f"⚡ Known error - re-applying cached fix to {file_path}")
+        fixed = self._validate_code(fix_code) and self._apply_fix(file_path, fix_code)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if fixed:
+            fix_cache.record_success(fingerprint, "ai", dict(detail, file=file_path), elapsed_ms,
+                                     replayed=True)
+        else:
+            fix_cache.record_failure(fingerprint, elapsed_ms)
+        return fixed
     
     def _generate_fix(self, error_type: str, error_msg: str, error_trace: str, 
                      current_code: str, context: str, internet_research: str = "") -> Optional[str]:
@@ -223,19 +345,23 @@ OUTPUT FORMAT:
 Return ONLY the complete fixed Python code, nothing else.
 """
 
-            # Call Ollama for fix generation
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are an expert Python code fixer. Return only valid Python code, no markdown, no explanations."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+            
+            # Not cached: a retry after a rolled-back fix needs a new answer.
+            # Fixes that worked are kept (and replayed) by fix_cache.
             response = self.client.chat(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert Python code fixer. Return only valid Python code, no markdown, no explanations."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
+                messages=messages,
+                keep_alive=KEEP_ALIVE
             )
             
             fixed_code = response['message']['content']
@@ -434,5 +560,5 @@ Return ONLY the improved Python code, no explanations.
             return False
 
 
-# Global instance
-advanced_self_coder = AdvancedSelfCoder()
+# Global instance (built on first use - its constructor checks the Ollama connection)
+advanced_self_coder = LazyInstance(AdvancedSelfCoder, "advanced_self_coder")
@@ -0,0 +1,360 @@
+"""
+Always-on microphone capture for JARVIS
+The microphone is opened once and read continuously on a background thread:
+- Frames go into a ring buffer, so speech that starts before listen() is
+  called (or right at the start) isn't lost
+- Energy-based voice activity detection segments the stream into utterances
+- The noise floor is calibrated once and then tracks the room while silent,
+  instead of a 1 second adjust_for_ambient_noise() before every command
+listen() just takes the next utterance from a queue.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2            # 16-bit mono, what sr.Microphone records
+FRAME_MS = 30
+
+
+class Utterance:
+    """One segmented stretch of speech (raw 16-bit mono PCM)"""
+
+    def __init__(self, frame_data: bytes, sample_rate: int, sample_width: int,
+                 started_at: float, ended_at: float):
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.started_at = started_at
+        self.ended_at = ended_at
+
+    @property
+    def duration(self) -> float:
+        return len(self.frame_data) / float(self.sample_rate * self.sample_width)
+
+    def samples(self) -> np.ndarray:
+        return np.frombuffer(self.frame_data, dtype=np.int16)
+
+    def audio_data(self):
+        """speech_recognition.AudioData for the recognizers"""
+        import speech_recognition as sr
+        return sr.AudioData(self.frame_data, self.sample_rate, self.sample_width)
+
+
+class VoiceActivityDetector:
+    """
+    Frame-by-frame speech segmentation with an adaptive noise floor.
+    Feed it fixed-size int16 frames; it returns an Utterance when one ends.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS,
+                 calibration_s: float = 0.5, ratio: float = 2.5, min_energy: float = 120.0,
+                 start_s: float = 0.09, pause_s: float = 0.8, preroll_s: float = 0.3,
+                 min_speech_s: float = 0.25, max_phrase_s: float = 10.0, adapt_rate: float = 0.05):
+        """
+        Args:
+            calibration_s: Audio used for the initial noise floor
+            ratio: Speech threshold as a multiple of the noise floor (2.5 ~ 8 dB)
+            min_energy: Lowest RMS ever treated as speech (digital silence, muted mics)
+            start_s: Voiced audio needed in a row before an utterance starts
+            pause_s: Silence that ends an utterance (like Recognizer.pause_threshold)
+            preroll_s: Audio kept from before the onset so first syllables aren't clipped
+            min_speech_s: Shorter bursts (clicks, coughs) are dropped
+            max_phrase_s: Utterances are cut at this length (like phrase_time_limit)
+            adapt_rate: How fast the noise floor follows the room while silent
+        """
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.adapt_rate = adapt_rate
+        # Raised while JARVIS is talking so its own voice isn't taken for the user's
+        self.suppression = 1.0
+
+        frames = lambda seconds: max(1, int(round(seconds * 1000 / frame_ms)))
+        self.calibration_frames = frames(calibration_s)
+        self.start_frames = frames(start_s)
+        self.pause_frames = frames(pause_s)
+        self.min_speech_frames = frames(min_speech_s)
+        self.max_phrase_frames = frames(max_phrase_s)
+
+        self.noise_floor: Optional[float] = None
+        self._calibration: List[float] = []
+        self._preroll: deque = deque(maxlen=frames(preroll_s) + self.start_frames)
+        self._speech: List[bytes] = []
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._lead_frames = 0
+        self._started_at = 0.0
+        self.in_speech = False
+
+    @staticmethod
+    def energy(frame: bytes) -> float:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+
+    @property
+    def threshold(self) -> float:
+        if self.noise_floor is None:
+            return float("inf")
+        return max(self.min_energy, self.noise_floor * self.ratio) * self.suppression
+
+    def recalibrate(self):
+        """Measure the noise floor again from the next frames"""
+        self.noise_floor = None
+        self._calibration = []
+
+    def process(self, frame: bytes, now: Optional[float] = None) -> Optional[Utterance]:
+        now = time.time() if now is None else now
+        level = self.energy(frame)
+
+        if self.noise_floor is None:
+            self._calibration.append(level)
+            if len(self._calibration) >= self.calibration_frames:
+                # Median: a word spoken during calibration shouldn't raise the floor much
+                self.noise_floor = float(np.median(self._calibration))
+                self._calibration = []
+            self._preroll.append(frame)
+            return None
+
+        voiced = level > self.threshold
+        if not self.in_speech:
+            self._preroll.append(frame)
+            if voiced:
+                self._voiced_run += 1
+                if self._voiced_run >= self.start_frames:
+                    self.in_speech = True
+                    self._speech = list(self._preroll)
+                    self._lead_frames = len(self._speech) - self._voiced_run
+                    self._preroll.clear()
+                    self._silent_run = 0
+                    self._started_at = now - len(self._speech) * self.frame_ms / 1000.0
+            else:
+                self._voiced_run = 0
+                if self.suppression == 1.0:
+                    self.noise_floor += self.adapt_rate * (level - self.noise_floor)
+            return None
+
+        self._speech.append(frame)
+        self._silent_run = 0 if voiced else self._silent_run + 1
+        if self._silent_run >= self.pause_frames or len(self._speech) >= self.max_phrase_frames:
+            return self._end_utterance(now)
+        return None
+
+    def _end_utterance(self, now: float) -> Optional[Utterance]:
+        # Trailing silence is dropped except a short tail
+        keep = len(self._speech) - max(0, self._silent_run - self.start_frames)
+        frames = self._speech[:keep]
+        voiced_frames = keep - self._lead_frames
+        self._speech = []
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.in_speech = False
+        if voiced_frames < self.min_speech_frames:
+            return None
+        return Utterance(b"".join(frames), self.sample_rate, SAMPLE_WIDTH, self._started_at, now)
+
+
+class MicrophoneCapture:
+    """
+    Usage:
+        from core.audio_capture import microphone
+
+        utterance = microphone.next_utterance(timeout=5)   # opens the mic on first use
+        if utterance:
+            text = recognizer.recognize_google(utterance.audio_data())
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS,
+                 ring_seconds: float = 5.0, stale_after: float = 2.0, device_index: Optional[int] = None):
+        """
+        Args:
+            ring_seconds: Recent audio kept in the ring buffer
+            stale_after: Utterances that ended this long before next_utterance() was
+                called are skipped (said to someone else, or JARVIS hearing itself)
+            device_index: sr.Microphone device (None = system default)
+        """
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.stale_after = stale_after
+        self.device_index = device_index
+
+        self.vad = VoiceActivityDetector(sample_rate=sample_rate, frame_ms=frame_ms)
+        self.ring: deque = deque(maxlen=int(ring_seconds * 1000 / frame_ms))
+        self.utterances: "queue.Queue[Utterance]" = queue.Queue(maxsize=20)
+        self.error: Optional[Exception] = None
+
+        self._frame_listeners: List[Callable[[bytes], None]] = []
+        self._speech_listeners: List[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._opened = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Open the microphone and start capturing (no-op if already running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            self._stop.clear()
+            self._opened.clear()
+            self.error = None
+            self._thread = threading.Thread(target=self._run, name="jarvis-mic", daemon=True)
+            self._thread.start()
+        # Device open errors (no mic, no PyAudio) surface to the first caller
+        self._opened.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return True
+
+    def stop(self):
+        """Stop capturing and release the microphone"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self):
+        import speech_recognition as sr
+
+        try:
+            microphone = sr.Microphone(device_index=self.device_index, sample_rate=self.sample_rate,
+                                       chunk_size=self.frame_size)
+            source = microphone.__enter__()
+        except Exception as e:
+            self.error = e
+            self._opened.set()
+            return
+
+        print("🎤 Microphone open (always-on capture)")
+        self._opened.set()
+        try:
+            while not self._stop.is_set():
+                frame = source.stream.read(self.frame_size)
+                self.feed(frame)
+        except Exception as e:
+            self.error = e
+            print(f"⚠️  Microphone capture stopped: {e}")
+        finally:
+            try:
+                microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+
+    def feed(self, frame: bytes):
+        """Process one captured frame (called by the capture thread)"""
+        self.ring.append(frame)
+        for callback in list(self._frame_listeners):
+            try:
+                callback(frame)
+            except Exception as e:
+                print(f"⚠️  Audio frame listener failed: {e}")
+
+        was_speaking = self.vad.in_speech
+        utterance = self.vad.process(frame)
+        if self.vad.in_speech and not was_speaking:
+            for callback in list(self._speech_listeners):
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠️  Speech start listener failed: {e}")
+        if utterance is not None:
+            try:
+                self.utterances.put_nowait(utterance)
+            except queue.Full:
+                # Nobody is listening - keep the newest speech
+                try:
+                    self.utterances.get_nowait()
+                except queue.Empty:
+                    pass
+                self.utterances.put_nowait(utterance)
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+
+    def next_utterance(self, timeout: Optional[float] = 5.0) -> Optional[Utterance]:
+        """
+        Next utterance, waiting up to timeout for speech to start (an utterance
+        already in progress is waited for until it ends). None on timeout.
+        """
+        if not self.running:
+            self.start()
+
+        called_at = time.time()
+        deadline = None if timeout is None else called_at + timeout
+        extended = False
+        while True:
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                if extended or not self.vad.in_speech:
+                    return None
+                # Speech started in time - give it until the phrase limit
+                extended = True
+                remaining = self.vad.max_phrase_frames * self.frame_ms / 1000.0
+                deadline = time.time() + remaining
+            try:
+                utterance = self.utterances.get(timeout=remaining)
+            except queue.Empty:
+                if self.error:
+                    raise self.error
+                continue
+            if utterance.ended_at < called_at - self.stale_after:
+                continue
+            return utterance
+
+    def clear(self):
+        """Drop utterances nobody has taken yet"""
+        try:
+            while True:
+                self.utterances.get_nowait()
+        except queue.Empty:
+            pass
+
+    def recent_audio(self, seconds: float) -> bytes:
+        """The last `seconds` of captured audio from the ring buffer"""
+        count = int(seconds * 1000 / self.frame_ms)
+        frames = list(self.ring)[-count:] if count > 0 else []
+        return b"".join(frames)
+
+    def add_frame_listener(self, callback: Callable[[bytes], None]):
+        """callback(frame) for every captured frame, on the capture thread - keep it cheap"""
+        self._frame_listeners.append(callback)
+
+    def remove_frame_listener(self, callback: Callable[[bytes], None]):
+        if callback in self._frame_listeners:
+            self._frame_listeners.remove(callback)
+
+    def add_speech_listener(self, callback: Callable[[], None]):
+        """callback() when the VAD hears speech start (barge-in), on the capture thread"""
+        self._speech_listeners.append(callback)
+
+    def remove_speech_listener(self, callback: Callable[[], None]):
+        if callback in self._speech_listeners:
+            self._speech_listeners.remove(callback)
+
+    def get_stats(self):
+        return {
+            "running": self.running,
+            "noise_floor": round(self.vad.noise_floor, 1) if self.vad.noise_floor is not None else None,
+            "threshold": round(self.vad.threshold, 1) if self.vad.noise_floor is not None else None,
+            "pending": self.utterances.qsize(),
+        }
+
+
+# Global instance (the microphone is opened on first next_utterance())
+microphone = MicrophoneCapture()
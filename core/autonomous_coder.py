@@ -17,11 +17,13 @@ import subprocess
 import json
 import re
 import time
-import requests
+from core import http_client
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from core.llm_cache import llm_cache, KEEP_ALIVE
+
 
 class AutonomousCoder:
     """Autonomous AI Coding Agent with Self-Debugging"""
@@ -164,7 +166,7 @@ class AutonomousCoder:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = http_client.get(search_url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 # Parse results (simplified)
@@ -202,7 +204,7 @@ Extract and provide:
 
 Respond in JSON format."""
             
-            response = self._call_ollama(prompt)
+            response = self._call_ollama(prompt, cache=True)
             
             # Try to parse JSON
             try:
@@ -527,30 +529,45 @@ Include error handling and proper structure."""
         
         return self._call_ollama(full_prompt)
     
-    def _call_ollama(self, prompt: str) -> str:
-        """Call Ollama API for code generation"""
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                    }
-                },
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                return response.json().get("response", "")
+    def _call_ollama(self, prompt: str, cache: bool = False) -> str:
+        """
+        Call Ollama API for code generation
         
-        except Exception as e:
-            print(f"   ⚠️ Ollama error: {e}")
+        Args:
+            prompt: Prompt to send
+            cache: Reuse a cached response for an identical prompt (for
+                   analysis-style calls; not for fix attempts that must vary)
+        """
+        options = {
+            "temperature": 0.7,
+            "top_p": 0.9,
+        }
+        
+        def generate():
+            try:
+                response = http_client.post(
+                    f"{self.ollama_url}/api/generate",
+                    json={
+                        "model": self.model,
+                        "prompt": prompt,
+                        "stream": False,
+                        "keep_alive": KEEP_ALIVE,
+                        "options": options
+                    },
+                    timeout=60
+                )
+                
+                if response.status_code == 200:
+                    return response.json().get("response", "")
+            
+            except Exception as e:
+                print(f"   ⚠️ Ollama error: {e}")
+            
+            return ""
         
-        return ""
+        if cache:
+            return llm_cache.cached(self.model, prompt, generate, options)
+        return generate()
     
     def _create_project_directory(self, output_dir: str, structure: Dict, files: Dict):
         """Create project directory with structure and files"""
@@ -21,6 +21,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from core import http_client
+
 
 class AutonomousCoderV2:
     """Improved Autonomous AI Coding Agent"""
@@ -1345,7 +1347,7 @@ JARVIS Autonomous Coder V2
     def _call_ollama_with_timeout(self, prompt: str, timeout: int = 60) -> str:
         """Call Ollama API with timeout"""
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model,
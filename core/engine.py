@@ -1,7 +1,13 @@
 import os
 import json
 import time
-from typing import List, Dict, Any, Optional
+import queue
+import asyncio
+import functools
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 
 # Try to import Ollama, but don't fail if not available
 try:
@@ -11,26 +17,101 @@ except ImportError:
     OLLAMA_AVAILABLE = False
     print("⚠️  Ollama not installed. Install with: pip install ollama")
 
+try:
+    from ollama import AsyncClient
+except ImportError:
+    AsyncClient = None
+
 from core.registry import SkillRegistry
+from core.validation import ToolCallError, ToolArgumentError
+from core.history import ConversationHistory
+from core.llm_cache import KEEP_ALIVE
+from core.model_manager import ModelManager, CONNECTING, PULLING, LOADING
+from core.recall import recall_index
+from core.intent_router import intent_router
+from core.tool_selector import tool_selector, tool_name
+from core.tracing import tracer
 from core.self_healing import self_healing
 from core.personal_assistant import personal_assistant
 
+
+class TokenStream:
+    """
+    Forwards streamed LLM tokens to a callback and tracks the current reply,
+    so text that didn't come from the LLM (canned replies, follow-ups) can
+    still be emitted once at the end.
+    """
+
+    def __init__(self, callback: Callable[[str], None]):
+        self.callback = callback
+        self.current: List[str] = []
+        self.emitted_any = False
+
+    def start_reply(self):
+        self.current = []
+
+    def push(self, token: str):
+        if token:
+            self.current.append(token)
+            self.emitted_any = True
+            self.callback(token)
+
+    def finish(self, result: str):
+        """Emit whatever part of the final result hasn't been streamed yet"""
+        streamed = "".join(self.current)
+        if streamed and result.startswith(streamed):
+            self.push(result[len(streamed):])
+        elif result:
+            self.push(("\n\n" if self.emitted_any else "") + result)
+
+
+class ChatAccumulator:
+    """Assembles streamed Ollama chat chunks into a normal response dict"""
+
+    def __init__(self, stream: TokenStream):
+        self.stream = stream
+        self.content: List[str] = []
+        self.tool_calls: List[Dict[str, Any]] = []
+        self.last_chunk: Dict[str, Any] = {}
+        stream.start_reply()
+
+    def add(self, chunk: Dict[str, Any]):
+        message = chunk.get('message') or {}
+        token = message.get('content') or ""
+        if token:
+            self.content.append(token)
+            self.stream.push(token)
+        if message.get('tool_calls'):
+            self.tool_calls.extend(message['tool_calls'])
+        self.last_chunk = chunk
+
+    def response(self) -> Dict[str, Any]:
+        return {
+            'message': {
+                'role': 'assistant',
+                'content': "".join(self.content),
+                'tool_calls': self.tool_calls or None
+            },
+            'prompt_eval_count': self.last_chunk.get('prompt_eval_count'),
+            'eval_count': self.last_chunk.get('eval_count')
+        }
+
+
 class JarvisEngine:
     def __init__(self, registry: SkillRegistry):
         """Initialize JARVIS engine with Ollama (local LLM), personal assistant, and self-healing capabilities"""
         self.registry = registry
         self.assistant = personal_assistant
+        self.router = intent_router
+        self.tool_selector = tool_selector
+        # High-confidence commands bypass the LLM (JARVIS_DIRECT_ROUTING=0 to disable)
+        self.direct_routing = os.environ.get("JARVIS_DIRECT_ROUTING", "1") != "0"
         self.client = None
+        self.async_client = None
         self.model = None
-        self.ollama_ready = False
-        
-        # Try to initialize Ollama
-        if OLLAMA_AVAILABLE:
-            self._init_ollama()
-        else:
-            print("❌ Ollama not available. Running in limited mode.")
-            print("💡 Install Ollama: https://ollama.com/download")
-            print("💡 Then run: ollama serve && ollama pull llama3.2")
+        self.model_manager: Optional[ModelManager] = None
+        # Seconds a query waits for the model warm-up before answering without it
+        self.model_wait = float(os.environ.get("JARVIS_MODEL_WAIT", "60"))
         
         # Enhanced system prompt with personality
         self.system_prompt = """You are JARVIS, a highly intelligent and empathetic personal AI assistant - like a real human assistant.
@@ -86,119 +167,510 @@ IMPORTANT INSTRUCTIONS:
 
 Available tools will be provided in the function calling format."""
         
-        self.conversation_history = [
-            {
-                "role": "system",
-                "content": self.system_prompt
-            }
-        ]
+        # Try to initialize Ollama (the model loads in the background)
+        if OLLAMA_AVAILABLE:
+            self._init_ollama()
+        else:
+            print("❌ Ollama not available. Running in limited mode.")
+            print("💡 Install Ollama: https://ollama.com/download")
+            print("💡 Then run: ollama serve && ollama pull llama3.2")
+        
+        # Bounded history: system prompt pinned, old turns summarized
+        self.conversation_history = ConversationHistory(
+            self.system_prompt,
+            token_budget=int(os.environ.get("JARVIS_HISTORY_TOKENS", "4000"))
+        )
         self.max_iterations = 5
+        
+        # Long-term recall: top-k snippets from earlier sessions per query
+        self.recall_k = 3
+        self.session_started = time.time()
+        
+        # Tool calls from one LLM turn run concurrently (serial skills excepted)
+        self.max_parallel_tools = 4
+        self.tool_timeout = float(os.environ.get("JARVIS_TOOL_TIMEOUT", "60"))
+        
+        # Async API: one in-flight request at a time, a newer one cancels it
+        deadline = float(os.environ.get("JARVIS_REQUEST_DEADLINE", "0"))
+        self.request_deadline = deadline if deadline > 0 else None
+        self._active_request: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._blocking_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="jarvis-async")
 
     def _init_ollama(self):
-        """Initialize Ollama client with error handling"""
+        """
+        Create the Ollama clients and start loading the model in the background.
+        Connecting, pulling and warming up happen on the model manager's
+        thread; queries wait on its readiness instead of __init__ blocking.
+        """
         try:
             # Get Ollama host from environment or use default
             ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
             
             self.client = Client(host=ollama_host)
+            if AsyncClient is not None:
+                self.async_client = AsyncClient(host=ollama_host)
             
-            # Test connection and pull model if needed
-            try:
-                models = self.client.list()
-                print(f"✅ Connected to Ollama at {ollama_host}")
-                print(f"📦 Available models: {len(models.get('models', []))}")
-                
-                # Use local model - llama3.2 is fast and efficient
-                self.model = os.environ.get("OLLAMA_MODEL", "llama3.2")
-                
-                # Ensure model is available
-                self._ensure_model_available()
-                
-                self.ollama_ready = True
-                
-            except Exception as e:
-                print(f"⚠️  Ollama connection issue: {e}")
-                print(f"💡 Make sure Ollama is running: ollama serve")
-                print(f"💡 Then pull model: ollama pull llama3.2")
-                self.ollama_ready = False
+            # Use local model - llama3.2 is fast and efficient
+            self.model = os.environ.get("OLLAMA_MODEL", "llama3.2")
+            
+            self.model_manager = ModelManager(
+                self.client,
+                self.model,
+                system_prompt=self.system_prompt,
+                keep_warm=os.environ.get("JARVIS_KEEP_WARM", "1") != "0"
+            )
+            self.model_manager.start()
+            print(f"🔄 Loading {self.model} from {ollama_host} in the background...")
             
         except Exception as e:
             print(f"❌ Failed to initialize Ollama client: {e}")
             print(f"💡 Install Ollama: curl -fsSL https://ollama.com/install.sh | sh")
             print(f"💡 Start Ollama: ollama serve")
-            self.ollama_ready = False
+            self.model_manager = None
+
+    @property
+    def ollama_ready(self) -> bool:
+        """True once the model is loaded (doesn't wait)"""
+        return self.model_manager is not None and self.model_manager.is_ready
 
-    def _ensure_model_available(self):
-        """Ensure the model is pulled and available"""
+    def _model_unavailable_reply(self, user_query: str) -> Optional[str]:
+        """
+        Wait (up to model_wait seconds) for the model warm-up to finish.
+        Returns None when the LLM can be used, otherwise the reply to give instead.
+        """
+        manager = self.model_manager
+        if manager is None:
+            return self._handle_without_ollama(user_query)
+        if manager.is_ready:
+            return None
+        
+        with tracer.span("model_wait", state=manager.state) as span:
+            ready = manager.wait_ready(self.model_wait)
+            span.set(ready=ready)
+        if ready:
+            return None
+        if manager.state in (CONNECTING, PULLING, LOADING):
+            detail = manager.detail or f"Loading {self.model}..."
+            return f"⏳ {detail} Please try again in a moment."
+        return self._handle_without_ollama(user_query)
+
+    def process_query(self, user_query: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Process user query with personal assistant intelligence
+        
+        Args:
+            user_query: What the user said or typed
+            on_token: Optional callback receiving the reply incrementally as
+                      the LLM generates it; the full reply is still returned
+        """
+        with tracer.turn("turn", query=user_query[:100], mode="sync") as turn:
+            if on_token is None:
+                result = self._process_query(user_query, None)
+            else:
+                stream = TokenStream(on_token)
+                result = self._process_query(user_query, stream)
+                stream.finish(result)
+            turn.set(reply_chars=len(result))
+            return result
+    
+    def stream_query(self, user_query: str) -> Iterator[str]:
+        """
+        Generator version of process_query that yields reply tokens as they
+        arrive (processing runs on a background thread).
+        """
+        tokens: "queue.Queue" = queue.Queue()
+        done = object()
+        errors = []
+        
+        def worker():
+            try:
+                self.process_query(user_query, on_token=tokens.put)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                tokens.put(done)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        while True:
+            token = tokens.get()
+            if token is done:
+                break
+            yield token
+        if errors:
+            raise errors[0]
+    
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+    
+    async def aprocess_query(self, user_query: str, on_token: Optional[Callable[[str], None]] = None,
+                             deadline: Optional[float] = None) -> str:
+        """
+        Async version of process_query.
+        
+        A newer request cancels the one still in flight: its LLM stream is
+        closed (Ollama stops generating) and pending tool calls are abandoned.
+        The cancelled call raises asyncio.CancelledError.
+        
+        Args:
+            user_query: What the user said or typed
+            on_token: Optional callback receiving the reply as it is generated
+            deadline: Seconds the whole request may take (default JARVIS_REQUEST_DEADLINE, unset = no limit)
+        """
+        deadline = deadline if deadline is not None else self.request_deadline
+        stream = TokenStream(on_token) if on_token else None
+        
+        self.cancel_current()
+        with tracer.turn("turn", query=user_query[:100], mode="async") as turn:
+            task = asyncio.ensure_future(self._aprocess_query(user_query, stream))
+            self._active_request = task
+            try:
+                result = await asyncio.wait_for(task, deadline)
+            except asyncio.TimeoutError:
+                print(f"⏱️  Request deadline of {deadline:g}s exceeded")
+                turn.set(deadline_exceeded=True)
+                result = f"⏱️ Sorry, that took longer than {deadline:g} seconds, so I stopped. Please try again."
+            finally:
+                if self._active_request is task:
+                    self._active_request = None
+            turn.set(reply_chars=len(result))
+        
+        if stream:
+            stream.finish(result)
+        return result
+    
+    def cancel_current(self) -> bool:
+        """Cancel the in-flight async request, if any (safe from any thread)"""
+        task = self._active_request
+        if task is None or task.done():
+            return False
+        print("⏹️  Cancelling the previous request")
+        task.get_loop().call_soon_threadsafe(task.cancel)
+        return True
+    
+    def submit_query(self, user_query: str, on_token: Optional[Callable[[str], None]] = None,
+                     deadline: Optional[float] = None) -> Future:
+        """
+        Run aprocess_query on the engine's background event loop from
+        synchronous code (GUI threads). Returns a concurrent.futures.Future;
+        result() raises CancelledError if a newer request superseded it.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aprocess_query(user_query, on_token, deadline), self._event_loop()
+        )
+    
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="jarvis-loop", daemon=True).start()
+            return self._loop
+    
+    async def _in_thread(self, fn: Callable, *args) -> Any:
+        """
+        Run blocking code (skills, self-healing) off the event loop.
+        Cancelling stops the wait, not the thread - it finishes in the background.
+        """
+        loop = asyncio.get_running_loop()
+        # copy_context keeps the thread's trace spans inside the current turn
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        return await loop.run_in_executor(self._blocking_pool, call)
+    
+    async def _aprocess_query(self, user_query: str, stream: Optional[TokenStream]) -> str:
+        routed = await self._in_thread(self._try_direct_route, user_query)
+        if routed is not None:
+            self.assistant.add_to_history(user_query, routed)
+            return routed
+        
+        unavailable = await self._in_thread(self._model_unavailable_reply, user_query)
+        if unavailable is not None:
+            return unavailable
+        
+        # Loading the assistant and recording canned replies hit the recall index (embedding calls)
+        analysis, response = await self._in_thread(self._analyze_query, user_query)
+        if response is not None:
+            return response
+        
+        result = await self._arun_conversation(user_query, stream)
+        return self._finish_reply(user_query, result, analysis)
+    
+    async def _arun_conversation(self, user_query: str, stream: Optional[TokenStream]) -> str:
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                return await self._aexecute_conversation(user_query, stream)
+            except asyncio.CancelledError:
+                raise
+            except AttributeError as e:
+                # Code issues - same handling as _process_query
+                error_msg = str(e)
+                if "get_all_tools" in error_msg or "SkillRegistry" in error_msg:
+                    print(f"\n🔧 Code update detected! Restarting required...")
+                    print(f"   Issue: {error_msg}")
+                    print(f"\n✅ Fix applied! Please restart JARVIS:")
+                    print(f"   python main.py\n")
+                    return "System update hua hai. Please restart JARVIS: python main.py"
+                
+                await self._in_thread(self_healing.log_error, e, f"AttributeError in conversation: {user_query}")
+                
+                # Retrying is pointless once this error is known to keep failing
+                if await self._in_thread(self_healing.record_unfixed, e) or attempt == max_retries - 1:
+                    return await self._afallback_simple_conversation(user_query, stream)
+                print(f"🔄 Retrying... ({attempt + 1}/{max_retries})")
+                await asyncio.sleep(1)
+            except Exception as e:
+                print(f"⚠️  Conversation error: {e}")
+                fixed = await self._in_thread(self_healing.auto_fix_error, e, f"Conversation: {user_query}")
+                if not fixed or (stream and stream.current):
+                    return await self._afallback_simple_conversation(user_query, stream)
+                if attempt < max_retries - 1:
+                    print(f"🔄 Retrying... ({attempt + 1}/{max_retries})")
+                    await asyncio.sleep(1)
+        
+        print(f"❌ Maximum retries reached.")
+        return "Sorry, couldn't process your request. Please try again."
+    
+    async def _aexecute_conversation(self, user_query: str, stream: Optional[TokenStream] = None) -> str:
         try:
-            models = self.client.list()
-            model_names = [m.get('name', '') for m in models.get('models', [])]
-            
-            if not any(self.model in name for name in model_names):
-                print(f"📥 Pulling model {self.model}... (this may take a few minutes)")
-                self.client.pull(self.model)
-                print(f"✅ Model {self.model} ready!")
+            all_tools, tools = await self._in_thread(self._prepare_turn, user_query)
+            for iteration in range(1, self.max_iterations + 1):
+                try:
+                    response = await self._acall_llm_with_retry(tools, stream)
+                    tool_calls, content = self._record_response(response)
+                    if not tool_calls:
+                        return content or "Done! Anything else?"
+                    
+                    tools = self._widen_tools(user_query, all_tools, tools, tool_calls)
+                    await self._aexecute_tool_calls(tool_calls)
+                    
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️  Iteration {iteration} error: {e}")
+                    if not await self._in_thread(self_healing.auto_fix_error, e, f"LLM iteration {iteration}"):
+                        raise
+        except asyncio.CancelledError:
+            # Superseded or past its deadline: tell the LLM this turn was abandoned
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": "(Stopped before finishing this request.)"
+            })
+            raise
+        
+        return "Request processed! What else can I help with?"
+    
+    async def _acall_llm_with_retry(self, tools: List[Dict[str, Any]],
+                                    stream: Optional[TokenStream] = None) -> Dict[str, Any]:
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                with tracer.span("history"):
+                    messages = self.conversation_history.build_messages()
+                response = await self._achat(messages, tools, stream)
+                self.conversation_history.calibrate(
+                    response.get('prompt_eval_count'), messages,
+                    extra_chars=len(json.dumps(tools)) if tools else 0
+                )
+                return response
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if (stream and stream.current) or attempt == max_retries - 1:
+                    raise
+                print(f"🔄 LLM call failed, retrying... ({attempt + 1}/{max_retries})")
+                await asyncio.sleep(1)
+    
+    async def _achat(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None,
+                     stream: Optional[TokenStream] = None) -> Dict[str, Any]:
+        """
+        _chat on Ollama's async client. Cancelling closes the HTTP request,
+        which makes Ollama stop generating.
+        """
+        if self.async_client is None:
+            return await self._in_thread(self._chat, messages, tools, stream)
+        
+        with tracer.span("llm", model=self.model, tools=len(tools or []), streamed=stream is not None) as span:
+            if stream is None:
+                response = await self.async_client.chat(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools if tools else None,
+                    keep_alive=KEEP_ALIVE
+                )
             else:
-                print(f"✅ Using model: {self.model}")
+                accumulator = ChatAccumulator(stream)
+                async for chunk in await self.async_client.chat(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools if tools else None,
+                    stream=True,
+                    keep_alive=KEEP_ALIVE
+                ):
+                    accumulator.add(chunk)
+                response = accumulator.response()
+            self.model_manager.touch()
+            self._trace_llm_response(span, response)
+            return response
+    
+    async def _afallback_simple_conversation(self, user_query: str, stream: Optional[TokenStream] = None) -> str:
+        try:
+            print("🔄 Using simple conversation mode (no tools)...")
+            response = await self._achat(self._simple_messages(user_query), stream=stream)
+            return response['message']['content'] or "I'm here to help! What do you need?"
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"⚠️  Model check failed: {e}")
-            print(f"💡 Manually pull model: ollama pull {self.model}")
-
-    def process_query(self, user_query: str) -> str:
+            print(f"⚠️  Simple conversation also failed: {e}")
+            return "Sorry, I couldn't process that request. Please try again."
+    
+    async def _aexecute_tool_calls(self, tool_calls: List[Dict[str, Any]]):
         """
-        Process user query with personal assistant intelligence
+        Async _execute_tool_calls_with_healing: independent calls run
+        concurrently in threads, serial-skill calls one at a time in order.
         """
-        # If Ollama is not ready, use simple responses
-        if not self.ollama_ready:
-            return self._handle_without_ollama(user_query)
+        names = [self._tool_call_name(tool_call) for tool_call in tool_calls]
+        serial = [i for i, name in enumerate(names) if self.registry.is_serial(name)]
+        results: Dict[int, str] = {}
+        
+        async def run(index: int) -> bool:
+            try:
+                results[index] = await asyncio.wait_for(
+                    self._in_thread(self._run_tool_call, tool_calls[index]), self.tool_timeout
+                )
+                return True
+            except asyncio.TimeoutError:
+                print(f"⚠️  Tool {names[index]} timed out after {self.tool_timeout:.0f}s")
+                results[index] = f"Error: {names[index]} timed out after {self.tool_timeout:.0f}s"
+                return False
+        
+        async def run_serial():
+            for position, index in enumerate(serial):
+                if not await run(index):
+                    # Later UI steps depend on this one - don't run them
+                    for skipped in serial[position + 1:]:
+                        results[skipped] = f"Skipped {names[skipped]}: an earlier step timed out"
+                    return
+        
+        parallel = [i for i in range(len(tool_calls)) if i not in serial]
+        await asyncio.gather(run_serial(), *(run(index) for index in parallel))
         
+        for index in range(len(tool_calls)):
+            self.conversation_history.append({
+                "role": "tool",
+                "content": results[index]
+            })
+    
+    def _process_query(self, user_query: str, stream: Optional[TokenStream]) -> str:
+        # Unambiguous commands ("youtube kholo", "volume badhao") skip the LLM entirely
+        routed = self._try_direct_route(user_query)
+        if routed is not None:
+            self.assistant.add_to_history(user_query, routed)
+            return routed
+        
+        # Waits for the model warm-up; simple responses if Ollama isn't available
+        unavailable = self._model_unavailable_reply(user_query)
+        if unavailable is not None:
+            return unavailable
+        
+        analysis, response = self._analyze_query(user_query)
+        if response is not None:
+            return response
+        
+        result = self._run_conversation(user_query, stream)
+        return self._finish_reply(user_query, result, analysis)
+    
+    def _analyze_query(self, user_query: str) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Personal assistant analysis plus canned replies (greetings, thanks...).
+        Returns (analysis, reply) - reply is None when the LLM is needed.
+        """
         # First, let personal assistant analyze the query
-        analysis = self.assistant.process_conversation(user_query)
+        with tracer.span("analyze") as span:
+            analysis = self.assistant.process_conversation(user_query)
+            span.set(intent=analysis['action_type'])
         
         # Handle special cases
+        response = None
         if self._is_greeting(user_query):
             response = self.assistant.get_personality_response('greeting')
-            self.assistant.add_to_history(user_query, response)
-            return response
-        
-        if self._is_thanks(user_query):
+        elif self._is_thanks(user_query):
             response = self.assistant.get_personality_response('thanks')
-            self.assistant.add_to_history(user_query, response)
-            return response
-        
-        if self._is_goodbye(user_query):
+        elif self._is_goodbye(user_query):
             response = self.assistant.get_personality_response('goodbye')
-            self.assistant.add_to_history(user_query, response)
-            return response
-        
-        # If it's a simple yes/no clarification
-        if self._is_clarification(user_query):
+        elif self._is_clarification(user_query):
+            # If it's a simple yes/no clarification
             response = self.assistant.handle_clarification(user_query)
-            self.assistant.add_to_history(user_query, response)
-            return response
         
-        # If action is needed, execute with LLM
-        if analysis['action_needed']:
+        if response is not None:
+            self.assistant.add_to_history(user_query, response)
+        elif analysis['action_needed']:
             # Add empathetic acknowledgment
             print(f"\n{analysis['response']}\n")
-            
-            # Execute the actual task
-            result = self.run_conversation(user_query)
-            
-            # Add natural follow-up
-            emotion = analysis['emotion']
-            if emotion == "happy":
-                result += "\n\n😊 Glad I could help! Anything else?"
-            elif emotion == "frustrated":
-                result += "\n\nI hope this helps! Let me know if you need anything else."
-            else:
-                result += "\n\nDone! What else can I do for you?"
-            
+        return analysis, response
+    
+    def _finish_reply(self, user_query: str, result: str, analysis: Dict[str, Any]) -> str:
+        """Record the exchange and add a natural follow-up for actions"""
+        self.assistant.add_to_history(user_query, result)
+        if not analysis['action_needed']:
             return result
         
-        # For pure conversation, use LLM
-        return self.run_conversation(user_query)
+        emotion = analysis['emotion']
+        if emotion == "happy":
+            result += "\n\n😊 Glad I could help! Anything else?"
+        elif emotion == "frustrated":
+            result += "\n\nI hope this helps! Let me know if you need anything else."
+        else:
+            result += "\n\nDone! What else can I do for you?"
+        return result
     
+    def _try_direct_route(self, user_query: str) -> Optional[str]:
+        """
+        Dispatch a high-confidence command straight to its registry tool.
+        Returns the reply, or None to continue with the normal (LLM) path.
+        """
+        if not self.direct_routing:
+            return None
+        
+        with tracer.span("route") as span:
+            route = self.router.route(user_query)
+            span.set(intent=route['intent'] if route else None)
+        if not self.router.is_confident(route) or not self.registry.has_tool(route['tool']):
+            return None
+        
+        print(f"⚡ Direct command: {route['intent']} -> {route['tool']}({route['args']})")
+        try:
+            content = self.registry.execute_skill(route['tool'], route['args'])
+        except Exception as e:
+            print(f"⚠️  Direct command failed, asking the LLM instead: {e}")
+            return None
+        
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        try:
+            data = json.loads(content)
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        if data.get('status') == 'error' or 'error' in data:
+            print(f"⚠️  Direct command returned an error, asking the LLM instead: {content[:200]}")
+            return None
+        
+        reply = self.router.format_reply(route, data)
+        
+        # Keep the exchange in context so follow-ups ("aur tez karo") make sense to the LLM
+        self.conversation_history.append({"role": "user", "content": user_query})
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{"function": {"name": route['tool'], "arguments": route['args']}}]
+        })
+        self.conversation_history.append({"role": "tool", "content": content})
+        self.conversation_history.append({"role": "assistant", "content": reply})
+        return reply
+
     def _handle_without_ollama(self, user_query: str) -> str:
         """Handle queries when Ollama is not available"""
         # Simple pattern matching for basic commands
@@ -258,20 +730,30 @@ Available tools will be provided in the function calling format."""
         clarifications = ['yes', 'no', 'haan', 'nahi', 'yeah', 'nope', 'ok', 'okay']
         return text.lower().strip() in clarifications
 
-    def run_conversation(self, user_query: str) -> str:
+    def run_conversation(self, user_query: str, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Run a conversation with self-healing error handling.
         Automatically recovers from errors and retries.
         """
-        if not self.ollama_ready:
-            return self._handle_without_ollama(user_query)
+        if on_token is None:
+            return self._run_conversation(user_query, None)
+        
+        stream = TokenStream(on_token)
+        result = self._run_conversation(user_query, stream)
+        stream.finish(result)
+        return result
+
+    def _run_conversation(self, user_query: str, stream: Optional[TokenStream]) -> str:
+        unavailable = self._model_unavailable_reply(user_query)
+        if unavailable is not None:
+            return unavailable
         
         retry_count = 0
         max_retries = 3
         
         while retry_count < max_retries:
             try:
-                return self._execute_conversation(user_query)
+                return self._execute_conversation(user_query, stream)
             except AttributeError as e:
                 # Special handling for AttributeError - these are code issues
                 error_msg = str(e)
@@ -287,11 +769,15 @@ Available tools will be provided in the function calling format."""
                 self_healing.log_error(e, f"AttributeError in conversation: {user_query}")
                 retry_count += 1
                 
+                # Retrying is pointless once this error is known to keep failing
+                if self_healing.record_unfixed(e):
+                    return self._fallback_simple_conversation(user_query, stream)
+                
                 if retry_count < max_retries:
                     print(f"🔄 Retrying... ({retry_count}/{max_retries})")
                     time.sleep(1)
                 else:
-                    return self._fallback_simple_conversation(user_query)
+                    return self._fallback_simple_conversation(user_query, stream)
                     
             except Exception as e:
                 error_msg = str(e)
@@ -307,42 +793,83 @@ Available tools will be provided in the function calling format."""
                         print(f"❌ Maximum retries reached.")
                         return "Sorry, couldn't process your request. Please try again."
                 else:
-                    return self._fallback_simple_conversation(user_query)
+                    return self._fallback_simple_conversation(user_query, stream)
         
         return "Sorry, couldn't process your request. Please try again."
 
-    def _fallback_simple_conversation(self, user_query: str) -> str:
+    def _fallback_simple_conversation(self, user_query: str, stream: Optional[TokenStream] = None) -> str:
         """Fallback to simple conversation without tools when errors occur"""
         if not self.ollama_ready:
             return self._handle_without_ollama(user_query)
         
         try:
             print("🔄 Using simple conversation mode (no tools)...")
-            response = self.client.chat(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are JARVIS, a helpful and friendly AI assistant. Answer the user's question directly and warmly."
-                    },
-                    {
-                        "role": "user",
-                        "content": user_query
-                    }
-                ]
-            )
+            response = self._chat(self._simple_messages(user_query), stream=stream)
             return response['message']['content'] or "I'm here to help! What do you need?"
         except Exception as e:
             print(f"⚠️  Simple conversation also failed: {e}")
             return "Sorry, I couldn't process that request. Please try again."
 
-    def _execute_conversation(self, user_query: str) -> str:
+    def _simple_messages(self, user_query: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                "role": "system",
+                "content": "You are JARVIS, a helpful and friendly AI assistant. Answer the user's question directly and warmly."
+            },
+            {
+                "role": "user",
+                "content": user_query
+            }
+        ]
+
+    def _execute_conversation(self, user_query: str, stream: Optional[TokenStream] = None) -> str:
         """Internal method to execute conversation logic"""
+        all_tools, tools = self._prepare_turn(user_query)
+        
+        iteration = 0
+        while iteration < self.max_iterations:
+            iteration += 1
+            
+            try:
+                # Call LLM with error handling
+                response = self._call_llm_with_retry(tools, stream)
+                tool_calls, content = self._record_response(response)
+                
+                # Check if done
+                if not tool_calls:
+                    return content or "Done! Anything else?"
+                
+                tools = self._widen_tools(user_query, all_tools, tools, tool_calls)
+                
+                # Execute tool calls with error handling
+                self._execute_tool_calls_with_healing(tool_calls)
+                
+            except Exception as e:
+                print(f"⚠️  Iteration {iteration} error: {e}")
+                if not self_healing.auto_fix_error(e, f"LLM iteration {iteration}"):
+                    raise
+
+        return "Request processed! What else can I help with?"
+
+    def _prepare_turn(self, user_query: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Add the user message and recalled memories to the history and pick
+        the tool schemas for this turn. Returns (all_tools, tools_to_send).
+        """
         # Add user message
         self.conversation_history.append({
             "role": "user",
             "content": user_query
         })
+        
+        # Relevant facts and earlier-session turns (this session's turns are already in history)
+        with tracer.span("recall") as span:
+            recalled = [
+                item for item in recall_index.search(user_query, k=self.recall_k * 2)
+                if item['kind'] != 'turn' or item['created_at'] < self.session_started
+            ]
+            self.conversation_history.set_recall([item['text'] for item in recalled[:self.recall_k]])
+            span.set(snippets=min(len(recalled), self.recall_k))
 
         # Get all available tools with error handling
         try:
@@ -359,45 +886,51 @@ Available tools will be provided in the function calling format."""
         if tools:
             tools = self._validate_tools_format(tools)
         
-        iteration = 0
-        while iteration < self.max_iterations:
-            iteration += 1
-            
-            try:
-                # Call LLM with error handling
-                response = self._call_llm_with_retry(tools)
-                
-                # Process response - Ollama format is different from Groq
-                assistant_message = response.get('message', {})
-                
-                # Handle tool calls in Ollama format
-                tool_calls = assistant_message.get('tool_calls', None)
-                
-                # Build assistant message dict
-                assistant_msg = {
-                    "role": "assistant",
-                    "content": assistant_message.get('content', "")
-                }
-                
-                # Only add tool_calls if they exist
-                if tool_calls:
-                    assistant_msg["tool_calls"] = tool_calls
-                
-                self.conversation_history.append(assistant_msg)
+        # Only the schemas relevant to this query (plus tools already used in the conversation)
+        all_tools = tools
+        with tracer.span("tool_select") as span:
+            tools = self.tool_selector.select(user_query, all_tools, include=self._recent_tool_names())
+            saved = self.tool_selector.record_savings(all_tools, tools, self.conversation_history.chars_per_token)
+            span.set(sent=len(tools), total=len(all_tools), tokens_saved=saved)
+        return all_tools, tools
 
-                # Check if done
-                if not tool_calls:
-                    return assistant_message.get('content', "Done! Anything else?")
+    def _record_response(self, response: Dict[str, Any]) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        """Append the LLM reply to the history; returns (tool_calls, content)"""
+        # Process response - Ollama format is different from Groq
+        assistant_message = response.get('message', {})
+        
+        # Handle tool calls in Ollama format
+        tool_calls = assistant_message.get('tool_calls', None)
+        
+        # Build assistant message dict
+        assistant_msg = {
+            "role": "assistant",
+            "content": assistant_message.get('content', "")
+        }
+        
+        # Only add tool_calls if they exist
+        if tool_calls:
+            assistant_msg["tool_calls"] = tool_calls
+        
+        self.conversation_history.append(assistant_msg)
+        return tool_calls, assistant_message.get('content', "")
 
-                # Execute tool calls with error handling
-                self._execute_tool_calls_with_healing(tool_calls)
-                
-            except Exception as e:
-                print(f"⚠️  Iteration {iteration} error: {e}")
-                if not self_healing.auto_fix_error(e, f"LLM iteration {iteration}"):
-                    raise
+    def _widen_tools(self, user_query: str, all_tools: List[Dict[str, Any]], tools: List[Dict[str, Any]],
+                     tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Model asked for a tool it wasn't given - offer more next iteration"""
+        offered = {tool_name(tool) for tool in tools}
+        missing = [name for name in map(self._tool_call_name, tool_calls) if name not in offered]
+        if missing:
+            return self.tool_selector.widen(user_query, all_tools, tools, missing)
+        return tools
 
-        return "Request processed! What else can I help with?"
+    def _recent_tool_names(self, messages: int = 12) -> List[str]:
+        """Tools called in the last few messages, kept available for follow-ups"""
+        names = []
+        for message in self.conversation_history.messages[-messages:]:
+            for tool_call in message.get("tool_calls") or []:
+                names.append(self._tool_call_name(tool_call))
+        return names
 
     def _validate_tools_format(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Validate and fix tools format to prevent errors"""
@@ -407,68 +940,184 @@ Available tools will be provided in the function calling format."""
                 validated_tools.append(tool)
         return validated_tools
 
-    def _call_llm_with_retry(self, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _call_llm_with_retry(self, tools: List[Dict[str, Any]], stream: Optional[TokenStream] = None) -> Dict[str, Any]:
         """Call LLM with retry logic"""
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = self.client.chat(
-                    model=self.model,
-                    messages=self.conversation_history,
-                    tools=tools if tools else None
+                with tracer.span("history"):
+                    messages = self.conversation_history.build_messages()
+                response = self._chat(messages, tools, stream)
+                self.conversation_history.calibrate(
+                    response.get('prompt_eval_count'), messages,
+                    extra_chars=len(json.dumps(tools)) if tools else 0
                 )
                 return response
             except Exception as e:
+                # Can't retry cleanly once tokens reached the user
+                if stream and stream.current:
+                    raise
                 if attempt < max_retries - 1:
                     print(f"🔄 LLM call failed, retrying... ({attempt + 1}/{max_retries})")
                     time.sleep(1)
                 else:
                     raise
 
+    def _chat(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None,
+              stream: Optional[TokenStream] = None) -> Dict[str, Any]:
+        """
+        Single Ollama chat call. With a stream, tokens are pushed as they
+        arrive and the chunks are assembled into a normal response dict.
+        keep_alive keeps the model loaded so Ollama can reuse the already
+        evaluated system prompt prefix instead of re-evaluating it each turn.
+        """
+        with tracer.span("llm", model=self.model, tools=len(tools or []), streamed=stream is not None) as span:
+            if stream is None:
+                response = self.client.chat(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools if tools else None,
+                    keep_alive=KEEP_ALIVE
+                )
+            else:
+                accumulator = ChatAccumulator(stream)
+                for chunk in self.client.chat(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools if tools else None,
+                    stream=True,
+                    keep_alive=KEEP_ALIVE
+                ):
+                    accumulator.add(chunk)
+                response = accumulator.response()
+            self.model_manager.touch()
+            self._trace_llm_response(span, response)
+            return response
+    
+    def _trace_llm_response(self, span, response: Dict[str, Any]):
+        message = response.get('message') or {}
+        span.set(
+            prompt_tokens=response.get('prompt_eval_count'),
+            completion_tokens=response.get('eval_count'),
+            tool_calls=[self._tool_call_name(call) for call in message.get('tool_calls') or []]
+        )
+
     def _execute_tool_calls_with_healing(self, tool_calls: List[Dict[str, Any]]):
-        """Execute tool calls with self-healing"""
-        for tool_call in tool_calls:
-            try:
-                function_name = tool_call['function']['name']
-                
-                # Handle both dict and JSON string arguments from Ollama
-                arguments = tool_call['function']['arguments']
-                if isinstance(arguments, str):
-                    function_args = json.loads(arguments)
-                elif isinstance(arguments, dict):
-                    function_args = arguments
-                else:
-                    function_args = {}
-                
-                # Execute function
-                result = self.registry.execute_skill(function_name, function_args)
-                
-                # Add result to conversation
-                self.conversation_history.append({
-                    "role": "tool",
-                    "content": json.dumps(result) if result else "Success"
-                })
-                
-            except Exception as e:
-                error_msg = f"Error executing {function_name}: {str(e)}"
-                print(f"⚠️  {error_msg}")
-                
-                # Try to auto-fix
-                if self_healing.auto_fix_error(e, f"Tool execution: {function_name}"):
-                    # Retry
-                    try:
-                        result = self.registry.execute_skill(function_name, function_args)
-                        self.conversation_history.append({
-                            "role": "tool",
-                            "content": json.dumps(result) if result else "Success"
-                        })
-                    except:
-                        self.conversation_history.append({
-                            "role": "tool",
-                            "content": f"Error: {error_msg}"
-                        })
+        """
+        Execute tool calls with self-healing.
+        Independent calls run concurrently; tools from serial skills (UI
+        automation, file writes...) run one at a time in call order.
+        Results are appended to the conversation in the original call order.
+        """
+        if len(tool_calls) == 1:
+            self.conversation_history.append({
+                "role": "tool",
+                "content": self._run_tool_call(tool_calls[0])
+            })
+            return
+        
+        names = [self._tool_call_name(tool_call) for tool_call in tool_calls]
+        serial_flags = [self.registry.is_serial(name) for name in names]
+        
+        results: Dict[int, str] = {}
+        start_times: Dict[int, float] = {}
+        
+        def job(index):
+            start_times[index] = time.perf_counter()
+            return self._run_tool_call(tool_calls[index])
+        
+        parallel_pool = ThreadPoolExecutor(
+            max_workers=min(self.max_parallel_tools, len(tool_calls)),
+            thread_name_prefix="tool"
+        )
+        serial_lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-serial")
+        futures = {
+            (serial_lane if serial_flags[index] else parallel_pool).submit(
+                contextvars.copy_context().run, job, index
+            ): index
+            for index in range(len(tool_calls))
+        }
+        
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                if future.cancelled():
+                    results[index] = f"Skipped {names[index]}: an earlier step timed out"
                 else:
-                    self.conversation_history.append({
-                        "role": "tool",
-                        "content": f"Error: {error_msg}"
-                    })
+                    results[index] = future.result()
+            
+            now = time.perf_counter()
+            for future in list(pending):
+                index = futures[future]
+                if index in start_times and now - start_times[index] > self.tool_timeout:
+                    # Can't kill the thread; abandon it and report the timeout
+                    pending.discard(future)
+                    print(f"⚠️  Tool {names[index]} timed out after {self.tool_timeout:.0f}s")
+                    results[index] = f"Error: {names[index]} timed out after {self.tool_timeout:.0f}s"
+                    if serial_flags[index]:
+                        # Later UI steps depend on this one - don't run them (the
+                        # independent parallel calls carry on)
+                        for other in pending:
+                            if serial_flags[futures[other]]:
+                                other.cancel()
+        
+        parallel_pool.shutdown(wait=False)
+        serial_lane.shutdown(wait=False)
+        
+        for index in range(len(tool_calls)):
+            self.conversation_history.append({
+                "role": "tool",
+                "content": results[index]
+            })
+    
+    def _tool_call_name(self, tool_call: Dict[str, Any]) -> str:
+        try:
+            return tool_call['function']['name']
+        except (KeyError, TypeError):
+            return "unknown"
+    
+    def _run_tool_call(self, tool_call: Dict[str, Any]) -> str:
+        """Execute one tool call (with self-healing) and return the tool message content"""
+        function_name = self._tool_call_name(tool_call)
+        function_args = {}
+        try:
+            # Handle both dict and JSON string arguments from Ollama
+            arguments = tool_call['function'].get('arguments')
+            if isinstance(arguments, str):
+                try:
+                    function_args = json.loads(arguments) if arguments.strip() else {}
+                except json.JSONDecodeError as e:
+                    raise ToolArgumentError(
+                        function_name,
+                        f"Arguments for '{function_name}' are not valid JSON: {e}",
+                        [{"field": None, "issue": "invalid JSON"}],
+                        "Send arguments as a JSON object"
+                    )
+            elif isinstance(arguments, dict):
+                function_args = arguments
+            
+            # Execute function
+            result = self.registry.execute_skill(function_name, function_args)
+            return json.dumps(result) if result else "Success"
+            
+        except ToolCallError as e:
+            # Bad call from the LLM, not a code problem - let it correct
+            # the call instead of going through self-healing
+            print(f"⚠️  Rejected tool call: {e}")
+            return json.dumps(e.to_dict())
+            
+        except Exception as e:
+            error_msg = f"Error executing {function_name}: {str(e)}"
+            print(f"⚠️  {error_msg}")
+            
+            # Try to auto-fix
+            if self_healing.auto_fix_error(e, f"Tool execution: {function_name}"):
+                # Retry
+                try:
+                    result = self.registry.execute_skill(function_name, function_args)
+                    return json.dumps(result) if result else "Success"
+                except:
+                    pass
+            return f"Error: {error_msg}"
@@ -14,7 +14,8 @@ import re
 import json
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-import requests
+from core import http_client
+from core.intent_router import OrderedPatternSet
 
 
 class EnhancedAIAgent:
@@ -78,6 +79,8 @@ class EnhancedAIAgent:
             ],
             'general': []  # Fallback
         }
+        # All patterns in one regex, checked in the order above
+        self._intent_matcher = OrderedPatternSet(self.intent_patterns)
         
         # Action executors
         self.action_executors = {}
@@ -106,11 +109,10 @@ class EnhancedAIAgent:
         """
         query_lower = query.lower()
         
-        # Check each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower):
-                    return intent, 0.9
+        # First intent (in pattern order) with any matching pattern
+        matched = self._intent_matcher.search(query_lower)
+        if matched:
+            return matched[0], 0.9
         
         # Fallback to general
         return 'general', 0.5
@@ -161,7 +163,7 @@ class EnhancedAIAgent:
             # Build prompt with context
             prompt = self._build_prompt(query, context)
             
-            response = requests.post(
+            response = http_client.post(
                 f"{self.ollama_url}/api/generate",
                 json={
                     "model": self.model,
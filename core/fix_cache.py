@@ -0,0 +1,268 @@
+"""
+Persistent Error Fix Cache for JARVIS
+Disk-backed (SQLite) record of every error the self-healing system has
+seen, keyed by a fingerprint of exception type + normalized message +
+stack location:
+- Successful fixes (with what fixed them) resolve instantly on repeats
+- Errors that keep failing are marked unfixable and skipped fast
+- Attempt counts and fix timings survive restarts
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import traceback
+from typing import Any, Dict, List, Optional
+
+DEFAULT_FIX_CACHE_PATH = os.path.expanduser("~/.jarvis_fix_cache.db")
+# Consecutive failed fixes before an error counts as unfixable
+DEFAULT_MAX_FAILURES = 3
+# Unfixable errors are tried again after this long (packages, Ollama... may have changed)
+DEFAULT_RETRY_AFTER = 24 * 3600
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Volatile parts of error messages that shouldn't split one error into many fingerprints
+_NORMALIZERS = [
+    (re.compile(r"0x[0-9a-fA-F]+"), "0x?"),                                   # object addresses
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), "<uuid>"),
+    (re.compile(r"(?:[A-Za-z]:)?[\\/](?:[^\s'\"\\/]+[\\/])+([^\s'\"\\/]+)"), r"\1"),  # paths -> basename
+    (re.compile(r"\b\d{3,}\b"), "<n>"),                                        # ids, ports, sizes
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_message(message: str) -> str:
+    for pattern, replacement in _NORMALIZERS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:300]
+
+
+def stack_location(error: BaseException) -> str:
+    """Innermost project frame as 'path:function' (no line number - it moves with edits)"""
+    frames = traceback.extract_tb(error.__traceback__) if error.__traceback__ else []
+    if not frames:
+        return ""
+    chosen = frames[-1]
+    for frame in reversed(frames):
+        if os.path.abspath(frame.filename).startswith(PROJECT_ROOT):
+            chosen = frame
+            break
+    path = os.path.abspath(chosen.filename)
+    if path.startswith(PROJECT_ROOT):
+        path = os.path.relpath(path, PROJECT_ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{path.replace(os.sep, '/')}:{chosen.name}"
+
+
+def error_fingerprint(error: BaseException) -> Dict[str, str]:
+    """{"key", "type", "message", "location"} identifying an error across runs"""
+    error_type = type(error).__name__
+    message = normalize_message(str(error))
+    location = stack_location(error)
+    key = hashlib.sha256(f"{error_type}|{message}|{location}".encode("utf-8")).hexdigest()[:24]
+    return {"key": key, "type": error_type, "message": message, "location": location}
+
+
+class FixCache:
+    """
+    SQLite-backed error fingerprint store.
+
+    Usage:
+        fp = error_fingerprint(e)
+        entry = fix_cache.lookup(fp)
+        if fix_cache.is_unfixable(entry):
+            return False
+        ...
+        fix_cache.record_success(fp, "basic", {"package": "opencv-python"}, elapsed_ms)
+        fix_cache.record_failure(fp, elapsed_ms)
+    """
+
+    def __init__(self, path: Optional[str] = None, max_failures: int = DEFAULT_MAX_FAILURES,
+                 retry_after: float = DEFAULT_RETRY_AFTER):
+        self.path = os.path.expanduser(path or os.environ.get("JARVIS_FIX_CACHE_PATH", DEFAULT_FIX_CACHE_PATH))
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+        self.enabled = os.environ.get("JARVIS_FIX_CACHE", "1") != "0"
+
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.skips = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing this module stays free
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fixes ("
+                " fingerprint TEXT PRIMARY KEY,"
+                " error_type TEXT NOT NULL,"
+                " message TEXT NOT NULL,"
+                " location TEXT NOT NULL,"
+                " status TEXT NOT NULL,"           # fixed | failing | unfixable
+                " method TEXT,"                    # what fixed it last: basic, ai...
+                " detail TEXT,"                    # JSON needed to replay the fix
+                " successes INTEGER NOT NULL DEFAULT 0,"
+                " failures INTEGER NOT NULL DEFAULT 0,"
+                " failures_in_row INTEGER NOT NULL DEFAULT 0,"
+                " total_ms REAL NOT NULL DEFAULT 0,"
+                " last_ms REAL NOT NULL DEFAULT 0,"
+                " first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fixes_status ON fixes(status)")
+            self._conn.commit()
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, fingerprint: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Stored record for this error, or None if it has never been seen"""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT * FROM fixes WHERE fingerprint = ?", (fingerprint["key"],)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️  Fix cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        entry = dict(row)
+        try:
+            entry["detail"] = json.loads(entry["detail"]) if entry["detail"] else {}
+        except ValueError:
+            entry["detail"] = {}
+        return entry
+
+    def is_unfixable(self, entry: Optional[Dict[str, Any]]) -> bool:
+        """True for errors that kept failing recently - skip fix attempts for them"""
+        if not entry or entry["status"] != "unfixable":
+            return False
+        if time.time() - entry["last_seen"] >= self.retry_after:
+            return False
+        self.skips += 1
+        return True
+
+    def known_fix(self, entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The fix that worked last time ({"method", "detail"}), if any"""
+        if not entry or entry["status"] != "fixed" or not entry["method"]:
+            return None
+        return {"method": entry["method"], "detail": entry["detail"]}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record_success(self, fingerprint: Dict[str, str], method: str,
+                       detail: Optional[Dict[str, Any]] = None, elapsed_ms: float = 0.0,
+                       replayed: bool = False):
+        """Remember what fixed this error (replayed=True when a cached fix was reused)"""
+        if replayed:
+            self.hits += 1
+        self._record(fingerprint, True, method, detail, elapsed_ms)
+
+    def record_failure(self, fingerprint: Dict[str, str], elapsed_ms: float = 0.0) -> bool:
+        """Count a failed fix; returns True if the error is now considered unfixable"""
+        entry = self._record(fingerprint, False, None, None, elapsed_ms)
+        return bool(entry) and entry["status"] == "unfixable"
+
+    def _record(self, fingerprint: Dict[str, str], success: bool, method: Optional[str],
+                detail: Optional[Dict[str, Any]], elapsed_ms: float) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT * FROM fixes WHERE fingerprint = ?", (fingerprint["key"],)
+                ).fetchone()
+                entry = dict(row) if row else {
+                    "fingerprint": fingerprint["key"], "error_type": fingerprint["type"],
+                    "message": fingerprint["message"], "location": fingerprint["location"],
+                    "status": "failing", "method": None, "detail": None, "successes": 0,
+                    "failures": 0, "failures_in_row": 0, "total_ms": 0.0, "last_ms": 0.0,
+                    "first_seen": now,
+                }
+
+                if success:
+                    entry["successes"] += 1
+                    entry["failures_in_row"] = 0
+                    entry["status"] = "fixed"
+                    entry["method"] = method
+                    entry["detail"] = json.dumps(detail or {}, ensure_ascii=False, default=str)
+                else:
+                    entry["failures"] += 1
+                    entry["failures_in_row"] += 1
+                    entry["status"] = ("unfixable" if entry["failures_in_row"] >= self.max_failures
+                                       else "failing")
+                entry["total_ms"] += elapsed_ms
+                entry["last_ms"] = elapsed_ms
+                entry["last_seen"] = now
+
+                columns = list(entry.keys())
+                conn.execute(
+                    f"INSERT OR REPLACE INTO fixes ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' for _ in columns)})",
+                    [entry[column] for column in columns]
+                )
+                conn.commit()
+            return entry
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"⚠️  Fix cache write failed: {e}")
+            return None
+
+    def forget(self, fingerprint: Dict[str, str]):
+        """Drop one error's record (e.g. after fixing it by hand)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM fixes WHERE fingerprint = ?", (fingerprint["key"],))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM fixes")
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def entries(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently seen errors, newest first"""
+        if not self.enabled:
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT fingerprint, error_type, message, location, status, method, successes, failures,"
+                " total_ms, last_seen FROM fixes ORDER BY last_seen DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        counts = {"fixed": 0, "failing": 0, "unfixable": 0}
+        if self.enabled:
+            with self._lock:
+                for status, count in self._connect().execute(
+                    "SELECT status, COUNT(*) FROM fixes GROUP BY status"
+                ).fetchall():
+                    counts[status] = count
+        return {**counts, "hits": self.hits, "skips": self.skips, "enabled": self.enabled}
+
+
+# Global instance
+fix_cache = FixCache()
@@ -0,0 +1,216 @@
+"""
+Token-budgeted conversation history for JARVIS
+Keeps the prompt sent to Ollama bounded over long sessions:
+- System prompt is always pinned
+- Old tool outputs are trimmed first
+- Whole old turns are then evicted into a running summary
+- Long-term recall snippets relevant to the current query ride along
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+TRIM_MARKER = " …[trimmed]"
+
+
+class ConversationHistory:
+    """
+    Conversation history with a token budget.
+
+    Messages are appended as usual; ``build_messages()`` enforces the budget
+    (evicting in place) and returns the list to send to the LLM.
+    Token counts are estimated from characters and calibrated against the
+    real ``prompt_eval_count`` Ollama reports.
+    """
+
+    def __init__(self, system_prompt: str, token_budget: int = 4000,
+                 keep_recent: int = 6, tool_stub_chars: int = 200,
+                 summary_budget: int = 400, recall_budget: int = 300):
+        """
+        Args:
+            system_prompt: Pinned first message, never evicted
+            token_budget: Target size of the whole prompt in tokens
+            keep_recent: Number of most recent messages whose tool outputs are never trimmed
+            tool_stub_chars: How much of an old tool output to keep when trimming
+            summary_budget: Max tokens of running summary kept for evicted turns
+            recall_budget: Max tokens of recalled memory snippets per query
+        """
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.tool_stub_chars = tool_stub_chars
+        self.summary_budget = summary_budget
+        self.recall_budget = recall_budget
+
+        self.messages: List[Dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+        self.summary_lines: List[str] = []
+        self.recall_lines: List[str] = []
+        self.chars_per_token = 4.0
+
+        # Stats
+        self.evicted_turns = 0
+        self.trimmed_tool_outputs = 0
+
+    # ------------------------------------------------------------------
+
+    def append(self, message: Dict[str, Any]):
+        self.messages.append(message)
+
+    def clear(self):
+        """Forget everything except the system prompt"""
+        self.messages = self.messages[:1]
+        self.summary_lines = []
+        self.recall_lines = []
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __getitem__(self, index):
+        return self.messages[index]
+
+    # ------------------------------------------------------------------
+    # Token accounting
+    # ------------------------------------------------------------------
+
+    def estimate_tokens(self, message: Dict[str, Any]) -> int:
+        chars = len(message.get("content") or "")
+        if message.get("tool_calls"):
+            chars += len(json.dumps(message["tool_calls"], default=str))
+        # ~4 tokens of per-message overhead for role/formatting
+        return int(chars / self.chars_per_token) + 4
+
+    def total_tokens(self, messages: Optional[List[Dict[str, Any]]] = None) -> int:
+        messages = self.messages if messages is None else messages
+        return sum(self.estimate_tokens(m) for m in messages) + self._summary_tokens() + self._recall_tokens()
+
+    def calibrate(self, prompt_eval_count: Optional[int], messages: List[Dict[str, Any]],
+                  extra_chars: int = 0):
+        """
+        Adjust the chars/token ratio from the count Ollama actually evaluated.
+        extra_chars covers other prompt text, e.g. the serialized tool schemas.
+        """
+        if not prompt_eval_count:
+            return
+        chars = sum(len(m.get("content") or "") for m in messages) + extra_chars
+        if chars <= 0:
+            return
+        observed = chars / prompt_eval_count
+        if 1.0 <= observed <= 8.0:
+            self.chars_per_token = 0.8 * self.chars_per_token + 0.2 * observed
+
+    def _summary_tokens(self) -> int:
+        if not self.summary_lines:
+            return 0
+        return self.estimate_tokens({"content": self._summary_text()})
+
+    def _summary_text(self) -> str:
+        return "Summary of earlier conversation:\n" + "\n".join(f"- {line}" for line in self.summary_lines)
+
+    def _recall_tokens(self) -> int:
+        if not self.recall_lines:
+            return 0
+        return self.estimate_tokens({"content": self._recall_text()})
+
+    def _recall_text(self) -> str:
+        return "Relevant memories (from earlier sessions):\n" + "\n".join(f"- {line}" for line in self.recall_lines)
+
+    def set_recall(self, snippets: List[str]):
+        """Replace the recalled snippets for the current query (best match first)"""
+        self.recall_lines = [" ".join(s.split()) for s in snippets if s and s.strip()]
+        while self.recall_lines and self._recall_tokens() > self.recall_budget:
+            self.recall_lines.pop()
+
+    # ------------------------------------------------------------------
+    # Budget enforcement
+    # ------------------------------------------------------------------
+
+    def build_messages(self) -> List[Dict[str, Any]]:
+        """Enforce the token budget and return messages for the LLM"""
+        self._enforce_budget()
+
+        messages = [self.messages[0]]
+        if self.summary_lines:
+            messages.append({"role": "system", "content": self._summary_text()})
+        if self.recall_lines:
+            messages.append({"role": "system", "content": self._recall_text()})
+        messages.extend(self.messages[1:])
+        return messages
+
+    def _enforce_budget(self):
+        while self.total_tokens() > self.token_budget:
+            if self._trim_oldest_tool_output():
+                continue
+            if self._evict_oldest_turn():
+                continue
+            break  # Only the current turn is left - nothing more to drop
+
+    def _trim_oldest_tool_output(self) -> bool:
+        protected_from = max(1, len(self.messages) - self.keep_recent)
+        for message in self.messages[1:protected_from]:
+            content = message.get("content") or ""
+            if message.get("role") == "tool" and not content.endswith(TRIM_MARKER) \
+                    and len(content) > self.tool_stub_chars:
+                message["content"] = content[:self.tool_stub_chars] + TRIM_MARKER
+                self.trimmed_tool_outputs += 1
+                return True
+        return False
+
+    def _turn_boundaries(self) -> List[int]:
+        return [i for i, m in enumerate(self.messages) if i > 0 and m.get("role") == "user"]
+
+    def _evict_oldest_turn(self) -> bool:
+        starts = self._turn_boundaries()
+        if len(starts) < 2:
+            return False  # Never evict the current turn
+
+        start, end = starts[0], starts[1]
+        turn = self.messages[start:end]
+        del self.messages[1:end]  # Also drops any orphans before the first turn
+        self.evicted_turns += 1
+
+        self.summary_lines.append(self._summarize_turn(turn))
+        while len(self.summary_lines) > 1 and self._summary_tokens() > self.summary_budget:
+            self.summary_lines.pop(0)
+        return True
+
+    def _summarize_turn(self, turn: List[Dict[str, Any]]) -> str:
+        user_text = ""
+        reply = ""
+        tools = []
+        for message in turn:
+            role = message.get("role")
+            if role == "user" and not user_text:
+                user_text = message.get("content") or ""
+            elif role == "assistant":
+                for call in message.get("tool_calls") or []:
+                    name = call.get("function", {}).get("name")
+                    if name:
+                        tools.append(name)
+                if message.get("content"):
+                    reply = message["content"]
+
+        line = f"User: {_shorten(user_text, 100)}"
+        if tools:
+            line += f" | tools: {', '.join(dict.fromkeys(tools))}"
+        if reply:
+            line += f" | JARVIS: {_shorten(reply, 100)}"
+        return line
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "messages": len(self.messages),
+            "estimated_tokens": self.total_tokens(),
+            "token_budget": self.token_budget,
+            "evicted_turns": self.evicted_turns,
+            "trimmed_tool_outputs": self.trimmed_tool_outputs,
+            "recalled_snippets": len(self.recall_lines),
+            "chars_per_token": round(self.chars_per_token, 2)
+        }
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
@@ -0,0 +1,132 @@
+"""
+Shared HTTP client for JARVIS
+One pooled requests.Session for every skill and core module:
+- Keep-alive connection pools per host (Ollama, DuckDuckGo, APIs...)
+- Retry with exponential backoff on connection errors and 429/5xx
+- Consistent default timeouts
+
+Usage:
+    from core import http_client
+    response = http_client.get(url, params=params)
+"""
+
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds - used when the caller doesn't pass a timeout
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 JARVIS'
+
+
+class HTTPClient:
+    """Pooled, retrying HTTP client. Safe to share between threads."""
+
+    def __init__(self, pool_connections: int = 16, pool_maxsize: int = 16,
+                 retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: Any = DEFAULT_TIMEOUT):
+        """
+        Args:
+            pool_connections: Number of distinct hosts to keep pools for
+            pool_maxsize: Max open keep-alive connections per host
+            retries: Retries for connection errors and retryable statuses
+            backoff_factor: Sleep backoff_factor * 2^n between retries
+            timeout: Default timeout for requests that don't specify one
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+
+        self._session: Optional[requests.Session] = None
+        self._probe_session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        # Built on first use so importing this module costs nothing
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session(self.retries)
+        return self._session
+
+    @property
+    def probe_session(self) -> requests.Session:
+        """Pooled session without retries, for health checks that must fail fast"""
+        if self._probe_session is None:
+            with self._lock:
+                if self._probe_session is None:
+                    self._probe_session = self._build_session(0)
+        return self._probe_session
+
+    def _build_session(self, retries: int) -> requests.Session:
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # POST is only retried when the connection couldn't be made,
+            # never after the server may have started processing it
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        return session
+
+    def request(self, method: str, url: str, retry: bool = True, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+        Pass retry=False for availability checks that should fail fast.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session if retry else self.probe_session
+        return session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in (self._session, self._probe_session):
+                if session is not None:
+                    session.close()
+            self._session = None
+            self._probe_session = None
+
+
+# Global instance
+client = HTTPClient()
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET through the shared pooled session"""
+    return client.get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared pooled session"""
+    return client.post(url, **kwargs)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return client.request(method, url, **kwargs)
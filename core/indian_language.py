@@ -5,8 +5,15 @@ Koi bhi admi bole, JARVIS samajh jayega!
 """
 
 import re
+import sys
+import time
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
+from core.intent_router import OrderedPatternSet
+
+_HAS_WORD_CHAR = re.compile(r'\w')
+
 class IndianLanguageProcessor:
     """
     Process and understand Indian language patterns
@@ -169,32 +176,46 @@ class IndianLanguageProcessor:
             'andar': 'in',
         }
         
-        # Common Indian English sentence patterns
-        self.sentence_patterns = [
-            # "X karo" -> "do X"
-            (r'(.+?)\s+kar[o|na|do|dena|diya]', r'do \1'),
-            
-            # "mujhe X chahiye" -> "i want X"
-            (r'mujhe\s+(.+?)\s+cha[hiye|iye]', r'i want \1'),
-            
-            # "X dikha do" -> "show X"
-            (r'(.+?)\s+dikha[o|do]', r'show \1'),
-            
-            # "X bata do" -> "tell X"
-            (r'(.+?)\s+bata[o|do|na]', r'tell \1'),
-            
-            # "X khol do" -> "open X"
-            (r'(.+?)\s+khol[o|do|na]', r'open \1'),
-            
-            # "X band kar do" -> "close X"
-            (r'(.+?)\s+band\s+kar[o|do]', r'close \1'),
-            
-            # "X chala do" -> "play X"
-            (r'(.+?)\s+chala[o|do]', r'play \1'),
-            
-            # "X dhundho" -> "search X"
-            (r'(.+?)\s+dhund[ho|o]', r'search \1'),
-        ]
+        # Common Indian English sentence patterns: "X <verb phrase>" -> "<english verb> X"
+        # (e.g. "youtube kholo" -> "open youtube", "chrome band kar do" -> "close chrome")
+        self.sentence_verbs = {
+            'band karo': 'close',
+            'band kar do': 'close',
+            'karo': 'do',
+            'karna': 'do',
+            'kar do': 'do',
+            'kar dena': 'do',
+            'kar diya': 'do',
+            'dikhao': 'show',
+            'dikha do': 'show',
+            'batao': 'tell',
+            'bata do': 'tell',
+            'batana': 'tell',
+            'kholo': 'open',
+            'khol do': 'open',
+            'kholna': 'open',
+            'chalao': 'play',
+            'chala do': 'play',
+            'dhundho': 'search',
+            'dhundo': 'search',
+        }
+        
+        # "mujhe X chahiye" -> "i want X"
+        self.want_prefix = 'mujhe'
+        self.want_suffixes = ['chahiye', 'chaiye']
+        
+        # Action words for extract_intent, in priority order
+        self.actions = {
+            'open': ['open', 'launch', 'start', 'run'],
+            'close': ['close', 'exit', 'quit', 'stop'],
+            'play': ['play', 'start'],
+            'search': ['search', 'find', 'look', 'google'],
+            'show': ['show', 'display'],
+            'tell': ['tell', 'say'],
+            'send': ['send'],
+            'write': ['write'],
+            'read': ['read'],
+        }
         
         # Common app name variations
         self.app_variations = {
@@ -220,64 +241,76 @@ class IndianLanguageProcessor:
             'calc': 'calculator',
             'kalkulator': 'calculator',
         }
+        
+        self.compile()
     
-    def normalize_text(self, text: str) -> str:
+    def compile(self, cache_size: int = 2048):
         """
-        Normalize Indian language text to standard English
-        Handles Hinglish, Indian English, and common variations
+        Compile the tables above into single-pass regexes.
+        Call again after changing indian_patterns, sentence_verbs, app_variations or actions.
         """
-        if not text:
-            return ""
+        def alternation(phrases):
+            # Longest first so "band kar do" wins over "kar do"
+            ordered = sorted(set(phrases), key=len, reverse=True)
+            return '|'.join(re.escape(p).replace(r'\ ', r'\s+') for p in ordered)
         
-        # Convert to lowercase
-        text = text.lower().strip()
+        self._verb_table = dict(self.sentence_verbs)
+        self._sentence_re = re.compile(
+            rf'^(?:{re.escape(self.want_prefix)}\s+(?P<want>.+?)\s+(?:{alternation(self.want_suffixes)})\b'
+            rf'|(?P<obj>.+?)\s+(?P<verb>{alternation(self.sentence_verbs)})\b)'
+        )
         
-        # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        # One word/phrase table: indian_patterns take precedence over app_variations
+        self._word_table = dict(self.app_variations)
+        self._word_table.update(self.indian_patterns)
+        self._word_re = re.compile(rf'\b(?:{alternation(self._word_table)})\b')
         
-        # Apply sentence patterns first (more context-aware)
-        for pattern, replacement in self.sentence_patterns:
-            text = re.sub(pattern, replacement, text)
+        self._action_matcher = OrderedPatternSet({
+            action: [rf'\b(?:{alternation(words)})\b'] for action, words in self.actions.items()
+        })
+        self._action_words_re = re.compile(
+            rf'\b(?:{alternation(w for words in self.actions.values() for w in words)})\b'
+        )
         
-        # Replace individual words
-        words = text.split()
-        normalized_words = []
+        # Voice and GUI repeat the same short commands a lot
+        self._analyze = lru_cache(maxsize=cache_size)(self._analyze_uncached)
+    
+    def _analyze_uncached(self, text: str) -> Tuple[str, str, str]:
+        """Normalize and extract intent in one pass: (normalized, action, entity)"""
+        text = ' '.join(text.lower().split())
         
-        for word in words:
-            # Check if word is in patterns dictionary
-            if word in self.indian_patterns:
-                replacement = self.indian_patterns[word]
-                if replacement:  # Only add if not empty string
-                    normalized_words.append(replacement)
-            # Check app variations
-            elif word in self.app_variations:
-                normalized_words.append(self.app_variations[word])
+        # Sentence pattern: a single anchored match against the combined alternation
+        match = self._sentence_re.match(text)
+        if match:
+            if match.group('want') is not None:
+                head = f"i want {match.group('want')}"
             else:
-                normalized_words.append(word)
-        
-        # Join and clean up
-        normalized = ' '.join(normalized_words)
+                head = f"{self._verb_table[match.group('verb')]} {match.group('obj')}"
+            text = head + text[match.end():]
         
-        # Remove duplicate words
-        normalized = self._remove_duplicates(normalized)
+        # Word/phrase replacement in one sub, then drop consecutive duplicates
+        # and punctuation left behind by removed words ("bhai, ..." -> ", ...")
+        text = self._word_re.sub(lambda m: self._word_table[' '.join(m.group(0).split())], text)
+        words = []
+        for word in text.split():
+            if (not words or words[-1] != word) and _HAS_WORD_CHAR.search(word):
+                words.append(word)
+        normalized = ' '.join(words)
         
-        # Clean up extra spaces again
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        matched = self._action_matcher.search(normalized)
+        if matched is None:
+            return normalized, 'unknown', normalized
+        entity = ' '.join(self._action_words_re.sub(' ', normalized).split())
+        return normalized, matched[0], entity or normalized
     
-    def _remove_duplicates(self, text: str) -> str:
-        """Remove duplicate consecutive words"""
-        words = text.split()
-        result = []
-        prev = None
-        
-        for word in words:
-            if word != prev:
-                result.append(word)
-            prev = word
-        
-        return ' '.join(result)
+    def normalize_text(self, text: str) -> str:
+        """
+        Normalize Indian language text to standard English
+        Handles Hinglish, Indian English, and common variations
+        """
+        if not text:
+            return ""
+        return self._analyze(text)[0]
     
     def extract_intent(self, text: str) -> Tuple[str, str]:
         """
@@ -287,41 +320,12 @@ class IndianLanguageProcessor:
         Examples:
         "youtube kholo" -> ("open", "youtube")
         "gaana bajao" -> ("play", "song")
-        "google pe dhundho" -> ("search", "google")
+        "chrome band kar do" -> ("close", "chrome")
         """
-        normalized = self.normalize_text(text)
-        
-        # Common action words
-        actions = {
-            'open': ['open', 'launch', 'start', 'run'],
-            'close': ['close', 'exit', 'quit', 'stop'],
-            'play': ['play', 'start'],
-            'search': ['search', 'find', 'look', 'google'],
-            'show': ['show', 'display'],
-            'tell': ['tell', 'say'],
-            'send': ['send'],
-            'write': ['write'],
-            'read': ['read'],
-        }
-        
-        # Find action
-        action = None
-        for key, variations in actions.items():
-            for variation in variations:
-                if variation in normalized:
-                    action = key
-                    break
-            if action:
-                break
-        
-        # Extract entity (remove action words)
-        entity = normalized
-        if action:
-            for variations in actions.values():
-                for variation in variations:
-                    entity = entity.replace(variation, '').strip()
-        
-        return (action or 'unknown', entity or normalized)
+        if not text:
+            return ('unknown', '')
+        _, action, entity = self._analyze(text)
+        return (action, entity)
     
     def is_question(self, text: str) -> bool:
         """Check if text is a question"""
@@ -393,8 +397,110 @@ def is_indian_question(text: str) -> bool:
     return indian_language.is_question(text)
 
 
+# The pre-compilation sentence patterns, kept only as the benchmark reference
+_REFERENCE_SENTENCE_PATTERNS = [
+    (r'(.+?)\s+kar[o|na|do|dena|diya]', r'do \1'),
+    (r'mujhe\s+(.+?)\s+cha[hiye|iye]', r'i want \1'),
+    (r'(.+?)\s+dikha[o|do]', r'show \1'),
+    (r'(.+?)\s+bata[o|do|na]', r'tell \1'),
+    (r'(.+?)\s+khol[o|do|na]', r'open \1'),
+    (r'(.+?)\s+band\s+kar[o|do]', r'close \1'),
+    (r'(.+?)\s+chala[o|do]', r'play \1'),
+    (r'(.+?)\s+dhund[ho|o]', r'search \1'),
+]
+
+
+def _reference_analyze(processor: IndianLanguageProcessor, text: str) -> Tuple[str, str, str]:
+    """
+    The old per-pattern pipeline (one re.sub per sentence pattern, a dict
+    lookup per word, a substring scan per action word), timed by benchmark()
+    as the baseline. Its output differs in places - it's only a cost reference.
+    """
+    text = re.sub(r'\s+', ' ', text.lower().strip())
+    for pattern, replacement in _REFERENCE_SENTENCE_PATTERNS:
+        text = re.sub(pattern, replacement, text)
+    
+    words = []
+    for word in text.split():
+        if word in processor.indian_patterns:
+            if processor.indian_patterns[word]:
+                words.append(processor.indian_patterns[word])
+        elif word in processor.app_variations:
+            words.append(processor.app_variations[word])
+        else:
+            words.append(word)
+    deduped = []
+    for word in ' '.join(words).split():
+        if not deduped or deduped[-1] != word:
+            deduped.append(word)
+    normalized = re.sub(r'\s+', ' ', ' '.join(deduped)).strip()
+    
+    action = None
+    for key, variations in processor.actions.items():
+        for variation in variations:
+            if variation in normalized:
+                action = key
+                break
+        if action:
+            break
+    entity = normalized
+    if action:
+        for variations in processor.actions.values():
+            for variation in variations:
+                entity = entity.replace(variation, '').strip()
+    return normalized, action or 'unknown', entity or normalized
+
+
+def benchmark(utterances: Optional[List[str]] = None, rounds: int = 200) -> Dict[str, float]:
+    """
+    Micro-benchmark the normalize + extract pipeline.
+    Returns microseconds per utterance for the old per-pattern pipeline
+    (reference), cold (uncached) and cached calls, and the cold speedup.
+    Usage: python -m core.indian_language --benchmark
+    """
+    processor = IndianLanguageProcessor()
+    utterances = utterances or processor.get_examples()
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            # normalize_text + extract_intent each normalized separately
+            _reference_analyze(processor, utterance)
+            _reference_analyze(processor, utterance)
+    reference = (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            processor._analyze_uncached(utterance)
+    cold = (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            processor.normalize_text(utterance)
+            processor.extract_intent(utterance)
+    cached = (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+    
+    return {
+        "utterances": len(utterances),
+        "reference_us": round(reference, 2),
+        "cold_us": round(cold, 2),
+        "cached_us": round(cached, 2),
+        "speedup": round(reference / cold, 1) if cold else 0.0,
+    }
+
+
 # Example usage and testing
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        result = benchmark()
+        print(f"Normalize + extract over {result['utterances']} Hinglish utterances:")
+        print(f"  old per-pattern: {result['reference_us']:.2f} µs/utterance")
+        print(f"  cold:            {result['cold_us']:.2f} µs/utterance ({result['speedup']}x faster)")
+        print(f"  cached:          {result['cached_us']:.2f} µs/utterance")
+        sys.exit(0)
+    
     print("="*60)
     print("Indian Language Processor - Test Examples")
     print("="*60)
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compiled Intent Router for JARVIS
+One precompiled, single-pass router for Hindi, Hinglish and English commands:
+- Keyword trie over all intent keywords -> per-category scores in one scan
+- All direct-command patterns combined into one anchored alternation regex
+  -> intent, confidence and slots from a single match
+- High-confidence commands ("youtube kholo", "volume badhao") map straight
+  to a registry tool, so the engine can skip the LLM round trip
+"""
+
+import re
+import string
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+# Categories used by PersonalAssistant.understand_context. When several match,
+# the later one wins (same precedence as the old keyword checks).
+CATEGORY_KEYWORDS = {
+    'play_music': ['play', 'bajao', 'song', 'gaana', 'gana', 'music', 'youtube', 'video',
+                   'गाना', 'बजाओ', 'यूट्यूब'],
+    'download_movie': ['download', 'movie', 'film', 'vegamovies', 'फिल्म', 'मूवी'],
+    'search': ['search', 'google', 'find', 'dhundo', 'khojo', 'खोजो', 'ढूंढो'],
+    'system_control': ['volume', 'awaz', 'awaaz', 'mute', 'brightness', 'screenshot', 'open', 'close',
+                       'kholo', 'band', 'आवाज', 'खोलो', 'बंद'],
+    'web_browse': ['website', 'open', 'kholo', 'खोलो'],
+}
+CATEGORY_PRECEDENCE = ['play_music', 'download_movie', 'search', 'system_control', 'web_browse']
+_URL = re.compile(r"https?://|\.(?:com|in|org|net|io)\b")
+
+# A slot that must not swallow a second command ("youtube kholo aur gaana bajao"):
+# any text without another verb or conjunction as a whole word
+_OTHER_VERBS = (r"kholo|khol do|open|karo|kar do|chalao|batao|bolo|dikhao|sunao|suna do|aur|and|then|phir|"
+                r"खोलो|करो|चलाओ|बताओ|सुनाओ|और|फिर")
+_ONE_COMMAND = rf"(?:(?!(?<!\S)(?:{_OTHER_VERBS})(?!\S)).)+?"
+_OPEN_VERBS = r"kholo|khol do|kholna|open|open karo|open kar do|खोलो|खोल दो"
+# Trailing verbs that make "google X <verb>" a command about X, not a search
+_DO_VERBS = rf"{_OPEN_VERBS}|karo|kar do|chalao|chalu karo|start karo|launch karo|करो|कर दो"
+# "youtube pe arijit singh ka gaana chalao" -> the song is "arijit singh"
+_PLATFORM_PREFIX = r"(?:(?:youtube|yt|spotify|gaana|jiosaavn|यूट्यूब) (?:pe|par|on|se|पे|पर) )?"
+_DOMAIN = r"(?:https?://)?(?:www\.)?[a-z0-9-]+(?:\.[a-z0-9-]+)*\.(?:com|in|org|net|io|co|dev|app|ai)(?:/\S*)?"
+
+# Apps open_app knows by name (skill/system_ops.py maps, plus common spellings).
+# "<other words> kholo" still matches open_app, below the dispatch threshold.
+KNOWN_APPS = {
+    # Browsers and web services
+    "chrome", "google chrome", "krom", "crome", "firefox", "edge", "microsoft edge", "safari", "brave",
+    "youtube", "gmail", "google", "facebook", "twitter", "instagram", "reddit", "github", "linkedin",
+    "netflix", "spotify", "amazon", "whatsapp", "discord",
+    # Desktop apps
+    "notepad", "calculator", "calc", "paint", "cmd", "command prompt", "powershell", "terminal",
+    "word", "excel", "powerpoint", "outlook", "vlc", "vscode", "vs code", "steam", "winrar", "7zip",
+    "photoshop", "obs", "obs studio", "finder", "notes", "mail", "messages", "files",
+    # System tools
+    "this pc", "my computer", "computer", "control panel", "settings", "task manager", "device manager",
+    "disk management", "services", "registry editor", "regedit", "event viewer", "system information",
+    "resource monitor", "performance monitor", "computer management", "disk cleanup", "snipping tool",
+    "magnifier", "narrator", "character map", "remote desktop", "file explorer", "windows explorer",
+    "explorer",
+}
+# Confidence of a pattern match whose slot isn't a known value: the LLM decides
+UNSURE_CONFIDENCE = 0.6
+
+# Direct commands, in priority order. Each pattern must match the WHOLE
+# normalized utterance; a pattern is (regex, confidence) or just regex (0.95).
+# Args are templates filled from named groups; the tool's validator coerces types.
+# Optional per-command slot checks:
+#   "known": {slot: set} - values outside the set score UNSURE_CONFIDENCE
+#   "reject": {slot: set} - values in the set mean the command doesn't match
+DIRECT_COMMANDS: List[Dict[str, Any]] = [
+    {
+        "intent": "open_youtube",
+        "category": "play_music",
+        "tool": "play_youtube",
+        "args": {"query": ""},
+        "reply": "Opening YouTube...",
+        "patterns": [
+            r"(?:open )?youtube(?: (?:kholo|khol do|kholna|open karo|open kar do|chalao|chala do|open))?",
+            r"यूट्यूब(?: (?:खोलो|खोल दो|चलाओ))?",
+        ],
+    },
+    {
+        "intent": "volume_set",
+        "category": "system_control",
+        "tool": "set_volume",
+        "args": {"level": "{level}"},
+        "reply": "Volume set to {level}%.",
+        "patterns": [
+            r"(?:set )?(?:volume|awaz|awaaz|sound|आवाज|वॉल्यूम) (?:ko |to |at |pe |par )?(?P<level>100|[1-9]?\d)"
+            r"(?: ?%| percent| प्रतिशत)?(?: (?:pe|par|par karo|pe karo|kar do|karo|rakho|set karo|करो|कर दो))?",
+            r"(?:set|rakho|rakh do) (?:the )?(?:volume|awaz|awaaz) (?:to |at |pe |par )?(?P<level>100|[1-9]?\d)(?: ?%| percent)?",
+        ],
+    },
+    {
+        "intent": "volume_up",
+        "category": "system_control",
+        "tool": "adjust_volume",
+        "args": {"direction": "up"},
+        "reply": "Volume badha diya!",
+        "patterns": [
+            r"(?:volume|awaz|awaaz|sound|आवाज|वॉल्यूम) (?:thoda |aur |थोड़ा |थोडा )?"
+            r"(?:up|up karo|badhao|badha do|badhaao|tez karo|zyada karo|increase|increase karo|upar karo|"
+            r"बढाओ|बढा दो|तेज करो|ज्यादा करो)",
+            r"(?:increase|raise|turn up) (?:the )?(?:volume|sound)",
+        ],
+    },
+    {
+        "intent": "volume_down",
+        "category": "system_control",
+        "tool": "adjust_volume",
+        "args": {"direction": "down"},
+        "reply": "Volume kam kar diya!",
+        "patterns": [
+            r"(?:volume|awaz|awaaz|sound|आवाज|वॉल्यूम) (?:thoda |aur |थोड़ा |थोडा )?"
+            r"(?:down|down karo|kam karo|kam kar do|kam|ghatao|ghata do|dheere karo|dheema karo|decrease|"
+            r"decrease karo|neeche karo|कम करो|कम कर दो|घटाओ|धीमी करो)",
+            r"(?:decrease|lower|turn down) (?:the )?(?:volume|sound)",
+        ],
+    },
+    {
+        "intent": "mute",
+        "category": "system_control",
+        "tool": "set_volume",
+        "args": {"level": "0"},
+        "reply": "Muted.",
+        "patterns": [
+            r"mute(?: karo| kar do| the volume)?",
+            r"(?:volume|awaz|awaaz|sound) (?:mute|band|off) (?:karo|kar do)",
+            r"(?:आवाज|वॉल्यूम) (?:बंद|म्यूट) (?:करो|कर दो)",
+        ],
+    },
+    {
+        "intent": "play_music",
+        "category": "play_music",
+        "tool": "play_music",
+        "args": {"query": ""},
+        "reply": "Playing music...",
+        "patterns": [
+            r"(?:koi |ek |kuch )?(?:gaana|gana|gaane|gane|song|songs|music|गाना|गाने)"
+            r"(?: (?:bajao|chalao|sunao|play karo|laga do|lagao|बजाओ|चलाओ|सुनाओ|लगाओ))",
+            r"play (?:some |a )?(?:music|songs?)",
+            r"(?:kuch|koi|kuch bhi|koi bhi|kuch accha|kuch achha|कुछ|कोई)(?: (?:gaana|gana|song|music|गाना))? "
+            r"(?:bajao|baja do|chalao|sunao|laga do|lagao|बजाओ|चलाओ|सुनाओ)",
+        ],
+    },
+    {
+        "intent": "play_trending_language",
+        "category": "play_music",
+        "tool": "play_trending_song",
+        "args": {"language": "{language}"},
+        "reply": "Playing a trending {language} song...",
+        "patterns": [
+            r"(?:koi |ek |kuch )?(?:trending|latest|new|naya|naye|nayi) "
+            r"(?P<language>hindi|english|punjabi|bhojpuri|tamil|telugu|marathi|bengali) "
+            r"(?:gaana|gana|gaane|gane|song|songs|music) (?:bajao|chalao|sunao|play karo|laga do|lagao)",
+            r"play (?:some |a )?(?:trending|latest|new) (?P<language>hindi|english|punjabi|bhojpuri|tamil|telugu) "
+            r"(?:songs?|music)",
+        ],
+    },
+    {
+        "intent": "play_trending",
+        "category": "play_music",
+        "tool": "play_trending_song",
+        "args": {},
+        "reply": "Playing a trending song...",
+        "patterns": [
+            r"(?:koi |ek |kuch )?(?:trending|latest|new|naya|naye|nayi) "
+            r"(?:gaana|gana|gaane|gane|song|songs|music) (?:bajao|chalao|sunao|play karo|laga do|lagao)",
+            r"play (?:some |a )?(?:trending|latest|new) (?:songs?|music)",
+        ],
+    },
+    {
+        "intent": "play_song",
+        "category": "play_music",
+        "tool": "play_music",
+        "args": {"query": "{query}"},
+        "reply": "Playing {query}...",
+        "patterns": [
+            rf"{_PLATFORM_PREFIX}(?P<query>{_ONE_COMMAND}) (?:ka |ke |ki |wala |wale )?(?:gaana|gana|gaane|gane|song|songs|गाना|गाने) "
+            r"(?:bajao|chalao|sunao|suna do|play karo|laga do|lagao|बजाओ|चलाओ|सुनाओ|लगाओ)",
+            # "sunao" alone is "tell" (ek joke sunao) - only bajao means play without a music noun
+            rf"{_PLATFORM_PREFIX}(?P<query>{_ONE_COMMAND}) (?:bajao|baja do|बजाओ|बजा दो)",
+            r"play (?:the )?(?:song )?(?P<query>.+?) (?:song|on youtube)",
+        ],
+        # Not song names: fillers, and "band baja do" (ruin it)
+        "reject": {"query": {"kuch", "koi", "ek", "kuch bhi", "koi bhi", "band", "ye", "yeh", "woh", "wo",
+                             "isko", "usko", "sab", "कुछ", "कोई", "एक"}},
+    },
+    {
+        "intent": "current_time",
+        "category": "chat",
+        "tool": "get_current_time",
+        "args": {},
+        "reply": "It's {time}.",
+        "patterns": [
+            r"(?:abhi )?(?:kitne|kitna|kya) (?:baje|baj|time) (?:hai|hain|hua|ho gaya|rahe hain|ho gaye)",
+            r"(?:time|samay|टाइम|समय)(?: (?:kya hai|kya hua|batao|kya ho raha hai|please|क्या है|क्या हुआ|बताओ))?",
+            r"what(?:s| is) the time(?: now)?",
+            r"what time is it(?: now)?",
+            r"कितने बजे (?:है|हैं|हुए)",
+        ],
+    },
+    {
+        "intent": "current_date",
+        "category": "chat",
+        "tool": "get_current_date",
+        "args": {},
+        "reply": "Today is {date}.",
+        "patterns": [
+            r"(?:aaj )?(?:ki |ka )?(?:date|tarikh|tareekh) (?:kya hai|batao|kya he)",
+            r"aaj (?:kya|kaunsi) (?:date|tarikh|tareekh) hai",
+            r"what(?:s| is) (?:the |todays |today s )?date(?: today)?",
+            r"आज (?:की )?(?:तारीख|डेट) (?:क्या है|बताओ)",
+        ],
+    },
+    {
+        "intent": "screenshot",
+        "category": "system_control",
+        "tool": "take_screenshot",
+        "args": {},
+        "reply": "Screenshot le liya!",
+        "patterns": [
+            r"(?:take |le |lo )?(?:a )?screenshot(?: (?:lo|le lo|lelo|le|khicho|kheecho|karo|please|le do|लो|ले लो))?",
+            r"स्क्रीनशॉट(?: (?:लो|ले लो|लीजिए))?",
+        ],
+    },
+    {
+        "intent": "weather",
+        "category": "search",
+        "tool": "get_weather",
+        "args": {"city": "{city}"},
+        "reply": "Checking the weather in {city}...",
+        "patterns": [
+            r"(?P<city>(?!(?:aaj|aj|abhi|kal|yahan|aaj ka|aaj ki)\b)[a-z][a-z ]{1,30}?) "
+            r"(?:ka|ki|mein|me|main) (?:mausam|weather)(?: (?:kaisa hai|batao|kya hai|kaisa rahega))?",
+            r"(?:whats |what is )?(?:the )?weather (?:like )?(?:in|of|at|for) (?P<city>[a-z][a-z ]{1,30}?)(?: today| now)?",
+        ],
+    },
+    {
+        "intent": "open_website",
+        "category": "web_browse",
+        "tool": "open_website",
+        "args": {"url": "{url}"},
+        "reply": "Opening {url}...",
+        "patterns": [
+            rf"(?:(?:open|go to|visit) )?(?P<url>{_DOMAIN})(?: (?:{_OPEN_VERBS}))?",
+        ],
+    },
+    {
+        "intent": "google_search",
+        "category": "search",
+        "tool": "google_search",
+        "args": {"search_term": "{term}"},
+        "reply": "Searching Google for {term}...",
+        "patterns": [
+            r"google (?:pe |par |on )?(?P<term>.+?) (?:search karo|search kar do|search|dhundo|khojo|सर्च करो|खोजो)",
+            r"(?P<term>.+?) (?:google karo|google par search karo|google pe search karo|गूगल करो)",
+            rf"google (?!(?:.* )?(?:{_DO_VERBS})$)(?P<term>.+)",
+            (r"search (?:for |about )?(?P<term>.+)", 0.8),
+            (r"(?P<term>.+?) (?:search karo|dhundo|khojo|सर्च करो|खोजो)", 0.8),
+        ],
+    },
+    {
+        "intent": "open_app",
+        "category": "system_control",
+        "tool": "open_app",
+        "args": {"app_name": "{app}"},
+        "reply": "Opening {app}...",
+        "patterns": [
+            r"(?P<app>\S+(?: \S+){0,2}) (?:kholo|khol do|open karo|open kar do|chalu karo|start karo|launch karo|खोलो|खोल दो)",
+            # "open the door", "start music": too generic to skip the LLM
+            (r"(?:open|launch|start) (?P<app>\S+(?: \S+){0,2})", 0.7),
+        ],
+        # "darwaza kholo", "fan chalu karo"
+        "known": {"app": KNOWN_APPS},
+    },
+]
+
+_FILLER_PREFIX = re.compile(r"^(?:(?:hey|ok|okay|hi) )?(?:jarvis(?: ji)?|please|plz|pls|zara|jara|bhai|yaar|जरा)\s+")
+_FILLER_SUFFIX = re.compile(r"\s+(?:please|plz|pls|na|jaldi|yaar|bhai|jarvis|ji)$")
+_APOSTROPHE = re.compile(r"['’]")
+_PUNCT = re.compile(r"[?!,;\"“”‘()\[\]{}।॥]+")
+_SPACES = re.compile(r"\s+")
+_NUKTA = "़"
+
+
+class _Template(string.Formatter):
+    """str.format that leaves unknown fields empty instead of raising"""
+
+    def get_value(self, key, args, kwargs):
+        value = kwargs.get(key, "") if isinstance(key, str) else ""
+        return "" if value is None else value
+
+
+_TEMPLATE = _Template()
+
+
+def normalize_command(text: str) -> str:
+    """Lowercase, strip punctuation/nukta/polite fillers, collapse whitespace"""
+    text = unicodedata.normalize("NFC", text).replace(_NUKTA, "").lower()
+    text = _PUNCT.sub(" ", _APOSTROPHE.sub("", text))
+    text = _SPACES.sub(" ", text).strip().rstrip(".")
+    previous = None
+    while previous != text:
+        previous = text
+        text = _FILLER_SUFFIX.sub("", _FILLER_PREFIX.sub("", text))
+    return text
+
+
+class KeywordTrie:
+    """Word-level trie; scan() finds every keyword/phrase in one left-to-right pass"""
+
+    _END = object()
+
+    def __init__(self):
+        self.root: Dict[Any, Any] = {}
+        self.max_phrase = 1
+
+    def add(self, phrase: str, value: Any):
+        words = normalize_command(phrase).split()
+        if not words:
+            return
+        node = self.root
+        for word in words:
+            node = node.setdefault(word, {})
+        node.setdefault(self._END, []).append(value)
+        self.max_phrase = max(self.max_phrase, len(words))
+
+    def scan(self, tokens: List[str]) -> List[Tuple[int, int, List[Any]]]:
+        matches = []
+        for start in range(len(tokens)):
+            node = self.root
+            for end in range(start, min(len(tokens), start + self.max_phrase)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if self._END in node:
+                    matches.append((start, end + 1, node[self._END]))
+        return matches
+
+
+class IntentRouter:
+    """
+    Precompiled intent router.
+
+    Usage:
+        route = intent_router.route("volume badhao")
+        # {'intent': 'volume_up', 'confidence': 0.95, 'tool': 'adjust_volume', 'args': {...}, ...}
+    """
+
+    def __init__(self, commands: List[Dict[str, Any]] = None,
+                 category_keywords: Dict[str, List[str]] = None,
+                 threshold: float = 0.85):
+        """
+        Args:
+            commands: Direct command specs (default DIRECT_COMMANDS)
+            category_keywords: Keywords per category (default CATEGORY_KEYWORDS)
+            threshold: Minimum confidence for a route to be dispatched without the LLM
+        """
+        self.commands = commands if commands is not None else DIRECT_COMMANDS
+        self.threshold = threshold
+
+        self.trie = KeywordTrie()
+        for category, keywords in (category_keywords or CATEGORY_KEYWORDS).items():
+            for keyword in keywords:
+                self.trie.add(keyword, category)
+
+        self._compile()
+
+    def _compile(self):
+        """Combine every command pattern into one anchored alternation"""
+        alternatives = []
+        # group name -> (command, confidence, {slot group -> slot name})
+        self._groups: Dict[str, Tuple[Dict[str, Any], float, Dict[str, str]]] = {}
+
+        for command in self.commands:
+            for pattern in command["patterns"]:
+                regex, confidence = pattern if isinstance(pattern, tuple) else (pattern, 0.95)
+                group = f"r{len(self._groups)}"
+                slots = {}
+
+                def rename(match, group=group, slots=slots):
+                    slot_group = f"{group}_{match.group(1)}"
+                    slots[slot_group] = match.group(1)
+                    return f"(?P<{slot_group}>"
+
+                regex = re.sub(r"\(\?P<(\w+)>", rename, regex)
+                alternatives.append(f"(?P<{group}>{regex})")
+                self._groups[group] = (command, confidence, slots)
+
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    # ------------------------------------------------------------------
+
+    def categorize(self, text: str) -> Dict[str, Any]:
+        """Keyword categories for free text (one trie scan)"""
+        normalized = normalize_command(text)
+        return self._categorize(normalized, normalized.split())
+
+    def _categorize(self, normalized: str, tokens: List[str]) -> Dict[str, Any]:
+        scores: Dict[str, int] = {}
+        for _, _, categories in self.trie.scan(tokens):
+            for category in categories:
+                scores[category] = scores.get(category, 0) + 1
+        if _URL.search(normalized):
+            scores['web_browse'] = scores.get('web_browse', 0) + 1
+
+        category = 'chat'
+        for candidate in CATEGORY_PRECEDENCE:
+            if candidate in scores:
+                category = candidate
+        return {"category": category, "scores": scores}
+
+    def route(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Route an utterance to a direct command.
+
+        Returns None when no direct command matches the whole utterance,
+        otherwise {intent, category, confidence, tool, args, slots, reply, text}.
+        """
+        normalized = normalize_command(text)
+        if not normalized or self._pattern is None:
+            return None
+
+        match = self._pattern.fullmatch(normalized)
+        if match is None:
+            return None
+
+        command, confidence, slot_groups = self._groups[match.lastgroup]
+        slots = {
+            name: match.group(slot_group).strip()
+            for slot_group, name in slot_groups.items()
+            if match.group(slot_group)
+        }
+        if any(not value for value in slots.values()) or len(slots) < len(slot_groups):
+            return None
+        for name, rejected in command.get("reject", {}).items():
+            if slots.get(name) in rejected:
+                return None
+        for name, known in command.get("known", {}).items():
+            if name in slots and slots[name] not in known:
+                confidence = min(confidence, UNSURE_CONFIDENCE)
+
+        args = {
+            key: _TEMPLATE.format(value, **slots) if isinstance(value, str) else value
+            for key, value in command["args"].items()
+        }
+        return {
+            "intent": command["intent"],
+            "category": command["category"],
+            "confidence": confidence,
+            "tool": command["tool"],
+            "args": args,
+            "slots": slots,
+            "reply": command.get("reply", "Done!"),
+            "text": normalized
+        }
+
+    def is_confident(self, route: Optional[Dict[str, Any]]) -> bool:
+        return bool(route) and route["confidence"] >= self.threshold
+
+    @staticmethod
+    def format_reply(route: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """Reply text for a dispatched command, filled from slots and the tool result"""
+        fields = dict(result)
+        fields.update(route["args"])
+        fields.update(route["slots"])
+        reply = _TEMPLATE.format(route["reply"], **fields).strip()
+        return reply or "Done!"
+
+
+class OrderedPatternSet:
+    """
+    {name: [regex, ...]} compiled into one regex that returns the first name
+    (in dict order) with a pattern found anywhere in the text - what a nested
+    ``for name: for pattern: re.search`` loop does - in a single match call.
+    """
+
+    def __init__(self, patterns_by_name: Dict[str, List[str]], flags: int = 0):
+        alternatives = []
+        # outer group index -> (name, inner group indices)
+        self._groups: Dict[int, Tuple[str, range]] = {}
+        index = 1
+        for name, patterns in patterns_by_name.items():
+            for pattern in patterns:
+                inner = re.compile(pattern, flags).groups
+                self._groups[index] = (name, range(index + 1, index + 1 + inner))
+                alternatives.append(f"(?=[\\s\\S]*?({pattern}))")
+                index += 1 + inner
+        self._pattern = re.compile("|".join(alternatives), flags) if alternatives else None
+
+    def search(self, text: str) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """Return (name, captured groups of the matching pattern) or None"""
+        if self._pattern is None:
+            return None
+        match = self._pattern.match(text)
+        if match is None:
+            return None
+        name, inner = self._groups[match.lastindex]
+        return name, tuple(match.group(i) for i in inner)
+
+
+# Global instance
+intent_router = IntentRouter()
@@ -0,0 +1,58 @@
+"""
+Lazy module-level singletons
+`from core.self_healing import self_healing` keeps working, but the object
+behind it (network checks, JSON memory files, audio engines...) is only
+built the first time one of its attributes is used.
+"""
+
+import time
+import threading
+from typing import Any, Callable
+
+from core.startup_profile import startup_profile
+
+
+class LazyInstance:
+    """
+    Usage:
+        self_healing = LazyInstance(SelfHealing, "self_healing")
+
+        self_healing.auto_fix_error(e)   # SelfHealing() is built here, once
+        self_healing.loaded              # True after first use
+    """
+
+    __slots__ = ("_factory", "_name", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name or getattr(factory, "__name__", "instance"))
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.RLock())
+
+    def get(self) -> Any:
+        """The real instance, built on the first call"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                start = time.perf_counter()
+                instance = self._factory()
+                startup_profile.record_init(self._name, (time.perf_counter() - start) * 1000)
+                object.__setattr__(self, "_instance", instance)
+            return self._instance
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self.get(), name, value)
+
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<lazy {self._name} (not built yet)>"
+        return repr(self._instance)
@@ -0,0 +1,162 @@
+"""
+Persistent LLM Response Cache for JARVIS
+Disk-backed (SQLite) cache for deterministic LLM calls - error fix
+generation, research analysis, OCR label suggestions - keyed by
+model + prompt hash + options, with TTL and LRU eviction.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.jarvis_llm_cache.db")
+DEFAULT_TTL = 7 * 24 * 3600  # One week
+DEFAULT_MAX_ENTRIES = 2000
+
+# How long Ollama keeps the model (and its evaluated prompt prefix) in memory
+# between calls. Passed as keep_alive on every request.
+KEEP_ALIVE = os.environ.get("JARVIS_KEEP_ALIVE", "30m")
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache.
+
+    Usage:
+        reply = llm_cache.cached(model, prompt, lambda: call_llm(prompt))
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = os.path.expanduser(path or os.environ.get("JARVIS_LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = os.environ.get("JARVIS_LLM_CACHE", "1") != "0"
+
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing this module stays free
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, prompt: Any, options: Optional[Dict[str, Any]] = None) -> str:
+        """Hash of model + prompt (string or message list) + options"""
+        payload = json.dumps([model, prompt, options or {}], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Cached value, or None if missing or older than ttl (default: the cache TTL)"""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                value, created_at = row
+                now = time.time()
+                if now - created_at > (self.ttl if ttl is None else ttl):
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+
+                conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                conn.commit()
+            return json.loads(value)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️  LLM cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any, model: str = ""):
+        if not self.enabled:
+            return
+        try:
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, value, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model, json.dumps(value, ensure_ascii=False), now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"⚠️  LLM cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then least-recently-used ones over the limit"""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def cached(self, model: str, prompt: Any, compute: Callable[[], Any],
+               options: Optional[Dict[str, Any]] = None, ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached response for this call, or run ``compute`` and
+        cache its result. Empty results (None, "", {}) are never cached.
+        Pass ttl for results that go stale sooner than LLM output (web searches).
+        """
+        key = self.make_key(model, prompt, options)
+        value = self.get(key, ttl)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        if value:
+            self.set(key, value, model)
+        return value
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "enabled": self.enabled
+        }
+
+
+# Global instance
+llm_cache = LLMCache()
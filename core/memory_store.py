@@ -0,0 +1,178 @@
+"""
+Persistent Memory Store for JARVIS
+SQLite (WAL mode) key-value store used by MemorySkill:
+- Indexed keys per namespace - O(log n) lookups instead of rereading a JSON file
+- Atomic transactions, safe across GUI / voice / tool threads
+- Timestamps, prefix and substring search
+- One-time migration from the old ~/.jarvic_memory.json file
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DB_PATH = os.path.expanduser("~/.jarvis_memory.db")
+LEGACY_JSON_PATH = os.path.expanduser("~/.jarvic_memory.json")
+DEFAULT_NAMESPACE = "default"
+
+
+class MemoryStore:
+    """Transactional, indexed key-value memory with namespaces"""
+
+    def __init__(self, path: Optional[str] = None, legacy_json_path: Optional[str] = LEGACY_JSON_PATH):
+        self.path = os.path.expanduser(path or os.environ.get("JARVIS_MEMORY_DB", DEFAULT_DB_PATH))
+        self.legacy_json_path = legacy_json_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers run alongside a writer"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._create_schema(conn)
+                    self._migrate_legacy_json(conn)
+                    self._initialized = True
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memories ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_updated ON memories(updated_at)")
+
+    def _migrate_legacy_json(self, conn: sqlite3.Connection):
+        """Import the old JSON memory file once, then rename it out of the way"""
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+        try:
+            with open(self.legacy_json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read legacy memory file: {e}")
+            return
+
+        if isinstance(legacy, dict) and legacy:
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO memories (namespace, key, value, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(DEFAULT_NAMESPACE, str(k), _encode(v), now, now) for k, v in legacy.items()]
+                )
+            print(f"✅ Migrated {len(legacy)} memories from {self.legacy_json_path}")
+
+        try:
+            os.replace(self.legacy_json_path, self.legacy_json_path + ".migrated")
+        except OSError as e:
+            print(f"⚠️  Could not rename legacy memory file: {e}")
+
+    # ------------------------------------------------------------------
+    # Operations
+    # ------------------------------------------------------------------
+
+    def set(self, key: str, value: Any, namespace: str = DEFAULT_NAMESPACE):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT INTO memories (namespace, key, value, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (namespace, key, _encode(value), now, now)
+            )
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Dict[str, Any]]:
+        """Exact key lookup; returns the record (value + timestamps) or None"""
+        row = self._connect().execute(
+            "SELECT * FROM memories WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return _record(row) if row else None
+
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM memories WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+        return cursor.rowcount > 0
+
+    def search_prefix(self, prefix: str, namespace: str = DEFAULT_NAMESPACE, limit: int = 20) -> List[Dict[str, Any]]:
+        """Keys starting with prefix - a range scan on the primary key index"""
+        rows = self._connect().execute(
+            "SELECT * FROM memories WHERE namespace = ? AND key >= ? AND key < ? ORDER BY key LIMIT ?",
+            (namespace, prefix, prefix + "\U0010ffff", limit)
+        ).fetchall()
+        return [_record(row) for row in rows]
+
+    def search(self, text: str, namespace: Optional[str] = DEFAULT_NAMESPACE, limit: int = 20) -> List[Dict[str, Any]]:
+        """Case-insensitive substring match on keys and values, newest first"""
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = ("SELECT * FROM memories WHERE (key LIKE ? ESCAPE '\\' OR value LIKE ? ESCAPE '\\')")
+        params: List[Any] = [pattern, pattern]
+        if namespace is not None:
+            query += " AND namespace = ?"
+            params.append(namespace)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+        return [_record(row) for row in self._connect().execute(query, params).fetchall()]
+
+    def all(self, namespace: str = DEFAULT_NAMESPACE, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM memories WHERE namespace = ? ORDER BY updated_at DESC"
+        params: List[Any] = [namespace]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [_record(row) for row in self._connect().execute(query, params).fetchall()]
+
+    def count(self, namespace: Optional[str] = DEFAULT_NAMESPACE) -> int:
+        if namespace is None:
+            return self._connect().execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM memories WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+
+    def namespaces(self) -> List[str]:
+        rows = self._connect().execute("SELECT DISTINCT namespace FROM memories ORDER BY namespace").fetchall()
+        return [row[0] for row in rows]
+
+
+def _encode(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def _record(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "namespace": row["namespace"],
+        "key": row["key"],
+        "value": row["value"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"]
+    }
+
+
+# Global instance (connects on first use)
+memory_store = MemoryStore()
@@ -0,0 +1,253 @@
+"""
+Ollama model lifecycle for JARVIS
+Gets the configured model resident before the first query needs it:
+- Connects, pulls the model if missing and warms it up on a background thread
+- Pre-evaluates the fixed system prompt so Ollama can reuse that prefix
+- Refreshes keep_alive while idle so sparse voice commands don't pay a reload
+- Exposes a readiness future and load state (for the GUI) instead of
+  blocking engine initialization
+"""
+
+import re
+import time
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from core.llm_cache import KEEP_ALIVE
+
+# States reported to listeners, in the order a normal start goes through them
+CONNECTING = "connecting"
+PULLING = "pulling"
+LOADING = "loading"
+READY = "ready"
+OFFLINE = "offline"
+
+_DURATION = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def parse_keep_alive(value: Any) -> Optional[float]:
+    """
+    Seconds Ollama keeps an idle model loaded for a keep_alive value
+    ("30m", "1h", "300", 0...); None means forever (negative values)
+    """
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = _DURATION.match(str(value))
+        if not match:
+            return 5 * 60  # Ollama's default
+        seconds = float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    return None if seconds < 0 else seconds
+
+
+class ModelManager:
+    """
+    Usage:
+        manager = ModelManager(client, "llama3.2", system_prompt=prompt)
+        manager.add_listener(lambda state, detail: print(state, detail))
+        manager.start()                       # returns immediately
+
+        if manager.wait_ready(timeout=120):   # blocks only while loading
+            ...
+        manager.touch()                       # after each LLM call
+    """
+
+    def __init__(self, client, model: str, system_prompt: Optional[str] = None,
+                 keep_alive: Any = KEEP_ALIVE, keep_warm: bool = True, retry_after: float = 30.0):
+        """
+        Args:
+            client: ollama.Client
+            model: Model to pull and keep loaded
+            system_prompt: Fixed prompt prefix to evaluate during warm-up
+            keep_alive: Passed to Ollama on warm-up/refresh calls
+            keep_warm: Refresh keep_alive while idle so the model stays loaded
+            retry_after: Seconds before a query retries connecting when Ollama was offline
+        """
+        self.client = client
+        self.model = model
+        self.system_prompt = system_prompt
+        self.keep_alive = keep_alive
+        self.keep_warm = keep_warm
+        self.retry_after = retry_after
+
+        self.state = CONNECTING
+        self.detail = ""
+        self.load_ms: Optional[float] = None
+        self.ready: Future = Future()
+        self.last_used = time.time()
+        self.refreshes = 0
+
+        self._listeners: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._attempted_at = 0.0
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> Future:
+        """Connect, pull and warm up in the background; returns the readiness future"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self.ready
+            if self.ready.done():
+                self.ready = Future()
+            self._attempted_at = time.time()
+            self._thread = threading.Thread(target=self._bring_up, name="jarvis-model", daemon=True)
+            self._thread.start()
+            return self.ready
+
+    def stop(self):
+        """Stop refreshing keep_alive (the model unloads after its keep_alive runs out)"""
+        self._stop.set()
+
+    def _bring_up(self):
+        started = time.perf_counter()
+        try:
+            self._set_state(CONNECTING, "")
+            self._ensure_pulled()
+
+            self._set_state(LOADING, f"Loading {self.model}...")
+            self._warm_up()
+
+            self.load_ms = (time.perf_counter() - started) * 1000
+            self._set_state(READY, f"{self.model} loaded in {self.load_ms / 1000:.1f}s")
+            print(f"✅ Model {self.model} warmed up in {self.load_ms:.0f} ms")
+            self.touch()
+            self.ready.set_result(True)
+        except Exception as e:
+            print(f"⚠️  Ollama connection issue: {e}")
+            print("💡 Make sure Ollama is running: ollama serve")
+            print(f"💡 Then pull model: ollama pull {self.model}")
+            self._set_state(OFFLINE, str(e)[:200])
+            self.ready.set_result(False)
+            return
+
+        if self.keep_warm:
+            self._keep_warm_loop()
+
+    def _ensure_pulled(self):
+        models = self.client.list()
+        # Newer ollama clients report the name as 'model'
+        names = [m.get('model') or m.get('name') or '' for m in models.get('models', [])]
+        print(f"📦 Available models: {len(names)}")
+        if any(self.model in name for name in names):
+            print(f"✅ Using model: {self.model}")
+            return
+
+        print(f"📥 Pulling model {self.model}... (this may take a few minutes)")
+        self._set_state(PULLING, f"Downloading {self.model}...")
+        last_percent = -1
+        for progress in self.client.pull(self.model, stream=True):
+            total = progress.get('total') or 0
+            completed = progress.get('completed') or 0
+            if total:
+                percent = int(completed * 100 / total)
+                # Listeners only hear about whole-percent steps
+                if percent != last_percent:
+                    last_percent = percent
+                    self._set_state(PULLING, f"Downloading {self.model}... {percent}%")
+        print(f"✅ Model {self.model} ready!")
+
+    def _warm_up(self):
+        """Load the weights and evaluate the system prompt with a 1-token reply"""
+        messages = [{"role": "user", "content": "hi"}]
+        if self.system_prompt:
+            messages.insert(0, {"role": "system", "content": self.system_prompt})
+        self.client.chat(
+            model=self.model,
+            messages=messages,
+            options={"num_predict": 1},
+            keep_alive=self.keep_alive
+        )
+
+    def _keep_warm_loop(self):
+        seconds = parse_keep_alive(self.keep_alive)
+        if not seconds:
+            return  # forever (None) or unload right away (0): nothing to refresh
+
+        # Refresh a bit before Ollama would unload the model
+        margin = min(60.0, seconds * 0.2)
+        while not self._stop.is_set():
+            idle = time.time() - self.last_used
+            wait = seconds - margin - idle
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+            try:
+                # An empty prompt only loads the model / extends keep_alive, nothing is generated
+                self.client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+                self.refreshes += 1
+            except Exception as e:
+                print(f"⚠️  Model keep-alive refresh failed: {e}")
+                self._stop.wait(margin)
+            self.last_used = time.time()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def touch(self):
+        """Record a request to the model (it resets Ollama's keep_alive timer too)"""
+        self.last_used = time.time()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == READY
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the model is loaded (True) or known to be unavailable (False).
+        When Ollama was offline a while ago, a new connection attempt is made first.
+        """
+        if self.state == OFFLINE and time.time() - self._attempted_at >= self.retry_after:
+            self.start()
+        try:
+            return self.ready.result(timeout=timeout)
+        except Exception:
+            return False
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "state": self.state,
+            "detail": self.detail,
+            "load_ms": round(self.load_ms, 1) if self.load_ms is not None else None,
+            "refreshes": self.refreshes,
+        }
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """callback(state, detail) on every state change; called once right away with the current state"""
+        with self._lock:
+            self._listeners.append(callback)
+            state, detail = self.state, self.detail
+        self._notify(callback, state, detail)
+
+    def remove_listener(self, callback: Callable[[str, str], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _set_state(self, state: str, detail: str):
+        with self._lock:
+            if (state, detail) == (self.state, self.detail):
+                return
+            self.state, self.detail = state, detail
+            listeners = list(self._listeners)
+        for callback in listeners:
+            self._notify(callback, state, detail)
+
+    @staticmethod
+    def _notify(callback: Callable[[str, str], None], state: str, detail: str):
+        try:
+            callback(state, detail)
+        except Exception as e:
+            print(f"⚠️  Model state listener failed: {e}")
@@ -15,6 +15,38 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from core.recall import recall_index, turn_text
+from core.intent_router import intent_router
+from core.lazy import LazyInstance
+
+# Fixed small-talk replies (the TTS service pre-renders their audio)
+PERSONALITY_RESPONSES = {
+    'greeting': [
+        "Hello! I'm JARVIS, your personal assistant. How can I help you today?",
+        "Hi there! Ready to assist you!",
+        "Namaste! Kaise madad kar sakta hoon?",
+        "Hey! What can I do for you?"
+    ],
+    'thanks': [
+        "You're welcome! Happy to help! 😊",
+        "Anytime! That's what I'm here for!",
+        "Khushi hui madad karke!",
+        "My pleasure!"
+    ],
+    'goodbye': [
+        "Goodbye! Have a great day!",
+        "See you later! Take care!",
+        "Alvida! Phir milenge!",
+        "Bye! Call me anytime you need help!"
+    ],
+    'error': [
+        "Oops! Something went wrong. Let me try again.",
+        "Sorry about that. I'll fix it right away.",
+        "Maaf kijiye, ek baar aur try karta hoon.",
+        "My bad! Let me correct that."
+    ]
+}
+
 
 class PersonalAssistant:
     """
@@ -42,6 +74,11 @@ class PersonalAssistant:
                     self.context = data.get('context', {})
         except Exception as e:
             print(f"⚠️  Could not load memory: {e}")
+        
+        # Recent conversation turns persist in the recall index across restarts
+        self.conversation_history = [
+            item['meta'] for item in recall_index.recent('turn', 50) if item['meta']
+        ]
     
     def save_memory(self):
         """Save assistant's memory to file"""
@@ -155,51 +192,44 @@ class PersonalAssistant:
             context['is_followup'] = True
             context['previous_task'] = self.last_task
         
-        # Music/YouTube intent
-        music_keywords = ['play', 'bajao', 'song', 'gaana', 'music', 'youtube', 'video']
-        if any(word in text_lower for word in music_keywords):
-            context['intent'] = 'play_music'
-            # Extract song name
-            for keyword in ['play', 'bajao', 'song', 'gaana']:
-                if keyword in text_lower:
-                    parts = text_lower.split(keyword)
-                    if len(parts) > 1:
-                        context['entities']['song_name'] = parts[1].strip()
-        
-        # Movie download intent
-        movie_keywords = ['download', 'movie', 'film', 'vegamovies']
-        if any(word in text_lower for word in movie_keywords):
-            context['intent'] = 'download_movie'
-            # Extract movie name
-            if 'download' in text_lower:
-                parts = text_lower.split('download')
-                if len(parts) > 1:
-                    context['entities']['movie_name'] = parts[1].strip()
-        
-        # Search intent
-        search_keywords = ['search', 'google', 'find', 'dhundo', 'khojo']
-        if any(word in text_lower for word in search_keywords):
-            context['intent'] = 'search'
-            for keyword in search_keywords:
-                if keyword in text_lower:
-                    parts = text_lower.split(keyword)
-                    if len(parts) > 1:
-                        context['entities']['query'] = parts[1].strip()
-        
-        # System control intent
-        system_keywords = ['volume', 'brightness', 'screenshot', 'open', 'close', 'kholo', 'band']
-        if any(word in text_lower for word in system_keywords):
-            context['intent'] = 'system_control'
+        # One trie pass scores every intent category (Hindi/Hinglish/English keywords)
+        routing = intent_router.categorize(user_input)
+        scores = routing['scores']
+        context['intent'] = routing['category']
+        
+        if 'play_music' in scores:
+            song_name = self._text_after(text_lower, ['play', 'bajao', 'song', 'gaana'])
+            if song_name is not None:
+                context['entities']['song_name'] = song_name
+        
+        if 'download_movie' in scores:
+            movie_name = self._text_after(text_lower, ['download'])
+            if movie_name is not None:
+                context['entities']['movie_name'] = movie_name
+        
+        if 'search' in scores:
+            query = self._text_after(text_lower, ['search', 'google', 'find', 'dhundo', 'khojo'])
+            if query is not None:
+                context['entities']['query'] = query
+        
+        if 'system_control' in scores:
             context['entities']['action'] = user_input
         
-        # Web browsing intent
-        web_keywords = ['website', 'open', 'kholo', '.com', '.in', 'http']
-        if any(word in text_lower for word in web_keywords):
-            context['intent'] = 'web_browse'
+        if 'web_browse' in scores:
             context['entities']['url'] = user_input
         
         return context
     
+    def _text_after(self, text: str, keywords: List[str]) -> Optional[str]:
+        """Text following the last of the keywords present (None if none is)"""
+        value = None
+        for keyword in keywords:
+            if keyword in text:
+                parts = text.split(keyword)
+                if len(parts) > 1:
+                    value = parts[1].strip()
+        return value
+    
     def generate_natural_response(self, context: Dict, result: str = None) -> str:
         """
         Generate natural, human-like response
@@ -254,12 +284,16 @@ class PersonalAssistant:
         return self.user_preferences.get(key, default)
     
     def add_to_history(self, user_input: str, response: str):
-        """Add conversation to history"""
-        self.conversation_history.append({
-            'timestamp': datetime.now().isoformat(),
+        """Add conversation to history (persisted and indexed for recall)"""
+        now = datetime.now()
+        entry = {
+            'timestamp': now.isoformat(),
             'user': user_input,
             'assistant': response
-        })
+        }
+        self.conversation_history.append(entry)
+        recall_index.add('turn', entry['timestamp'], turn_text(user_input, response),
+                         meta=entry, created_at=now.timestamp())
         
         # Keep only last 50 conversations in memory
         if len(self.conversation_history) > 50:
@@ -326,9 +360,6 @@ class PersonalAssistant:
                 'timestamp': datetime.now().isoformat()
             }
         
-        # Add to history
-        self.add_to_history(user_input, response)
-        
         return {
             'context': context,
             'response': response,
@@ -359,36 +390,9 @@ class PersonalAssistant:
         """
         Add personality to responses
         """
-        personalities = {
-            'greeting': [
-                "Hello! I'm JARVIS, your personal assistant. How can I help you today?",
-                "Hi there! Ready to assist you!",
-                "Namaste! Kaise madad kar sakta hoon?",
-                "Hey! What can I do for you?"
-            ],
-            'thanks': [
-                "You're welcome! Happy to help! 😊",
-                "Anytime! That's what I'm here for!",
-                "Khushi hui madad karke!",
-                "My pleasure!"
-            ],
-            'goodbye': [
-                "Goodbye! Have a great day!",
-                "See you later! Take care!",
-                "Alvida! Phir milenge!",
-                "Bye! Call me anytime you need help!"
-            ],
-            'error': [
-                "Oops! Something went wrong. Let me try again.",
-                "Sorry about that. I'll fix it right away.",
-                "Maaf kijiye, ek baar aur try karta hoon.",
-                "My bad! Let me correct that."
-            ]
-        }
-        
         import random
-        return random.choice(personalities.get(situation, ["I'm here to help!"]))
+        return random.choice(PERSONALITY_RESPONSES.get(situation, ["I'm here to help!"]))
 
 
-# Global instance
-personal_assistant = PersonalAssistant()
+# Global instance (memory is loaded on first use)
+personal_assistant = LazyInstance(PersonalAssistant, "personal_assistant")
@@ -0,0 +1,381 @@
+"""
+Semantic Recall Index for JARVIS
+Local vector index over remembered facts and past conversation turns:
+- Embeddings from a local Ollama embedding model (JARVIS_EMBED_MODEL), or a
+  hashed word/character n-gram embedder that needs no model at all
+- Items persisted in the memory SQLite database, so recall survives restarts
+- Brute-force cosine search in NumPy - a few ms over tens of thousands of items
+"""
+
+import os
+import re
+import json
+import math
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from core.memory_store import memory_store, DEFAULT_DB_PATH
+
+DEFAULT_MAX_TURNS = 20000
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    """
+    Feature-hashing embedder: words plus character trigrams hashed into a
+    fixed-size vector. Deterministic, offline, and tolerant of Hinglish
+    spelling variants (e.g. 'gaana' / 'gana' share trigrams).
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hash-{dim}"
+
+    def _features(self, text: str) -> Dict[int, float]:
+        counts: Dict[int, float] = {}
+        for word in _WORD.findall(text.lower()):
+            grams = [word]
+            padded = f"<{word}>"
+            grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+            for gram in grams:
+                h = zlib.crc32(gram.encode('utf-8'))
+                index = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[index] = counts.get(index, 0.0) + sign
+        return counts
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for index, value in self._features(text).items():
+                # Sublinear term frequency keeps repeated words from dominating
+                matrix[row, index] = math.copysign(1.0 + math.log(abs(value)), value) if value else 0.0
+        return matrix
+
+
+class OllamaEmbedder:
+    """Embeddings from a local Ollama embedding model (e.g. nomic-embed-text)"""
+
+    def __init__(self, model: str, host: Optional[str] = None):
+        from ollama import Client
+        self.model = model
+        self.name = f"ollama:{model}"
+        self._client = Client(host=host) if host else Client()
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        response = self._client.embed(model=self.model, input=texts)
+        return np.asarray(response['embeddings'], dtype=np.float32)
+
+
+def _default_embedder():
+    model = os.environ.get("JARVIS_EMBED_MODEL", "").strip()
+    if model:
+        try:
+            return OllamaEmbedder(model, os.environ.get("OLLAMA_HOST"))
+        except Exception as e:
+            print(f"⚠️  Ollama embeddings unavailable ({e}), using hashed embeddings")
+    return HashingEmbedder()
+
+
+class RecallIndex:
+    """
+    Vector index of facts and conversation turns.
+
+    Usage:
+        recall_index.add("fact", "default/birthday", "birthday: 3 May")
+        recall_index.search("when is my birthday", k=3)
+    """
+
+    def __init__(self, path: Optional[str] = None, embedder=None,
+                 max_turns: int = DEFAULT_MAX_TURNS, store=None):
+        self.store = store or memory_store
+        self.path = os.path.expanduser(path or os.environ.get("JARVIS_MEMORY_DB", DEFAULT_DB_PATH))
+        self.enabled = NUMPY_AVAILABLE and os.environ.get("JARVIS_RECALL", "1") != "0"
+        self.max_turns = max_turns
+        self._embedder = embedder
+
+        self._conn = None
+        self._lock = threading.RLock()
+        self._loaded = False
+
+        # In-memory index: row slots in a growable, L2-normalized matrix
+        self._vectors = None
+        self._valid = None
+        self._kind_codes = None
+        self._kind_ids: Dict[str, int] = {}
+        self._items: List[Optional[Dict[str, Any]]] = []
+        self._row_by_key: Dict[tuple, int] = {}
+        self._free_rows: List[int] = []
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = _default_embedder()
+        return self._embedder
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS recall_items ("
+                " kind TEXT NOT NULL,"
+                " ref TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " meta TEXT,"
+                " embedder TEXT,"
+                " vector BLOB,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, ref))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_recall_created ON recall_items(kind, created_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _ensure_loaded(self):
+        """Load stored vectors, re-embed stale ones and backfill facts (once)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            conn = self._connect()
+            self._prune_turns(conn)
+
+            rows = conn.execute(
+                "SELECT kind, ref, text, meta, embedder, vector, created_at FROM recall_items"
+            ).fetchall()
+            name = self.embedder.name
+            fresh = [r for r in rows if r[4] == name and r[5] is not None]
+            stale = [r for r in rows if not (r[4] == name and r[5] is not None)]
+
+            for kind, ref, text, meta, _, blob, created_at in fresh:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                self._put_row(kind, ref, text, meta, created_at, vector)
+
+            if stale:
+                print(f"🧠 Re-embedding {len(stale)} memories with {name}...")
+                self._embed_rows(conn, [(r[0], r[1], r[2], r[3], r[6]) for r in stale])
+
+            self._backfill_facts(conn)
+            self._loaded = True
+
+    def _embed_rows(self, conn: sqlite3.Connection, rows: List[tuple], batch: int = 64):
+        for start in range(0, len(rows), batch):
+            chunk = rows[start:start + batch]
+            vectors = self._normalize(self.embedder.embed([r[2] for r in chunk]))
+            for (kind, ref, text, meta, created_at), vector in zip(chunk, vectors):
+                self._put_row(kind, ref, text, meta, created_at, vector)
+            conn.executemany(
+                "INSERT OR REPLACE INTO recall_items (kind, ref, text, meta, embedder, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(kind, ref, text, meta, self.embedder.name, vector.tobytes(), created_at)
+                 for (kind, ref, text, meta, created_at), vector in zip(chunk, vectors)]
+            )
+            conn.commit()
+
+    def _backfill_facts(self, conn: sqlite3.Connection):
+        """Index facts stored before the recall index existed (e.g. migrated JSON)"""
+        missing = []
+        for namespace in self.store.namespaces():
+            for record in self.store.all(namespace):
+                ref = fact_ref(namespace, record["key"])
+                if ("fact", ref) not in self._row_by_key:
+                    missing.append(("fact", ref, fact_text(record["key"], record["value"]),
+                                    None, record["updated_at"]))
+        if missing:
+            self._embed_rows(conn, missing)
+
+    def _prune_turns(self, conn: sqlite3.Connection):
+        count = conn.execute("SELECT COUNT(*) FROM recall_items WHERE kind = 'turn'").fetchone()[0]
+        if count > self.max_turns:
+            conn.execute(
+                "DELETE FROM recall_items WHERE kind = 'turn' AND ref IN "
+                "(SELECT ref FROM recall_items WHERE kind = 'turn' ORDER BY created_at ASC LIMIT ?)",
+                (count - self.max_turns,)
+            )
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # In-memory matrix
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+        matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _put_row(self, kind: str, ref: str, text: str, meta: Optional[str],
+                 created_at: float, vector: "np.ndarray"):
+        key = (kind, ref)
+        row = self._row_by_key.get(key)
+        if row is None:
+            row = self._free_rows.pop() if self._free_rows else len(self._items)
+            if row == len(self._items):
+                self._items.append(None)
+            self._grow(row + 1, vector.shape[0])
+            self._row_by_key[key] = row
+
+        self._vectors[row] = vector
+        self._valid[row] = True
+        self._kind_codes[row] = self._kind_ids.setdefault(kind, len(self._kind_ids))
+        self._items[row] = {"kind": kind, "ref": ref, "text": text, "meta": meta, "created_at": created_at}
+
+    def _grow(self, needed: int, dim: int):
+        if self._vectors is None:
+            capacity = max(needed, 256)
+            self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+            self._valid = np.zeros(capacity, dtype=bool)
+            self._kind_codes = np.zeros(capacity, dtype=np.int16)
+        elif needed > self._vectors.shape[0]:
+            size = self._vectors.shape[0]
+            capacity = max(needed, size * 2)
+            vectors = np.zeros((capacity, dim), dtype=np.float32)
+            vectors[:size] = self._vectors
+            valid = np.zeros(capacity, dtype=bool)
+            valid[:size] = self._valid
+            kind_codes = np.zeros(capacity, dtype=np.int16)
+            kind_codes[:size] = self._kind_codes
+            self._vectors, self._valid = vectors, valid
+            self._kind_codes = kind_codes
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add(self, kind: str, ref: str, text: str, meta: Optional[Dict[str, Any]] = None,
+            created_at: Optional[float] = None):
+        """Insert or replace an item. Persisted even when vectors are unavailable."""
+        created_at = created_at or time.time()
+        meta_json = json.dumps(meta, ensure_ascii=False) if meta is not None else None
+        try:
+            with self._lock:
+                conn = self._connect()
+                if not self.enabled:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO recall_items (kind, ref, text, meta, embedder, vector, created_at) "
+                        "VALUES (?, ?, ?, ?, NULL, NULL, ?)",
+                        (kind, ref, text, meta_json, created_at)
+                    )
+                    conn.commit()
+                    return
+                self._ensure_loaded()
+                self._embed_rows(conn, [(kind, ref, text, meta_json, created_at)])
+        except Exception as e:
+            print(f"⚠️  Recall index write failed: {e}")
+
+    def remove(self, kind: str, ref: str):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM recall_items WHERE kind = ? AND ref = ?", (kind, ref))
+                conn.commit()
+                row = self._row_by_key.pop((kind, ref), None)
+                if row is not None:
+                    self._valid[row] = False
+                    self._items[row] = None
+                    self._free_rows.append(row)
+        except Exception as e:
+            print(f"⚠️  Recall index delete failed: {e}")
+
+    def search(self, query: str, k: int = 5, kinds: Optional[List[str]] = None,
+               min_score: float = 0.2) -> List[Dict[str, Any]]:
+        """
+        Top-k items by cosine similarity to the query.
+
+        Args:
+            query: Free text
+            k: Number of results
+            kinds: Restrict to item kinds ("fact", "turn")
+            min_score: Drop weaker matches
+        """
+        if not self.enabled or not query.strip():
+            return []
+        try:
+            self._ensure_loaded()
+            query_vector = self._normalize(self.embedder.embed([query]))[0]
+            with self._lock:
+                if self._vectors is None or not self._row_by_key:
+                    return []
+                count = len(self._items)
+                scores = self._vectors[:count] @ query_vector
+                mask = self._valid[:count].copy()
+                if kinds is not None:
+                    codes = [self._kind_ids[kind] for kind in kinds if kind in self._kind_ids]
+                    mask &= np.isin(self._kind_codes[:count], codes)
+                scores = np.where(mask, scores, -np.inf)
+
+                k = min(k, int(mask.sum()))
+                if k <= 0:
+                    return []
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+
+                results = []
+                for row in top:
+                    score = float(scores[row])
+                    if score < min_score:
+                        break
+                    item = dict(self._items[row])
+                    item["meta"] = json.loads(item["meta"]) if item["meta"] else None
+                    item["score"] = round(score, 3)
+                    results.append(item)
+                return results
+        except Exception as e:
+            print(f"⚠️  Recall search failed: {e}")
+            return []
+
+    def recent(self, kind: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent items of a kind, oldest first (reads storage, no vectors needed)"""
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT text, meta, created_at FROM recall_items WHERE kind = ? "
+                    "ORDER BY created_at DESC LIMIT ?", (kind, limit)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️  Recall read failed: {e}")
+            return []
+        return [
+            {"text": text, "meta": json.loads(meta) if meta else None, "created_at": created_at}
+            for text, meta, created_at in reversed(rows)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "embedder": self.embedder.name if self.enabled else None,
+            "indexed": len(self._row_by_key)
+        }
+
+
+def fact_ref(namespace: str, key: str) -> str:
+    return f"{namespace}/{key}"
+
+
+def fact_text(key: str, value: str) -> str:
+    return f"{key.replace('_', ' ')}: {value}"
+
+
+def turn_text(user_input: str, response: str, limit: int = 500) -> str:
+    text = f"User: {user_input}\nJARVIS: {response}"
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+# Global instance (loads on first use)
+recall_index = RecallIndex()
@@ -0,0 +1,336 @@
+"""
+Multi-language speech recognition for JARVIS
+Runs every configured language on the same audio at once and keeps the
+most plausible transcript, instead of trying hi-IN, en-IN, en-US one
+after another:
+- Confidence from the engine, plus a script check (Devanagari for Hindi,
+  Latin for English)
+- The user's recent winning language is tried first and wins ties; a
+  confident answer for it returns without waiting for the others
+- Pluggable engines: Google Web Speech online, Vosk offline (no network
+  needed once a model is downloaded)
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional
+
+DEFAULT_LANGUAGES = "hi-IN,en-IN,en-US"
+LANGUAGE_LABELS = {"hi-IN": "Hindi", "en-IN": "English", "en-US": "English (US)"}
+
+_DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+_LATIN = re.compile(r"[A-Za-z]")
+
+
+class RecognitionResult:
+    def __init__(self, text: str, language: str, confidence: Optional[float], engine: str,
+                 elapsed_ms: float = 0.0):
+        self.text = text
+        self.language = language
+        self.confidence = confidence      # None when the engine doesn't report one
+        self.engine = engine
+        self.elapsed_ms = elapsed_ms
+        self.score = 0.0
+
+    @property
+    def label(self) -> str:
+        return LANGUAGE_LABELS.get(self.language, self.language)
+
+    def __repr__(self) -> str:
+        return (f"RecognitionResult({self.text!r}, {self.language}, engine={self.engine}, "
+                f"confidence={self.confidence}, score={self.score:.2f})")
+
+
+class RecognitionEngine:
+    """
+    Base class for speech-to-text backends.
+    Subclasses implement recognize(); register them with recognizer.register_engine().
+    """
+
+    name = "engine"
+    offline = False
+    languages: Optional[List[str]] = None   # None = any language
+
+    def available(self) -> bool:
+        return True
+
+    def supports(self, language: str) -> bool:
+        return self.languages is None or language in self.languages
+
+    def recognize(self, utterance, language: str, timeout: float) -> Optional[RecognitionResult]:
+        """Transcript of the utterance in this language, or None if nothing was understood"""
+        raise NotImplementedError
+
+
+class GoogleEngine(RecognitionEngine):
+    """Google Web Speech API through speech_recognition (needs network)"""
+
+    name = "google"
+
+    def available(self) -> bool:
+        import importlib.util
+        return importlib.util.find_spec("speech_recognition") is not None
+
+    def recognize(self, utterance, language: str, timeout: float) -> Optional[RecognitionResult]:
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        recognizer.operation_timeout = timeout
+        try:
+            # show_all returns the alternatives with the top one's confidence
+            response = recognizer.recognize_google(utterance.audio_data(), language=language, show_all=True)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise ConnectionError(str(e)) from e
+
+        alternatives = response.get("alternative") if isinstance(response, dict) else None
+        if not alternatives:
+            return None
+        best = alternatives[0]
+        if not best.get("transcript"):
+            return None
+        return RecognitionResult(best["transcript"], language, best.get("confidence"), self.name)
+
+
+class VoskEngine(RecognitionEngine):
+    """
+    Offline recognition with Vosk (pip install vosk + a model from
+    https://alphacephei.com/vosk/models). Configure models per language:
+        JARVIS_VOSK_MODELS=hi-IN=~/models/vosk-model-small-hi-0.22,en-IN=~/models/vosk-model-small-en-in-0.4
+    """
+
+    name = "vosk"
+    offline = True
+
+    def __init__(self, models: Optional[Dict[str, str]] = None):
+        if models is None:
+            models = {}
+            for item in os.environ.get("JARVIS_VOSK_MODELS", "").split(","):
+                if "=" in item:
+                    language, path = item.split("=", 1)
+                    models[language.strip()] = os.path.expanduser(path.strip())
+        self.model_paths = {language: path for language, path in models.items() if os.path.isdir(path)}
+        self.languages = list(self.model_paths)
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        import importlib.util
+        return bool(self.model_paths) and importlib.util.find_spec("vosk") is not None
+
+    def _model(self, language: str):
+        # Models take a few hundred ms to load and stay loaded afterwards
+        with self._lock:
+            if language not in self._models:
+                import vosk
+                vosk.SetLogLevel(-1)
+                self._models[language] = vosk.Model(self.model_paths[language])
+            return self._models[language]
+
+    def recognize(self, utterance, language: str, timeout: float) -> Optional[RecognitionResult]:
+        import vosk
+
+        decoder = vosk.KaldiRecognizer(self._model(language), utterance.sample_rate)
+        decoder.SetWords(True)
+        decoder.AcceptWaveform(utterance.frame_data)
+        result = json.loads(decoder.FinalResult())
+        text = result.get("text", "").strip()
+        if not text:
+            return None
+        words = result.get("result") or []
+        confidence = sum(word.get("conf", 0.0) for word in words) / len(words) if words else None
+        return RecognitionResult(text, language, confidence, self.name)
+
+
+class MultiLanguageRecognizer:
+    """
+    Usage:
+        from core.recognition import recognizer
+
+        result = recognizer.recognize(utterance)    # core.audio_capture.Utterance
+        if result:
+            print(result.label, result.text)
+    """
+
+    def __init__(self, languages: Optional[List[str]] = None, deadline: float = 6.0,
+                 accept_confidence: float = 0.85, history: int = 10, offline_retry_after: float = 60.0):
+        """
+        Args:
+            languages: Language codes to try (JARVIS_SPEECH_LANGUAGES)
+            deadline: Seconds to wait for all recognitions of one utterance
+            accept_confidence: A result this confident in the preferred language
+                is taken without waiting for the other languages
+            history: Recent winning languages remembered
+            offline_retry_after: After a network failure, online engines are
+                skipped (offline engines used directly) for this long
+        """
+        if languages is None:
+            languages = os.environ.get("JARVIS_SPEECH_LANGUAGES", DEFAULT_LANGUAGES).split(",")
+        self.languages = [language.strip() for language in languages if language.strip()]
+        self.deadline = deadline
+        self.accept_confidence = accept_confidence
+        self.offline_retry_after = offline_retry_after
+
+        self.engines: List[RecognitionEngine] = []
+        self.recent: deque = deque(maxlen=history)
+        self.network_failed_at = 0.0
+        self.stats = {"utterances": 0, "recognized": 0, "early_accepts": 0, "offline": 0, "total_ms": 0.0}
+
+        self._engines_loaded = False
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Engines
+    # ------------------------------------------------------------------
+
+    def register_engine(self, engine: RecognitionEngine):
+        with self._lock:
+            self.engines.append(engine)
+
+    def _load_default_engines(self):
+        """Engines named in JARVIS_SPEECH_ENGINES (default: google,vosk) that can run here"""
+        with self._lock:
+            if self._engines_loaded:
+                return
+            self._engines_loaded = True
+            builtin = {"google": GoogleEngine, "vosk": VoskEngine}
+            for name in os.environ.get("JARVIS_SPEECH_ENGINES", "google,vosk").split(","):
+                factory = builtin.get(name.strip().lower())
+                if factory is None:
+                    continue
+                engine = factory()
+                if engine.available():
+                    self.engines.append(engine)
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="speech-rec")
+        return self._pool
+
+    # ------------------------------------------------------------------
+    # Recognition
+    # ------------------------------------------------------------------
+
+    def preferred_languages(self) -> List[str]:
+        """Configured languages, most recently winning first"""
+        counts = Counter(self.recent)
+        last = self.recent[-1] if self.recent else None
+        return sorted(self.languages, key=lambda language: (language != last, -counts[language],
+                                                             self.languages.index(language)))
+
+    def recognize(self, utterance) -> Optional[RecognitionResult]:
+        """Best transcript of the utterance across engines and languages, or None"""
+        self._load_default_engines()
+        start = time.perf_counter()
+        self.stats["utterances"] += 1
+
+        languages = self.preferred_languages()
+        online = [engine for engine in self.engines if not engine.offline]
+        offline = [engine for engine in self.engines if engine.offline]
+
+        result = None
+        network_down = time.time() - self.network_failed_at < self.offline_retry_after
+        if online and not network_down:
+            result, network_error = self._run(online, languages, utterance, start)
+            if network_error and result is None:
+                self.network_failed_at = time.time()
+                print("📴 Online speech recognition unreachable - using offline engine")
+            elif not network_error:
+                self.network_failed_at = 0.0
+        if result is None and offline:
+            result, _ = self._run(offline, languages, utterance, time.perf_counter())
+            if result:
+                self.stats["offline"] += 1
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats["total_ms"] += elapsed_ms
+        if result:
+            result.elapsed_ms = elapsed_ms
+            self.recent.append(result.language)
+            self.stats["recognized"] += 1
+        return result
+
+    def _run(self, engines: List[RecognitionEngine], languages: List[str], utterance, start: float):
+        """All (engine, language) pairs at once; returns (best result, whether the network failed)"""
+        preferred = languages[0]
+        futures = {}
+        for language in languages:
+            for engine in engines:
+                if engine.supports(language):
+                    future = self.pool.submit(engine.recognize, utterance, language, self.deadline)
+                    futures[future] = (engine, language)
+        if not futures:
+            return None, False
+
+        results: List[RecognitionResult] = []
+        network_error = False
+        pending = set(futures)
+        while pending:
+            remaining = self.deadline - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except ConnectionError:
+                    network_error = True
+                    continue
+                except Exception as e:
+                    print(f"⚠️  {futures[future][0].name} recognition failed: {e}")
+                    continue
+                if result is None:
+                    continue
+                self.score(result, preferred)
+                results.append(result)
+                # Confident answer in the language the user has been speaking: don't wait
+                if (result.language == preferred and result.confidence is not None
+                        and result.confidence >= self.accept_confidence and self._script_matches(result)):
+                    self.stats["early_accepts"] += 1
+                    return result, network_error
+
+        if not results:
+            return None, network_error
+        return max(results, key=lambda item: item.score), network_error
+
+    @staticmethod
+    def _script_matches(result: RecognitionResult) -> bool:
+        devanagari = len(_DEVANAGARI.findall(result.text))
+        latin = len(_LATIN.findall(result.text))
+        if result.language.startswith("hi"):
+            return devanagari >= latin
+        return latin >= devanagari
+
+    def score(self, result: RecognitionResult, preferred: str) -> float:
+        """Engine confidence, adjusted for script and the user's recent language"""
+        score = result.confidence if result.confidence is not None else 0.6
+        # A Hindi model hearing English tends to return Latin words (and vice versa)
+        score += 0.1 if self._script_matches(result) else -0.2
+        if result.language == preferred:
+            score += 0.05
+        result.score = score
+        return score
+
+    def get_stats(self) -> Dict:
+        recognized = self.stats["recognized"]
+        return {
+            **self.stats,
+            "avg_ms": round(self.stats["total_ms"] / self.stats["utterances"], 1) if self.stats["utterances"] else 0.0,
+            "engines": [engine.name for engine in self.engines],
+            "preferred": self.preferred_languages()[0] if self.languages else None,
+            "recognition_rate": round(recognized / self.stats["utterances"], 3) if self.stats["utterances"] else 0.0,
+        }
+
+
+# Global instance (engines are picked on the first recognize())
+recognizer = MultiLanguageRecognizer()
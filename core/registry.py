@@ -1,51 +1,432 @@
 import os
+import json
+import hashlib
+import threading
+import time
 import importlib.util
 import inspect
-from typing import Dict, List, Any, Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Callable, Optional, Tuple
 from .skill import Skill
+from .validation import ToolValidator, unknown_tool_error
+from .tracing import tracer
+
+# Bump when the manifest layout changes so stale caches are rebuilt
+MANIFEST_VERSION = 2
+DEFAULT_MANIFEST_PATH = os.path.expanduser("~/.jarvis_skill_manifest.json")
+
+
+class SkillLoadReport:
+    """
+    Per-skill startup timings collected by SkillRegistry.load_skills.
+
+    Each entry is a dict with: file, status ('loaded', 'deferred',
+    'failed' or 'timeout'), import_ms, init_ms, tools, skills, error.
+    """
 
-class SkillRegistry:
     def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.wall_ms = 0.0
+
+    def add(self, entry: Dict[str, Any]):
+        """Add or replace the entry for a skill file"""
+        self.entries[entry["file"]] = entry
+
+    def slowest(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Entries sorted by total load time, slowest first"""
+        return sorted(
+            self.entries.values(),
+            key=lambda e: e["import_ms"] + e["init_ms"],
+            reverse=True
+        )[:limit]
+
+    def failures(self) -> List[Dict[str, Any]]:
+        return [e for e in self.entries.values() if e["status"] in ("failed", "timeout")]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_ms": self.wall_ms,
+            "skills": sum(len(e["skills"]) for e in self.entries.values()),
+            "tools": sum(e["tools"] for e in self.entries.values()),
+            "failed": len(self.failures()),
+            "entries": list(self.entries.values())
+        }
+
+    def summary(self) -> str:
+        data = self.to_dict()
+        return (f"Loaded {data['skills']} skills / {data['tools']} tools "
+                f"in {self.wall_ms:.0f} ms ({data['failed']} failed)")
+
+    def format_lines(self, limit: int = 5) -> List[str]:
+        """Human-readable lines for the GUI stats panel"""
+        failures = self.failures()
+        lines = [
+            f"{e['file']}: {e['import_ms'] + e['init_ms']:.0f} ms, {e['tools']} tools"
+            for e in self.slowest(limit + len(failures)) if e not in failures
+        ][:limit]
+        lines.extend(f"{e['file']}: {e['status']} - {e['error']}" for e in self.failures())
+        return lines
+
+
+class SkillRegistry:
+    def __init__(self, lazy: bool = False, manifest_path: Optional[str] = None,
+                 max_workers: int = 8, import_timeout: float = 20.0):
+        """
+        Args:
+            lazy: If True, tool schemas come from a cached manifest and each
+                  skill module is only imported the first time one of its
+                  functions is executed.
+            manifest_path: Where the lazy-mode manifest is cached
+                           (default: ~/.jarvis_skill_manifest.json)
+            max_workers: Threads used to import skill files concurrently
+            import_timeout: Seconds before a single skill's import+init is abandoned
+        """
         self.skills: Dict[str, Skill] = {}
         self.tools_schema: List[Dict[str, Any]] = []
         self.functions: Dict[str, Callable] = {}
 
+        # Dispatch table built at registration: name -> (callable, validator)
+        self._validators: Dict[str, ToolValidator] = {}
+        self._dispatch: Dict[str, Tuple[Callable, ToolValidator]] = {}
+        self._serial_functions = set()
+
+        # Lazy mode state
+        self.lazy = lazy
+        self.manifest_path = manifest_path or DEFAULT_MANIFEST_PATH
+        self._pending_skills: Dict[str, str] = {}      # skill name -> file path
+        self._pending_functions: Dict[str, str] = {}   # function name -> file path
+        self._lock = threading.RLock()
+
+        # Concurrent loading
+        self.max_workers = max_workers
+        self.import_timeout = import_timeout
+        self.load_report = SkillLoadReport()
+
     def load_skills(self, skills_dir: str):
         """Dynamically load skills from the specified directory."""
         if not os.path.exists(skills_dir):
             print(f"Skills directory not found: {skills_dir}")
             return
 
-        for filename in os.listdir(skills_dir):
-            if filename.endswith(".py") and filename != "__init__.py":
-                module_name = filename[:-3]
-                file_path = os.path.join(skills_dir, filename)
-                self._load_skill_from_file(module_name, file_path)
+        started = time.perf_counter()
+        self.load_report = SkillLoadReport()
+
+        if self.lazy:
+            self._load_skills_lazy(skills_dir)
+        else:
+            file_paths = [
+                os.path.join(skills_dir, filename)
+                for filename in sorted(os.listdir(skills_dir))
+                if filename.endswith(".py") and filename != "__init__.py"
+            ]
+            self._load_files(file_paths)
 
-    def _load_skill_from_file(self, module_name: str, file_path: str):
+        self.load_report.wall_ms = (time.perf_counter() - started) * 1000
+        print(self.load_report.summary())
+
+    def _load_skill_from_file(self, module_name: str, file_path: str) -> List[Skill]:
+        return self._load_files([file_path]).get(file_path, [])
+
+    def _load_files(self, file_paths: List[str]) -> Dict[str, List[Skill]]:
+        """
+        Import skill files concurrently and register them in file order.
+        A skill that raises or exceeds ``import_timeout`` is reported and
+        skipped without affecting the others.
+        """
+        loaded: Dict[str, List[Skill]] = {}
+        if not file_paths:
+            return loaded
+
+        results: Dict[str, Any] = {}
+        start_times: Dict[str, float] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(file_paths)),
+            thread_name_prefix="skill-loader"
+        )
+        futures = {
+            executor.submit(self._load_file_job, path, start_times): path
+            for path in file_paths
+        }
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+
+            now = time.perf_counter()
+            for future in list(pending):
+                path = futures[future]
+                if path in start_times and now - start_times[path] > self.import_timeout:
+                    # Can't kill the thread; abandon it and ignore its result
+                    pending.discard(future)
+                    results[path] = ([], {
+                        "file": os.path.basename(path),
+                        "status": "timeout",
+                        "import_ms": (now - start_times[path]) * 1000,
+                        "init_ms": 0.0,
+                        "tools": 0,
+                        "skills": [],
+                        "error": f"Timed out after {self.import_timeout:.0f}s"
+                    })
+
+        executor.shutdown(wait=False)
+
+        for path in file_paths:
+            instances, entry = results[path]
+            self.load_report.add(entry)
+            if entry["status"] == "loaded":
+                for skill_instance in instances:
+                    self.register_skill(skill_instance)
+                    print(f"Loaded skill: {skill_instance.name}")
+            else:
+                print(f"Failed to load skill module {entry['file']}: {entry['error']}")
+            loaded[path] = instances if entry["status"] == "loaded" else []
+        return loaded
+
+    def _load_file_job(self, file_path: str, start_times: Dict[str, float] = None):
+        """Import and instantiate one skill file, timing each phase. Never raises."""
+        started = time.perf_counter()
+        if start_times is not None:
+            start_times[file_path] = started
+
+        entry = {
+            "file": os.path.basename(file_path),
+            "status": "loaded",
+            "import_ms": 0.0,
+            "init_ms": 0.0,
+            "tools": 0,
+            "skills": [],
+            "error": None
+        }
+        instances = []
+        try:
+            skill_classes = self._import_skill_classes(os.path.basename(file_path)[:-3], file_path)
+            entry["import_ms"] = (time.perf_counter() - started) * 1000
+
+            init_started = time.perf_counter()
+            for name, cls in skill_classes:
+                try:
+                    instances.append(cls())
+                except Exception as e:
+                    print(f"Failed to load skill {name}: {e}")
+            entry["init_ms"] = (time.perf_counter() - init_started) * 1000
+
+            entry["skills"] = [instance.name for instance in instances]
+            entry["tools"] = sum(len(instance.get_tools()) for instance in instances)
+            if not instances:
+                entry["status"] = "failed"
+                entry["error"] = "No skill could be instantiated"
+        except BaseException as e:
+            entry["import_ms"] = (time.perf_counter() - started) * 1000
+            entry["status"] = "failed"
+            entry["error"] = f"{type(e).__name__}: {e}"
+        return instances, entry
+
+    def _import_skill_classes(self, module_name: str, file_path: str) -> List[Tuple[str, type]]:
+        """Import a skill file and return every Skill subclass it defines."""
         spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, Skill) and obj is not Skill:
-                    try:
-                        skill_instance = obj()
-                        self.register_skill(skill_instance)
-                        print(f"Loaded skill: {skill_instance.name}")
-                    except Exception as e:
-                        print(f"Failed to load skill {name}: {e}")
+        if not (spec and spec.loader):
+            return []
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        return [
+            (name, obj) for name, obj in inspect.getmembers(module)
+            if inspect.isclass(obj) and issubclass(obj, Skill) and obj is not Skill
+        ]
+
+    # ------------------------------------------------------------------
+    # Lazy loading
+    # ------------------------------------------------------------------
+
+    def _load_skills_lazy(self, skills_dir: str):
+        """Register tool schemas from the manifest, importing only changed files."""
+        manifest = self._read_manifest()
+        files = manifest.setdefault("files", {})
+        dirty = False
+        stale_paths = []
+
+        for filename in sorted(os.listdir(skills_dir)):
+            if not filename.endswith(".py") or filename == "__init__.py":
+                continue
+
+            file_path = os.path.abspath(os.path.join(skills_dir, filename))
+            entry = files.get(file_path)
+
+            if entry and self._entry_is_fresh(entry, file_path):
+                dirty = dirty or entry.pop("_refreshed", False)
+                for skill_entry in entry["skills"]:
+                    self._register_pending(file_path, skill_entry)
+                self.load_report.add({
+                    "file": filename,
+                    "status": "deferred",
+                    "import_ms": 0.0,
+                    "init_ms": 0.0,
+                    "tools": sum(len(s["tools"]) for s in entry["skills"]),
+                    "skills": [s["name"] for s in entry["skills"]],
+                    "error": None
+                })
+            else:
+                stale_paths.append(file_path)
+
+        # New or modified files: import them once to rebuild their entries.
+        # The instances are kept, so these skills are already materialized.
+        for file_path, instances in self._load_files(stale_paths).items():
+            dirty = True
+            if not instances:
+                # Don't cache failures - retry on next start
+                files.pop(file_path, None)
+                continue
+
+            files[file_path] = dict(
+                self._fingerprint(file_path),
+                skills=[
+                    {
+                        "class": type(instance).__name__,
+                        "name": instance.name,
+                        "serial": instance.serial,
+                        "tools": instance.get_tools()
+                    }
+                    for instance in instances
+                ]
+            )
+
+        if dirty:
+            self._write_manifest(manifest)
+
+    def _register_pending(self, file_path: str, skill_entry: Dict[str, Any]):
+        """Expose a cached skill's tools without importing its module."""
+        self._pending_skills[skill_entry["name"]] = file_path
+        self.tools_schema.extend(skill_entry["tools"])
+        self._compile_validators(skill_entry["tools"])
+        if skill_entry.get("serial"):
+            self._mark_serial(skill_entry["tools"])
+        for tool in skill_entry["tools"]:
+            function_name = tool.get("function", {}).get("name")
+            if function_name:
+                self._pending_functions[function_name] = file_path
+
+    def _materialize(self, file_path: str) -> bool:
+        """Import a deferred skill file and bind its real functions."""
+        with self._lock:
+            if (file_path not in self._pending_skills.values()
+                    and file_path not in self._pending_functions.values()):
+                return True  # Another thread got here first
+
+            instances, entry = self._load_file_job(file_path)
+            self.load_report.add(entry)
+            if entry["status"] != "loaded":
+                print(f"Failed to load skill module {entry['file']}: {entry['error']}")
+                return False
+
+            for instance in instances:
+                # Schemas are already registered from the manifest
+                self.skills[instance.name] = instance
+                self._bind_functions(instance.get_functions())
+                print(f"Loaded skill: {instance.name} ({entry['import_ms']:.0f} ms)")
+
+            self._pending_skills = {
+                name: path for name, path in self._pending_skills.items() if path != file_path
+            }
+            self._pending_functions = {
+                name: path for name, path in self._pending_functions.items() if path != file_path
+            }
+            return True
+
+    def _ensure_function(self, name: str):
+        """Materialize the skill that provides ``name`` if it is still deferred."""
+        if name not in self.functions and name in self._pending_functions:
+            self._materialize(self._pending_functions[name])
+
+    def _fingerprint(self, file_path: str) -> Dict[str, Any]:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        return {"mtime": stat.st_mtime, "size": stat.st_size, "sha1": digest}
+
+    def _entry_is_fresh(self, entry: Dict[str, Any], file_path: str) -> bool:
+        """Check mtime/size first and only hash the file when those changed."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+
+        if entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+            return True
+
+        fingerprint = self._fingerprint(file_path)
+        if entry.get("sha1") == fingerprint["sha1"]:
+            # Touched but unchanged - refresh mtime so we skip hashing next time
+            entry.update(fingerprint, _refreshed=True)
+            return True
+        return False
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {"version": MANIFEST_VERSION, "files": {}}
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"⚠️  Could not write skill manifest: {e}")
+
+    # ------------------------------------------------------------------
 
     def register_skill(self, skill: Skill):
         self.skills[skill.name] = skill
-        self.tools_schema.extend(skill.get_tools())
-        self.functions.update(skill.get_functions())
+        tools = skill.get_tools()
+        self.tools_schema.extend(tools)
+        self._compile_validators(tools)
+        if getattr(skill, 'serial', False):
+            self._mark_serial(tools)
+        self._bind_functions(skill.get_functions())
+
+    def _mark_serial(self, tools: List[Dict[str, Any]]):
+        for tool in tools:
+            function_name = tool.get('function', {}).get('name')
+            if function_name:
+                self._serial_functions.add(function_name)
+
+    def is_serial(self, function_name: str) -> bool:
+        """True if the tool belongs to a skill that must not run concurrently"""
+        return function_name in self._serial_functions
+
+    def _compile_validators(self, tools: List[Dict[str, Any]]):
+        """Precompile an argument validator for each tool schema"""
+        for tool in tools:
+            function_info = tool.get('function', {})
+            function_name = function_info.get('name')
+            if function_name:
+                self._validators[function_name] = ToolValidator(
+                    function_name, function_info.get('parameters')
+                )
+
+    def _bind_functions(self, functions: Dict[str, Callable]):
+        """Add callables to the dispatch table alongside their validators"""
+        self.functions.update(functions)
+        for function_name, function in functions.items():
+            validator = self._validators.get(function_name)
+            if validator is None:
+                # Callable without a schema - nothing to check but the signature
+                validator = self._validators[function_name] = ToolValidator(function_name)
+            validator.bind(function)
+            self._dispatch[function_name] = (function, validator)
 
     def get_tools_schema(self) -> List[Dict[str, Any]]:
         """Get all tools schema for LLM function calling"""
         return self.tools_schema
-    
+
     def get_all_tools(self) -> List[Dict[str, Any]]:
         """
         Get all tools schema (alias for get_tools_schema for compatibility).
@@ -55,60 +436,74 @@ class SkillRegistry:
 
     def get_function(self, name: str) -> Callable:
         """Get a specific function by name"""
+        self._ensure_function(name)
         return self.functions.get(name)
-    
+
     def get_all_functions(self) -> Dict[str, Callable]:
-        """Get all registered functions"""
+        """Get all registered functions (imports any deferred skills)"""
+        for file_path in set(self._pending_functions.values()):
+            self._materialize(file_path)
         return self.functions
-    
+
     def get_skill(self, name: str) -> Skill:
         """Get a specific skill by name"""
+        if name not in self.skills and name in self._pending_skills:
+            self._materialize(self._pending_skills[name])
         return self.skills.get(name)
-    
+
     def get_all_skills(self) -> Dict[str, Skill]:
-        """Get all registered skills"""
+        """Get all loaded skills (deferred skills are not imported)"""
         return self.skills
-    
+
     def list_skills(self) -> List[str]:
         """List all skill names"""
-        return list(self.skills.keys())
-    
+        return list(self.skills.keys()) + [
+            name for name in self._pending_skills if name not in self.skills
+        ]
+
     def list_tools(self) -> List[str]:
         """List all tool names"""
         return [tool.get('function', {}).get('name', 'unknown') for tool in self.tools_schema]
-    
+
+    def has_tool(self, function_name: str) -> bool:
+        """True if the tool is registered (loaded or deferred), without importing it"""
+        return function_name in self._dispatch or function_name in self._pending_functions
+
     def execute_skill(self, function_name: str, function_args: Dict[str, Any] = None):
         """
         Execute a registered skill function by name with arguments.
         This method is used by the JarvisEngine and self-healing system.
-        
+        In lazy mode the owning skill is imported on its first call.
+
         Args:
             function_name: Name of the function to execute (e.g., 'open_website', 'google_search')
             function_args: Dictionary of arguments to pass to the function (e.g., {'url': 'https://youtube.com'})
-            
+
         Returns:
             Result from the executed function
-            
+
         Raises:
-            ValueError: If the skill function is not found in registry
+            UnknownToolError: If the skill function is not found in registry
+            ToolArgumentError: If the arguments don't match the tool schema
+            (both are ValueError subclasses with a structured to_dict())
         """
-        if function_name not in self.functions:
-            available_functions = ', '.join(self.functions.keys())
-            raise ValueError(
-                f"Skill function '{function_name}' not found in registry. "
-                f"Available functions: {available_functions}"
-            )
-        
-        try:
-            function = self.functions[function_name]
-            
-            # Handle arguments - if None, use empty dict
-            if function_args is None:
-                function_args = {}
-            
-            # Call function with unpacked keyword arguments
-            result = function(**function_args)
-            return result
-        except Exception as e:
-            print(f"❌ Error executing skill '{function_name}': {e}")
-            raise
+        with tracer.span("tool", tool=function_name):
+            entry = self._dispatch.get(function_name)
+            if entry is None:
+                with tracer.span("skill_load", tool=function_name):
+                    self._ensure_function(function_name)
+                entry = self._dispatch.get(function_name)
+                if entry is None:
+                    raise unknown_tool_error(function_name, self.list_tools())
+
+            function, validator = entry
+
+            # Reject malformed calls before touching the skill
+            function_args = validator(function_args)
+
+            try:
+                # Call function with unpacked keyword arguments
+                return function(**function_args)
+            except Exception as e:
+                print(f"❌ Error executing skill '{function_name}': {e}")
+                raise
@@ -6,11 +6,17 @@ Now with Advanced Self-Coding AI integration
 
 import os
 import sys
+import time
 import subprocess
 import traceback
-from typing import Optional, Dict, List
+import importlib.util
+from typing import Any, Optional, Dict, List, Set
 from datetime import datetime
 
+from core.tracing import tracer
+from core.fix_cache import fix_cache, error_fingerprint
+from core.lazy import LazyInstance
+
 
 class SelfHealing:
     """Autonomous error detection and fixing system with AI code generation"""
@@ -19,6 +25,10 @@ class SelfHealing:
         self.error_log: List[Dict] = []
         self.fix_attempts: Dict[str, int] = {}
         self.max_fix_attempts = 3
+        # Fingerprints fixed during this run - seeing one again means the fix didn't hold
+        self.fixed_this_run: Set[str] = set()
+        # Filled by the basic fixers with what's needed to replay a fix (e.g. the pip package)
+        self._fix_detail: Dict[str, Any] = {}
         self.advanced_coder = None
         
         # Try to initialize advanced self-coder
@@ -53,40 +63,91 @@ class SelfHealing:
         Returns:
             True if fixed, False if cannot fix.
         """
+        with tracer.span("self_heal", error=type(error).__name__, context=context[:100]) as span:
+            fixed = self._auto_fix_error(error, context, file_path)
+            span.set(fixed=fixed)
+            return fixed
+    
+    def _auto_fix_error(self, error: Exception, context: str = "", file_path: str = None) -> bool:
         self.log_error(error, context)
         error_type = type(error).__name__
         error_msg = str(error)
         
+        # Same type + normalized message + stack location = same error, across restarts
+        fingerprint = error_fingerprint(error)
+        fix_key = fingerprint['key']
+        known = fix_cache.lookup(fingerprint)
+        
+        if fix_cache.is_unfixable(known):
+            print(f"⏭️  Known unfixable {error_type} (failed {known['failures']}x before) - skipping fix attempts")
+            return False
+        
         # Check if we've tried too many times
-        fix_key = f"{error_type}:{error_msg}"
         if self.fix_attempts.get(fix_key, 0) >= self.max_fix_attempts:
             print(f"⚠️  Maximum fix attempts reached for: {error_type}")
             return False
         
-        self.fix_attempts[fix_key] = self.fix_attempts.get(fix_key, 0) + 1
+        if fix_key in self.fixed_this_run:
+            self.fixed_this_run.discard(fix_key)
+            if fix_cache.record_failure(fingerprint):
+                print(f"⏭️  {error_type} keeps coming back after fixes - marked unfixable")
+                return False
         
-        # Try basic fixes first (fast)
-        basic_fix = self._try_basic_fix(error_type, error_msg, context)
-        if basic_fix:
-            return True
+        self.fix_attempts[fix_key] = self.fix_attempts.get(fix_key, 0) + 1
+        start = time.perf_counter()
+        known_fix = fix_cache.known_fix(known)
+        if known_fix:
+            print(f"⚡ Seen this {error_type} before - replaying the {known_fix['method']} fix")
+        
+        # Try basic fixes first (fast) - unless an AI fix is what worked last time
+        fixed = False
+        use_ai_fix = bool(known_fix and known_fix['method'] == "ai" and self.advanced_coder and file_path)
+        if not use_ai_fix:
+            self._fix_detail = {}
+            hint = known_fix['detail'] if known_fix and known_fix['method'] == "basic" else {}
+            if self._try_basic_fix(error_type, error_msg, context, hint):
+                fix_cache.record_success(fingerprint, "basic", self._fix_detail,
+                                         (time.perf_counter() - start) * 1000, replayed=bool(hint))
+                self.fixed_this_run.add(fix_key)
+                return True
         
-        # If basic fix failed and we have advanced coder, try AI fix
+        # If basic fix failed and we have advanced coder, try AI fix (it records its own outcome)
         if self.advanced_coder and file_path:
             print(f"\n🤖 Trying AI-powered fix...")
-            ai_fix = self.advanced_coder.analyze_error_and_fix(error, context, file_path)
-            if ai_fix:
+            fixed = self.advanced_coder.analyze_error_and_fix(error, context, file_path)
+            if fixed:
                 print(f"✅ AI successfully fixed the error!")
                 print(f"💡 Please restart JARVIS to apply changes: python main.py")
+                self.fixed_this_run.add(fix_key)
                 return True
+        else:
+            fix_cache.record_failure(fingerprint, (time.perf_counter() - start) * 1000)
         
         print(f"❌ Could not automatically fix: {error_type}")
         return False
     
-    def _try_basic_fix(self, error_type: str, error_msg: str, context: str) -> bool:
-        """Try basic/fast fixes first"""
+    def record_unfixed(self, error: Exception) -> bool:
+        """
+        Count an error that was retried rather than fixed.
+        Returns True once it is known to be unfixable (stop retrying it).
+        """
+        fingerprint = error_fingerprint(error)
+        if fix_cache.is_unfixable(fix_cache.lookup(fingerprint)):
+            return True
+        return fix_cache.record_failure(fingerprint)
+    
+    def _try_basic_fix(self, error_type: str, error_msg: str, context: str,
+                       hint: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Try basic/fast fixes first
+        
+        Args:
+            hint: Detail recorded when this error was fixed before (e.g. {"package": "opencv-python"})
+        """
+        hint = hint or {}
         
         if error_type == "ModuleNotFoundError" or error_type == "ImportError":
-            return self._fix_import_error(error_msg)
+            return self._fix_import_error(error_msg, hint.get("package"))
         
         elif error_type == "AttributeError":
             return self._fix_attribute_error(error_msg, context)
@@ -139,8 +200,13 @@ class SelfHealing:
                 
         return False
     
-    def _fix_import_error(self, error_msg: str) -> bool:
-        """Fix missing module by auto-installing"""
+    def _fix_import_error(self, error_msg: str, package: Optional[str] = None) -> bool:
+        """
+        Fix missing module by auto-installing
+        
+        Args:
+            package: pip package that provided this module last time (skips guessing)
+        """
         print(f"🔧 Attempting to fix import error...")
         
         # Extract module name
@@ -151,14 +217,21 @@ class SelfHealing:
         if not module_name:
             return False
         
+        # Installed since the error was raised (e.g. by an earlier fix) - nothing to do
+        if importlib.util.find_spec(module_name) is not None:
+            print(f"✅ {module_name} is already installed")
+            self._fix_detail = {"package": package or module_name}
+            return True
+        
         print(f"📦 {module_name} नहीं मिला। Auto-install कर रहा हूँ...")
         
         try:
             # Try to install the package
             subprocess.check_call([
-                sys.executable, "-m", "pip", "install", module_name, "-q"
+                sys.executable, "-m", "pip", "install", package or module_name, "-q"
             ])
-            print(f"✅ {module_name} successfully install हो गया!")
+            print(f"✅ {package or module_name} successfully install हो गया!")
+            self._fix_detail = {"package": package or module_name}
             return True
         except subprocess.CalledProcessError:
             # Try common package name mappings
@@ -178,6 +251,7 @@ class SelfHealing:
                         sys.executable, "-m", "pip", "install", actual_package, "-q"
                     ])
                     print(f"✅ {actual_package} successfully install हो गया!")
+                    self._fix_detail = {"package": actual_package}
                     return True
                 except:
                     pass
@@ -310,6 +384,12 @@ class SelfHealing:
                     report += f"     Context: {error['context']}\n"
             report += "\n"
         
+        # Fixes remembered across restarts
+        cache = fix_cache.get_stats()
+        if cache['enabled']:
+            report += (f"💾 Fix cache: {cache['fixed']} fixed, {cache['failing']} failing, "
+                       f"{cache['unfixable']} unfixable ({cache['hits']} replayed, {cache['skips']} skipped)\n")
+        
         # Add AI fix history if available
         if self.advanced_coder:
             report += "\n" + self.advanced_coder.get_fix_history()
@@ -317,5 +397,5 @@ class SelfHealing:
         return report
 
 
-# Global instance
-self_healing = SelfHealing()
+# Global instance (built on first use)
+self_healing = LazyInstance(SelfHealing, "self_healing")
@@ -4,6 +4,12 @@ from typing import List, Dict, Any, Callable
 class Skill(ABC):
     """Base class for all Skills."""
     
+    # Set to True for skills with side effects that depend on ordering
+    # (mouse/keyboard automation, file writes, opening apps). Their tools
+    # never run concurrently with each other when the LLM requests
+    # several tools in one turn.
+    serial: bool = False
+    
     @abstractmethod
     def get_tools(self) -> List[Dict[str, Any]]:
         """Return the list of tool schemas provided by this skill."""
@@ -0,0 +1,247 @@
+"""
+Startup profiler for the JARVIS launchers (--profile-startup)
+Like `python -X importtime`, but in-process and summarised:
+- Times every module import (self and cumulative) through a meta path hook
+- Records named phases (window shown, skills loaded, engine ready...)
+- Times construction of lazy core singletons
+
+Usage:
+    python launch_modern.py --profile-startup
+    python -m core.startup_profile core.engine core.voice
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class _TimedLoader:
+    """Wraps a module loader so create/exec time is charged to the module"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        # Extension modules do their real work here
+        return self._profiler._timed(spec.name, self._loader.create_module, spec)
+
+    def exec_module(self, module):
+        # Hand the real loader back so importlib.resources, reload() etc. see it
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        return self._profiler._timed(module.__name__, self._loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder:
+    """First entry on sys.meta_path: finds specs via the other finders and wraps their loaders"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """
+    Usage:
+        startup_profile.enable_from_argv()      # first thing in a launcher
+        ...
+        startup_profile.mark("window shown")
+        ...
+        startup_profile.finish()                # prints the breakdown once
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.phases: List[tuple] = []
+        self.inits: List[tuple] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finder: Optional[_TimingFinder] = None
+        self._finished = False
+
+    def enable(self):
+        """Start recording imports, phases and singleton construction"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+        self.mark("profiler on")
+
+    def enable_from_argv(self, argv: Optional[List[str]] = None) -> bool:
+        """Enable when --profile-startup is on the command line (removed from argv) or JARVIS_PROFILE_STARTUP=1"""
+        argv = sys.argv if argv is None else argv
+        requested = os.environ.get("JARVIS_PROFILE_STARTUP", "0") == "1"
+        while PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+            requested = True
+        if requested:
+            self.enable()
+        return requested
+
+    def disable(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.enabled = False
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, phase: str):
+        """Record a named point in startup (time since the profiler was created)"""
+        if self.enabled:
+            with self._lock:
+                self.phases.append((phase, self.elapsed_ms(), threading.current_thread().name))
+
+    def record_init(self, name: str, ms: float):
+        """Record construction time of a lazy singleton"""
+        if self.enabled:
+            with self._lock:
+                self.inits.append((name, ms))
+
+    def _timed(self, name: str, fn: Callable, arg: Any):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # [child time] for the module being loaded, so self time excludes nested imports
+        stack.append([0.0])
+        start = time.perf_counter()
+        try:
+            return fn(arg)
+        finally:
+            total = (time.perf_counter() - start) * 1000
+            children = stack.pop()[0]
+            if stack:
+                stack[-1][0] += total
+            with self._lock:
+                entry = self.imports.setdefault(name, {"self_ms": 0.0, "cumulative_ms": 0.0})
+                entry["self_ms"] += total - children
+                entry["cumulative_ms"] += total
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def summary(self, top: int = 15) -> Dict[str, Any]:
+        with self._lock:
+            imports = dict(self.imports)
+            phases = list(self.phases)
+            inits = list(self.inits)
+
+        packages: Dict[str, float] = {}
+        for name, entry in imports.items():
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0.0) + entry["self_ms"]
+
+        return {
+            "elapsed_ms": round(self.elapsed_ms(), 1),
+            "import_ms": round(sum(entry["self_ms"] for entry in imports.values()), 1),
+            "modules": len(imports),
+            "phases": [{"phase": phase, "at_ms": round(at, 1), "thread": thread} for phase, at, thread in phases],
+            "slowest_imports": [
+                {"module": name, "cumulative_ms": round(entry["cumulative_ms"], 1),
+                 "self_ms": round(entry["self_ms"], 1)}
+                for name, entry in sorted(imports.items(), key=lambda item: -item[1]["cumulative_ms"])[:top]
+            ],
+            "packages": [
+                {"package": package, "self_ms": round(ms, 1)}
+                for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]
+            ],
+            "singletons": [{"name": name, "ms": round(ms, 1)} for name, ms in inits],
+        }
+
+    def format_lines(self, top: int = 15) -> List[str]:
+        data = self.summary(top)
+        lines = [f"⏱️  Startup profile: {data['elapsed_ms']:.0f} ms total, "
+                 f"{data['import_ms']:.0f} ms importing {data['modules']} modules"]
+
+        if data["phases"]:
+            lines.append("   Phases (since launch):")
+            for item in data["phases"]:
+                thread = "" if item["thread"] == "MainThread" else f"  [{item['thread']}]"
+                lines.append(f"     {item['at_ms']:>8.0f} ms  {item['phase']}{thread}")
+
+        if data["packages"]:
+            lines.append("   Import time by package (self):")
+            for item in data["packages"]:
+                lines.append(f"     {item['self_ms']:>8.1f} ms  {item['package']}")
+
+        if data["slowest_imports"]:
+            lines.append("   Slowest imports (cumulative / self):")
+            for item in data["slowest_imports"]:
+                lines.append(f"     {item['cumulative_ms']:>8.1f} / {item['self_ms']:>6.1f} ms  {item['module']}")
+
+        if data["singletons"]:
+            lines.append("   Lazy singletons (built on first use):")
+            for item in data["singletons"]:
+                lines.append(f"     {item['ms']:>8.1f} ms  {item['name']}")
+        return lines
+
+    def finish(self, phase: Optional[str] = None):
+        """Mark the final phase and print the breakdown (only the first call prints)"""
+        if not self.enabled or self._finished:
+            return
+        if phase:
+            self.mark(phase)
+        self._finished = True
+        print("\n".join(self.format_lines()))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Profile importing the given modules (default: what the GUIs load)"""
+    # Under `python -m` this file is __main__; use the instance the rest of core sees
+    from core.startup_profile import startup_profile
+
+    startup_profile.enable()
+    modules = (argv if argv is not None else sys.argv[1:]) or ["core.registry", "core.engine", "core.voice"]
+    for name in modules:
+        try:
+            __import__(name)
+            startup_profile.mark(f"imported {name}")
+        except Exception as e:
+            startup_profile.mark(f"failed {name}: {type(e).__name__}")
+    startup_profile.finish()
+
+
+# Global instance
+startup_profile = StartupProfiler()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Relevance-based tool selection for JARVIS
+Sends the LLM only the tool schemas relevant to the current query instead
+of every registered tool, which dominates prompt tokens on CPU-only Ollama:
+- BM25 keyword scoring over tool names, descriptions and parameters
+- Hinglish queries normalized to English first ("gaana bajao" -> "song play")
+- Intent-category keywords from the intent router as extra query terms
+- Optional hashed-embedding similarity for fuzzy matches
+"""
+
+import os
+import re
+import json
+import math
+import difflib
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.indian_language import indian_language
+from core.intent_router import intent_router
+
+_WORD = re.compile(r"[^\W_]+")
+_STOPWORDS = {
+    "a", "an", "the", "to", "and", "or", "of", "for", "in", "on", "with", "is", "it",
+    "this", "that", "use", "e", "g", "eg", "etc", "any", "from", "be", "if", "by", "as",
+    "you", "your", "me", "my", "i", "can", "will", "not", "are", "like", "do", "please",
+}
+
+# Extra query terms per intent-router category
+CATEGORY_TERMS = {
+    "play_music": ["play", "music", "song", "youtube"],
+    "download_movie": ["download", "movie", "film"],
+    "search": ["search", "web", "google", "information"],
+    "system_control": ["system", "volume", "open", "app", "application", "screenshot"],
+    "web_browse": ["website", "open", "browser", "url"],
+}
+
+# Hinglish words the language processor leaves alone but tool descriptions only say in English
+QUERY_SYNONYMS = {
+    "yaad": ["remember", "memory"],
+    "bhool": ["forget", "memory"],
+    "bhulo": ["forget", "memory"],
+    "mausam": ["weather"],
+    "samay": ["time"],
+    "tareekh": ["date"],
+    "awaaz": ["volume"],
+    "awaz": ["volume"],
+    "kholo": ["open"],
+    "band": ["close"],
+    "likho": ["write", "create"],
+    "banao": ["create"],
+    "padho": ["read"],
+    "bhejo": ["send"],
+    "paise": ["money", "withdraw"],
+    # Devanagari (hi-IN speech recognition output)
+    "समय": ["time"],
+    "टाइम": ["time"],
+    "तारीख": ["date"],
+    "मौसम": ["weather"],
+    "गाना": ["song", "music", "play"],
+    "गाने": ["song", "music", "play"],
+    "बजाओ": ["play"],
+    "चलाओ": ["play"],
+    "यूट्यूब": ["youtube"],
+    "खोलो": ["open"],
+    "गूगल": ["google"],
+    "खोजो": ["search"],
+    "याद": ["remember", "memory"],
+    "आवाज": ["volume"],
+    "आवाज़": ["volume"],
+    "स्क्रीनशॉट": ["screenshot"],
+    "फाइल": ["file"],
+}
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower().replace("_", " ")) if w not in _STOPWORDS]
+
+
+def tool_name(tool: Dict[str, Any]) -> str:
+    return tool.get("function", {}).get("name", "")
+
+
+class ToolSelector:
+    """
+    Picks the top-N tool schemas for a query.
+
+    Usage:
+        subset = tool_selector.select(query, tools)
+        ...
+        subset = tool_selector.widen(query, tools, subset)  # model asked for a tool not sent
+    """
+
+    def __init__(self, top_n: int = 12, min_tools: int = 20, embedder=None):
+        """
+        Args:
+            top_n: Number of tool schemas sent per turn
+            min_tools: Below this many registered tools, always send them all
+            embedder: Optional embedder with .embed(texts) returning a NumPy matrix
+        """
+        self.top_n = top_n
+        self.min_tools = min_tools
+        self.embedder = embedder
+
+        self._index_key = None
+        self._names: List[str] = []
+        self._doc_terms: List[Dict[str, int]] = []
+        self._doc_lengths: List[int] = []
+        self._idf: Dict[str, float] = {}
+        self._avg_length = 1.0
+        self._vectors = None
+        self._sizes: Dict[str, int] = {}
+        self._total_size = 0
+
+        # Stats
+        self.turns = 0
+        self.tokens_saved = 0
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _tool_text(self, tool: Dict[str, Any]) -> str:
+        function = tool.get("function", {})
+        name = function.get("name", "")
+        parts = [name, name, function.get("description", "")]  # Name counts twice
+        properties = (function.get("parameters") or {}).get("properties") or {}
+        for field, spec in properties.items():
+            parts.append(field)
+            if isinstance(spec, dict):
+                parts.append(str(spec.get("description", "")))
+        return " ".join(parts)
+
+    def _ensure_index(self, tools: List[Dict[str, Any]]):
+        names = [tool_name(tool) for tool in tools]
+        key = tuple(names)
+        if key == self._index_key:
+            return
+
+        texts = [self._tool_text(tool) for tool in tools]
+        self._names = names
+        self._doc_terms = []
+        self._doc_lengths = []
+        document_frequency: Dict[str, int] = {}
+        for text in texts:
+            terms: Dict[str, int] = {}
+            for term in tokenize(text):
+                terms[term] = terms.get(term, 0) + 1
+            self._doc_terms.append(terms)
+            self._doc_lengths.append(sum(terms.values()))
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        count = len(texts)
+        self._idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+        self._avg_length = (sum(self._doc_lengths) / count) if count else 1.0
+        # Serialized schema sizes, for the prompt-token savings estimate
+        self._sizes = {name: len(json.dumps(tool)) + 2 for name, tool in zip(names, tools)}
+        self._total_size = sum(self._sizes.values())
+
+        self._vectors = None
+        if self.embedder is not None and np is not None and texts:
+            try:
+                vectors = self.embedder.embed(texts)
+                norms = (vectors ** 2).sum(axis=1, keepdims=True) ** 0.5
+                norms[norms == 0] = 1.0
+                self._vectors = vectors / norms
+            except Exception as e:
+                print(f"⚠️  Tool embeddings unavailable: {e}")
+
+        self._index_key = key
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _query_terms(self, query: str) -> List[str]:
+        text = f"{query} {indian_language.normalize_text(query)}"
+        terms = tokenize(text)
+        for word in list(terms):
+            terms.extend(QUERY_SYNONYMS.get(word, []))
+        category = intent_router.categorize(query)["category"]
+        terms.extend(CATEGORY_TERMS.get(category, []))
+        return terms
+
+    def score(self, query: str, tools: List[Dict[str, Any]]) -> List[float]:
+        """Relevance score of every tool for the query"""
+        self._ensure_index(tools)
+        terms = set(self._query_terms(query))
+        k1, b = 1.2, 0.75
+
+        scores = []
+        for terms_in_doc, length in zip(self._doc_terms, self._doc_lengths):
+            score = 0.0
+            for term in terms:
+                frequency = terms_in_doc.get(term)
+                if frequency:
+                    norm = frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / self._avg_length))
+                    score += self._idf.get(term, 0.0) * norm
+            scores.append(score)
+
+        if self._vectors is not None:
+            try:
+                query_vector = self.embedder.embed([query])[0]
+                norm = float((query_vector ** 2).sum() ** 0.5) or 1.0
+                similarities = self._vectors @ (query_vector / norm)
+                # Every tool is a little similar to everything; only above-median similarity counts
+                baseline = float(np.median(similarities))
+                scores = [s + 4.0 * max(0.0, float(sim) - baseline) for s, sim in zip(scores, similarities)]
+            except Exception:
+                pass
+        return scores
+
+    def select(self, query: str, tools: List[Dict[str, Any]], top_n: Optional[int] = None,
+               include: Iterable[str] = (), fill: bool = False) -> List[Dict[str, Any]]:
+        """
+        Top-N tools for the query, keeping the original tool order.
+
+        Args:
+            query: User query
+            tools: All registered tool schemas
+            top_n: Override the default subset size
+            include: Tool names that must be in the subset (e.g. tools used earlier in the conversation)
+            fill: Also send tools that didn't match the query at all to reach top_n
+        """
+        top_n = top_n or self.top_n
+        if not top_n or len(tools) < self.min_tools or len(tools) <= top_n:
+            return list(tools)
+
+        scores = self.score(query, tools)
+        if not fill and not any(score > 0 for score in scores):
+            # Nothing matched ("tell me a joke", or a script the keyword index
+            # doesn't cover) - don't guess, send everything; with no tools the
+            # model couldn't ask for one and widen() would never run
+            return list(tools)
+        ranked = sorted(range(len(tools)), key=lambda i: scores[i], reverse=True)
+        chosen: Set[int] = {i for i in ranked[:top_n] if fill or scores[i] > 0}
+
+        wanted = set(include)
+        chosen.update(i for i, name in enumerate(self._names) if name in wanted)
+        return [tools[i] for i in sorted(chosen)]
+
+    def widen(self, query: str, tools: List[Dict[str, Any]], current: List[Dict[str, Any]],
+              requested: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Bigger subset after the model asked for a tool it wasn't given.
+        Doubles the subset size and adds the requested tools, or the closest
+        real names for tools that don't exist (play_song -> play_music).
+        """
+        if len(current) >= len(tools):
+            return current
+        self._ensure_index(tools)
+        names = {tool_name(tool) for tool in current}
+        for name in requested:
+            names.add(name)
+            names.update(difflib.get_close_matches(name, self._names, n=2, cutoff=0.6))
+        widened = self.select(query, tools, top_n=max(len(current) * 2, self.top_n * 2),
+                              include=names, fill=True)
+        print(f"🧰 Widening tool set: {len(current)} -> {len(widened)} tools")
+        return widened
+
+    # ------------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------------
+
+    def record_savings(self, tools: List[Dict[str, Any]], subset: List[Dict[str, Any]],
+                       chars_per_token: float = 4.0) -> int:
+        """Log and count the prompt tokens saved by sending the subset"""
+        self._ensure_index(tools)
+        saved_chars = self._total_size - sum(self._sizes.get(tool_name(tool), 0) for tool in subset)
+        saved = max(0, int(saved_chars / chars_per_token))
+        self.turns += 1
+        self.tokens_saved += saved
+        if saved:
+            print(f"🧰 Sending {len(subset)}/{len(tools)} tools (~{saved} prompt tokens saved)")
+        return saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "tokens_saved": self.tokens_saved,
+            "avg_tokens_saved": round(self.tokens_saved / self.turns) if self.turns else 0
+        }
+
+
+def _default_selector() -> ToolSelector:
+    # Hashed embeddings add little over BM25 here; a real local embedding model does
+    embedder = None
+    if os.environ.get("JARVIS_EMBED_MODEL", "").strip():
+        from core.recall import recall_index, OllamaEmbedder
+        if isinstance(recall_index.embedder, OllamaEmbedder):
+            embedder = recall_index.embedder
+    # JARVIS_TOOL_TOP_N=0 sends every tool
+    top_n = int(os.environ.get("JARVIS_TOOL_TOP_N", "12"))
+    return ToolSelector(top_n=top_n, embedder=embedder)
+
+
+# Global instance
+tool_selector = _default_selector()
@@ -0,0 +1,246 @@
+"""
+Per-turn tracing for JARVIS
+Records nested spans (analyze -> llm -> tool -> self_heal ...) for every
+turn with wall/CPU time, token counts and tool names:
+- Finished turns are appended to a rotating JSONL file
+- Recent traces and per-stage p50/p95 are available in-process
+- Spans follow contextvars, so they nest correctly across asyncio tasks
+  and worker threads started with copy_context()
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from logging import Formatter, getLogger
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_TRACE_PATH = os.environ.get(
+    "JARVIS_TRACE_FILE", os.path.join(os.path.expanduser("~"), ".jarvis_traces.jsonl")
+)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("jarvis_span", default=None)
+
+
+class Span:
+    """One timed stage of a turn"""
+
+    __slots__ = ("name", "turn_id", "attrs", "children", "status", "error",
+                 "started_at", "_start", "_cpu_start", "wall_ms", "cpu_ms")
+
+    def __init__(self, name: str, turn_id: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.turn_id = turn_id
+        self.attrs = attrs
+        self.children: List["Span"] = []
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+
+    def set(self, **attrs):
+        """Attach attributes (token counts, result sizes...) to the span"""
+        self.attrs.update(attrs)
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self._start) * 1000
+        # CPU time of the thread that ran the span (not meaningful across awaits on other threads)
+        self.cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+
+    def walk(self) -> Iterator["Span"]:
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "start": round(self.started_at, 3),
+            "wall_ms": round(self.wall_ms, 2),
+            "cpu_ms": round(self.cpu_ms, 2),
+            "status": self.status,
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.to_dict() for child in list(self.children)]
+        return data
+
+
+class Tracer:
+    """
+    Usage:
+        with tracer.turn("turn", query=text):
+            with tracer.span("llm", model=model) as span:
+                ...
+                span.set(prompt_tokens=120)
+
+        tracer.recent(10)        # last finished turns as dicts
+        tracer.stage_stats()     # {"llm": {"count": 12, "p50_ms": ..., "p95_ms": ...}, ...}
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_TRACE_PATH, max_bytes: int = 5 * 1024 * 1024,
+                 backups: int = 3, keep_recent: int = 200, enabled: bool = True):
+        """
+        Args:
+            path: JSONL file for finished turns (None = in-memory only)
+            max_bytes: Rotate the file after this size
+            backups: Number of rotated files to keep
+            keep_recent: Turns (and samples per stage) kept in memory
+            enabled: When False, spans are no-ops
+        """
+        self.enabled = enabled
+        self.keep_recent = keep_recent
+        self._recent: deque = deque(maxlen=keep_recent)
+        self._durations: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+        self._log = None
+        if enabled and path:
+            try:
+                handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+                handler.setFormatter(Formatter("%(message)s"))
+                self._log = getLogger(f"jarvis.trace.{id(self)}")
+                self._log.propagate = False
+                self._log.setLevel("INFO")
+                self._log.addHandler(handler)
+            except OSError as e:
+                print(f"⚠️  Trace file unavailable ({e}), keeping traces in memory only")
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def turn(self, name: str = "turn", **attrs):
+        """Root span of one user request; written out when it ends"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        span = Span(name, uuid.uuid4().hex[:12], attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "cancelled" if _is_cancellation(e) else "error"
+            span.error = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            self._record(span)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Nested stage of the current turn (a no-op outside of a turn)"""
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            yield _NULL_SPAN
+            return
+
+        span = Span(name, parent.turn_id, attrs)
+        parent.children.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "cancelled" if _is_cancellation(e) else "error"
+            span.error = f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+
+    def current_turn_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.turn_id if span else None
+
+    def _record(self, root: Span):
+        # Roll token counts and tool names up to the turn
+        prompt_tokens = completion_tokens = 0
+        tools = []
+        for span in root.walk():
+            prompt_tokens += span.attrs.get("prompt_tokens") or 0
+            completion_tokens += span.attrs.get("completion_tokens") or 0
+            if span.name == "tool" and span.attrs.get("tool"):
+                tools.append(span.attrs["tool"])
+        root.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, tools=tools)
+
+        record = root.to_dict()
+        record["turn_id"] = root.turn_id
+
+        with self._lock:
+            self._recent.append(record)
+            for span in root.walk():
+                durations = self._durations.get(span.name)
+                if durations is None:
+                    durations = self._durations[span.name] = deque(maxlen=self.keep_recent)
+                durations.append(span.wall_ms)
+
+        if self._log is not None:
+            try:
+                self._log.info(json.dumps(record, ensure_ascii=False, default=str))
+            except Exception as e:
+                print(f"⚠️  Could not write trace: {e}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent finished turns, newest last"""
+        with self._lock:
+            return list(self._recent)[-limit:]
+
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """Count and p50/p95 wall time (ms) per span name over recent turns"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._durations.items() if values}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+            }
+            for name, values in samples.items()
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is off or there is no active turn"""
+
+    turn_id = None
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _is_cancellation(error: BaseException) -> bool:
+    return type(error).__name__ in ("CancelledError", "TimeoutError")
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+# Global instance (JARVIS_TRACE=0 disables tracing)
+tracer = Tracer(enabled=os.environ.get("JARVIS_TRACE", "1") != "0")
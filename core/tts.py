@@ -0,0 +1,413 @@
+"""
+Text-to-speech service for JARVIS
+One background thread owns the speech engine and speaks everything,
+so callers never block on runAndWait()/`say` and overlapping replies
+can't race on one pyttsx3 engine:
+- Priority queue: urgent notices jump ahead of queued reply sentences
+- Text is split into sentences, so speech starts after the first one
+- Barge-in: speech stops when the user starts talking (always-on mic)
+  or sends a new command (interrupt())
+- Frequent fixed phrases are synthesized to audio files once and then
+  played instantly from the cache
+"""
+
+import os
+import re
+import sys
+import time
+import queue
+import wave
+import shutil
+import heapq
+import hashlib
+import itertools
+import threading
+import subprocess
+from collections import Counter
+from typing import Iterable, List, Optional
+
+URGENT = 0
+NORMAL = 1
+LOW = 2
+_SYNTHESIZE = 3        # cache fills run only when nothing is waiting to be spoken
+
+# Sentence end: . ! ? or Hindi danda, followed by whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+')
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.jarvis_tts_cache")
+# Phrases spoken this often (and short enough) get cached audio
+CACHE_AFTER_USES = 2
+CACHE_MAX_CHARS = 120
+CACHE_MAX_FILES = 200
+
+# Fixed phrases worth having ready before they're first needed
+COMMON_PHRASES = [
+    "JARVIS ready! How can I help you?",
+    "Continuous mode activated. I'm listening.",
+    "Continuous mode deactivated.",
+    "Task completed.",
+]
+
+# Emoji and other symbols the speech engines read out literally or choke on
+_UNSPEAKABLE = re.compile("[\U0001F000-\U0001FAFF\u2600-\u27BF\uFE0F]")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_END.split(text) if sentence.strip()]
+
+
+class SpeechItem:
+    def __init__(self, text: str, priority: int, group: int):
+        self.text = text
+        self.priority = priority
+        self.group = group
+        self.cancelled = False
+        self.done = threading.Event()
+
+
+class SpeechHandle:
+    """What say() returns: wait for, or cancel, one queued piece of speech"""
+
+    def __init__(self, service: "TTSService", group: int, items: List[SpeechItem]):
+        self._service = service
+        self.group = group
+        self.items = items
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.time() + timeout
+        for item in self.items:
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            if not item.done.wait(remaining):
+                return False
+        return True
+
+    def cancel(self):
+        self._service.cancel(self.group)
+
+    @property
+    def done(self) -> bool:
+        return all(item.done.is_set() for item in self.items)
+
+
+class TTSService:
+    """
+    Usage:
+        from core.tts import tts
+
+        tts.say("Hello! How can I help?")               # returns right away
+        tts.say("Battery low", priority=URGENT)         # spoken next
+        handle = tts.say(reply); handle.wait()          # block only if needed
+        tts.interrupt()                                 # user sent a new command
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, barge_in: Optional[bool] = None):
+        self.cache_dir = os.path.expanduser(cache_dir or os.environ.get("JARVIS_TTS_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.cache_enabled = os.environ.get("JARVIS_TTS_CACHE", "1") != "0"
+        if barge_in is None:
+            barge_in = os.environ.get("JARVIS_TTS_BARGE_IN", "1") != "0"
+        self.barge_in = barge_in
+
+        self.speaking = False
+        self.uses: Counter = Counter()
+        self.stats = {"spoken": 0, "cache_hits": 0, "cached": 0, "interrupted": 0, "barge_ins": 0}
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._groups = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._current: Optional[SpeechItem] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = threading.Event()
+        self._pending_synth = set()
+        self._barge_in_hooked = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def new_group(self) -> int:
+        """Id tying several say() calls together (one streamed reply) for cancel()"""
+        return next(self._groups)
+
+    def say(self, text: str, priority: int = NORMAL, group: Optional[int] = None) -> SpeechHandle:
+        """Queue text to be spoken sentence by sentence; returns immediately"""
+        self._ensure_worker()
+        group = group or self.new_group()
+        items = [SpeechItem(sentence, priority, group) for sentence in split_sentences(text)]
+        for item in items:
+            self._queue.put((priority, next(self._seq), item))
+        return SpeechHandle(self, group, items)
+
+    def interrupt(self):
+        """Stop the current sentence and drop everything queued (barge-in)"""
+        dropped = self._drop(lambda item: True)
+        current = self._current
+        if current is not None:
+            current.cancelled = True
+            self._stop_playback()
+        if dropped or current is not None:
+            self.stats["interrupted"] += 1
+
+    def cancel(self, group: int):
+        """Stop and drop one reply's speech, leaving other queued speech alone"""
+        self._drop(lambda item: item.group == group)
+        current = self._current
+        if current is not None and current.group == group:
+            current.cancelled = True
+            self._stop_playback()
+
+    def precache(self, phrases: Iterable[str]):
+        """Synthesize audio for fixed phrases in idle time so they play instantly"""
+        if not self.cache_enabled:
+            return
+        self._ensure_worker()
+        for phrase in phrases:
+            for sentence in split_sentences(self._clean(phrase)):
+                self._schedule_synthesis(sentence)
+
+    def idle(self) -> bool:
+        return not self.speaking and self._queue.empty()
+
+    def get_stats(self):
+        return {**self.stats, "queued": self._queue.qsize(), "speaking": self.speaking,
+                "cache_dir": self.cache_dir if self.cache_enabled else None}
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jarvis-tts", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            priority, _, item = self._queue.get()
+            if priority == _SYNTHESIZE:
+                self._pending_synth.discard(item)
+                self._synthesize(item)
+                continue
+            if item.cancelled:
+                item.done.set()
+                continue
+
+            self._current = item
+            self._set_speaking(True)
+            try:
+                self._speak(item)
+            except Exception as e:
+                print(f"TTS Error: {e}")
+            finally:
+                self._current = None
+                item.done.set()
+                with self._queue.mutex:
+                    more_speech = bool(self._queue.queue) and self._queue.queue[0][0] != _SYNTHESIZE
+                if not more_speech:
+                    self._set_speaking(False)
+
+    def _drop(self, predicate) -> int:
+        """Remove queued (not yet spoken) sentences matching predicate"""
+        dropped = []
+        with self._queue.mutex:
+            kept = []
+            for entry in self._queue.queue:
+                priority, _, item = entry
+                if priority != _SYNTHESIZE and predicate(item):
+                    dropped.append(item)
+                else:
+                    kept.append(entry)
+            if dropped:
+                self._queue.queue[:] = kept
+                heapq.heapify(self._queue.queue)
+        for item in dropped:
+            item.cancelled = True
+            item.done.set()
+        return len(dropped)
+
+    def _speak(self, item: SpeechItem):
+        text = self._clean(item.text)
+        if not text:
+            return
+        self.stats["spoken"] += 1
+
+        path = self._cache_path(text)
+        if path and os.path.exists(path):
+            self.stats["cache_hits"] += 1
+            self._play(path)
+            return
+
+        self._speak_live(text)
+        if path and not item.cancelled:
+            self.uses[text] += 1
+            if self.uses[text] >= CACHE_AFTER_USES and len(text) <= CACHE_MAX_CHARS:
+                self._schedule_synthesis(text)
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        return _UNSPEAKABLE.sub("", text).strip()
+
+    # ------------------------------------------------------------------
+    # Backends: `say` on macOS, pyttsx3 elsewhere
+    # ------------------------------------------------------------------
+
+    def _speak_live(self, text: str):
+        if sys.platform == "darwin":
+            # List arguments - no shell quoting/injection issues
+            if self._run_process(["say", "-v", "Lekha", text]) == 0 or self._current_cancelled():
+                return
+            self._run_process(["say", text])  # Lekha (Hindi) voice not installed
+            return
+
+        from core.voice import get_engine
+        engine = get_engine()
+        engine.say(text)
+        engine.runAndWait()
+
+    def _play(self, path: str):
+        if sys.platform == "win32":
+            import winsound
+            self._stopped.clear()
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            # PlaySound is asynchronous; wait out the clip unless interrupted
+            self._stopped.wait(self._duration(path))
+            return
+        player = "afplay" if sys.platform == "darwin" else "aplay"
+        self._run_process([player, "-q", path] if player == "aplay" else [player, path])
+
+    def _synthesize(self, text: str):
+        """Render text to the cache (runs on the worker between sentences)"""
+        path = self._cache_path(text)
+        if not path or os.path.exists(path):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            partial = path[:-len(".wav")] + ".part.wav"
+            if sys.platform == "darwin":
+                wav = ["--file-format=WAVE", "--data-format=LEI16@22050", "-o", partial]
+                if subprocess.run(["say", "-v", "Lekha", *wav, text], capture_output=True).returncode != 0:
+                    subprocess.run(["say", *wav, text], capture_output=True)
+            else:
+                from core.voice import get_engine
+                engine = get_engine()
+                engine.save_to_file(text, partial)
+                engine.runAndWait()
+            if os.path.exists(partial) and os.path.getsize(partial) > 0:
+                os.replace(partial, path)
+                self.stats["cached"] += 1
+                self._prune_cache()
+        except Exception as e:
+            print(f"⚠️  TTS cache write failed: {e}")
+
+    def _schedule_synthesis(self, text: str):
+        path = self._cache_path(text)
+        if not path or os.path.exists(path) or text in self._pending_synth:
+            return
+        self._pending_synth.add(text)
+        self._queue.put((_SYNTHESIZE, next(self._seq), text))
+
+    def _cache_path(self, text: str) -> Optional[str]:
+        if not self.cache_enabled or not self._can_play_files():
+            return None
+        # Same text in another voice/platform is a different clip
+        key = hashlib.sha1(f"{sys.platform}|{text}".encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    @staticmethod
+    def _can_play_files() -> bool:
+        if sys.platform == "win32":
+            return True
+        return shutil.which("afplay" if sys.platform == "darwin" else "aplay") is not None
+
+    def _prune_cache(self):
+        files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                 if name.endswith(".wav") and not name.endswith(".part.wav")]
+        if len(files) <= CACHE_MAX_FILES:
+            return
+        files.sort(key=os.path.getatime)
+        for path in files[:len(files) - CACHE_MAX_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _duration(path: str) -> float:
+        try:
+            with wave.open(path, "rb") as clip:
+                return clip.getnframes() / float(clip.getframerate())
+        except (wave.Error, OSError, EOFError):
+            return 5.0
+
+    def _run_process(self, args: List[str]) -> int:
+        try:
+            process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"TTS Error: {e}")
+            return -1
+        self._process = process
+        try:
+            return process.wait()
+        finally:
+            self._process = None
+
+    def _current_cancelled(self) -> bool:
+        current = self._current
+        return current is not None and current.cancelled
+
+    def _stop_playback(self):
+        """Cut off whatever is playing right now (called from other threads)"""
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        self._stopped.set()
+        if sys.platform == "win32":
+            try:
+                import winsound
+                winsound.PlaySound(None, 0)
+            except Exception:
+                pass
+        if sys.platform != "darwin":
+            try:
+                from core import voice
+                if voice._engine is not None:
+                    voice._engine.stop()
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------
+    # Barge-in
+    # ------------------------------------------------------------------
+
+    def _set_speaking(self, speaking: bool):
+        if speaking == self.speaking:
+            return
+        self.speaking = speaking
+        if not self.barge_in:
+            return
+        # Only when the always-on mic is already open - speaking never opens it
+        try:
+            from core.audio_capture import microphone
+        except ImportError:
+            return
+        if not microphone.running:
+            return
+        if not self._barge_in_hooked:
+            microphone.add_speech_listener(self._on_user_speech)
+            self._barge_in_hooked = True
+        # JARVIS's own voice reaches the mic too; only clearly louder speech counts
+        microphone.vad.suppression = 3.0 if speaking else 1.0
+
+    def _on_user_speech(self):
+        if self.speaking and self._current is not None:
+            self.stats["barge_ins"] += 1
+            print("🛑 Barge-in: stopping speech")
+            self.interrupt()
+
+
+# Global instance (the worker thread starts on the first say())
+tts = TTSService()
@@ -0,0 +1,248 @@
+"""
+Tool argument validation for JARVIS
+Compiles each tool's JSON schema into a validator once, at registration time,
+so malformed LLM tool calls are rejected before the skill is invoked.
+"""
+
+import inspect
+import difflib
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ToolCallError(ValueError):
+    """Base class for tool calls rejected before execution"""
+
+    def __init__(self, tool: str, message: str, problems: List[Dict[str, Any]] = None, hint: str = ""):
+        super().__init__(message)
+        self.tool = tool
+        self.problems = problems or []
+        self.hint = hint
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured error the LLM can read and correct its call from"""
+        return {
+            "status": "error",
+            "error": self.code,
+            "tool": self.tool,
+            "message": str(self),
+            "problems": self.problems,
+            "hint": self.hint
+        }
+
+
+class UnknownToolError(ToolCallError):
+    """The LLM asked for a tool that is not registered"""
+    code = "unknown_tool"
+
+
+class ToolArgumentError(ToolCallError):
+    """The tool exists but its arguments don't match the schema"""
+    code = "invalid_arguments"
+
+
+_TRUE_STRINGS = {"true", "yes", "1", "on", "haan"}
+_FALSE_STRINGS = {"false", "no", "0", "off", "nahi"}
+
+
+def _coerce_string(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError
+
+
+def _coerce_integer(value):
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            number = float(text)
+            if number.is_integer():
+                return int(number)
+    raise TypeError
+
+
+def _coerce_number(value):
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+    raise TypeError
+
+
+def _coerce_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_STRINGS:
+            return True
+        if text in _FALSE_STRINGS:
+            return False
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    raise TypeError
+
+
+def _coerce_array(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError
+
+
+def _coerce_object(value):
+    if isinstance(value, dict):
+        return value
+    raise TypeError
+
+
+_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "string": _coerce_string,
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+    "array": _coerce_array,
+    "object": _coerce_object,
+}
+
+
+class ToolValidator:
+    """
+    Precompiled validator for one tool's arguments.
+    Checks required fields, coerces types (e.g. "5" -> 5 for integers)
+    and drops arguments the bound function cannot accept.
+    """
+
+    __slots__ = ("tool", "required", "fields", "accepted")
+
+    def __init__(self, tool: str, parameters: Optional[Dict[str, Any]] = None):
+        parameters = parameters or {}
+        properties = parameters.get("properties") or {}
+
+        self.tool = tool
+        self.required = tuple(parameters.get("required") or ())
+        # field -> (type name, coercer, enum values)
+        self.fields: Dict[str, tuple] = {}
+        for field, spec in properties.items():
+            if not isinstance(spec, dict):
+                continue
+            type_name = spec.get("type")
+            enum = spec.get("enum")
+            self.fields[field] = (
+                type_name,
+                _COERCERS.get(type_name),
+                frozenset(enum) if enum else None
+            )
+        # None means "accept anything" until a real function is bound
+        self.accepted: Optional[frozenset] = None
+
+    def bind(self, function: Callable):
+        """Record which keyword arguments the real callable accepts"""
+        try:
+            params = inspect.signature(function).parameters.values()
+        except (TypeError, ValueError):
+            self.accepted = None
+            return
+
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params):
+            self.accepted = None
+        else:
+            self.accepted = frozenset(
+                p.name for p in params
+                if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+            )
+
+    def __call__(self, args: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return validated (and coerced) arguments or raise ToolArgumentError"""
+        if args is None:
+            args = {}
+        elif not isinstance(args, dict):
+            raise ToolArgumentError(
+                self.tool,
+                f"Arguments for '{self.tool}' must be an object",
+                [{"field": None, "issue": f"got {type(args).__name__}"}],
+                self._hint()
+            )
+
+        problems = []
+        clean = {}
+
+        for field, value in args.items():
+            if self.accepted is not None and field not in self.accepted:
+                continue  # Extra argument the function can't take - drop it
+
+            spec = self.fields.get(field)
+            if spec is None or value is None:
+                clean[field] = value
+                continue
+
+            type_name, coercer, enum = spec
+            if coercer is not None:
+                try:
+                    value = coercer(value)
+                except (TypeError, ValueError):
+                    problems.append({
+                        "field": field,
+                        "issue": f"expected {type_name}, got {type(value).__name__}",
+                        "value": repr(value)[:80]
+                    })
+                    continue
+
+            if enum is not None and value not in enum:
+                problems.append({
+                    "field": field,
+                    "issue": f"must be one of {sorted(enum)}",
+                    "value": repr(value)[:80]
+                })
+                continue
+
+            clean[field] = value
+
+        for field in self.required:
+            if clean.get(field) is None and not any(p["field"] == field for p in problems):
+                problems.append({"field": field, "issue": "missing required field"})
+
+        if problems:
+            raise ToolArgumentError(
+                self.tool,
+                f"Invalid arguments for '{self.tool}': " +
+                "; ".join(f"{p['field']}: {p['issue']}" for p in problems),
+                problems,
+                self._hint()
+            )
+        return clean
+
+    def _hint(self) -> str:
+        fields = ", ".join(
+            f"{name}: {spec[0] or 'any'}{' (required)' if name in self.required else ''}"
+            for name, spec in self.fields.items()
+        )
+        return f"Call {self.tool} with arguments {{{fields}}}"
+
+
+def unknown_tool_error(name: str, known: List[str]) -> UnknownToolError:
+    """Build an UnknownToolError that suggests the closest tool names"""
+    suggestions = difflib.get_close_matches(name, known, n=3, cutoff=0.5)
+    hint = f"Did you mean: {', '.join(suggestions)}?" if suggestions else "Use one of the provided tools."
+    return UnknownToolError(
+        name,
+        f"Skill function '{name}' not found in registry.",
+        [{"field": None, "issue": "unknown tool", "suggestions": suggestions}],
+        hint
+    )
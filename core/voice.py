@@ -1,12 +1,31 @@
-import os
 import sys
-import pyttsx3
-import speech_recognition as sr
 import re
 import time
+import threading
 
-# Initialize engine globally to avoid re-initialization issues
-engine = pyttsx3.init()
+from core.tts import tts, NORMAL, SENTENCE_END
+
+# pyttsx3 and speech_recognition are imported on first use: initializing the
+# TTS driver and picking a voice takes hundreds of ms (more on Windows/SAPI)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Shared pyttsx3 engine, initialized once (with the voice chosen) on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                import pyttsx3
+                from core.startup_profile import startup_profile
+
+                start = time.perf_counter()
+                engine = pyttsx3.init()
+                set_deep_male_voice(engine)
+                startup_profile.record_init("tts_engine", (time.perf_counter() - start) * 1000)
+                _engine = engine
+    return _engine
 
 # Wake word variations - supports Hindi, English, and common misspellings
 WAKE_WORDS = [
@@ -58,7 +77,8 @@ def is_exit_command(text):
     return any(cmd in text_lower for cmd in exit_commands)
 
 # Set voice to deep male voice with Hindi support (cross-platform)
-def set_deep_male_voice():
+def set_deep_male_voice(engine=None):
+    engine = engine or get_engine()
     voices = engine.getProperty('voices')
     
     # Platform-specific voice selection
@@ -109,46 +129,68 @@ def set_deep_male_voice():
         engine.setProperty('voice', voices[0].id)
         engine.setProperty('rate', 150)
 
-set_deep_male_voice()
-
-def speak(text):
+def speak(text, priority=NORMAL):
+    """
+    Queue text on the TTS service and return right away (returns a
+    SpeechHandle - call .wait() to block until it has been spoken)
+    """
     if "{" in text and "}" in text and "status" in text:
         text = "Task completed."
     
     # Print first so user sees it even if audio fails
     print(f"JARVIS: {text}")
+    return tts.say(text, priority=priority)
 
-    # Platform-specific TTS handling
-    if sys.platform == "darwin":  # macOS
-        try:
-            # Escape quotes to prevent shell injection/errors
-            clean_text = text.replace('"', '\\"').replace("'", "")
-            # Try Hindi voice (Lekha), fallback to default
-            result = os.system(f'say -v Lekha "{clean_text}" 2>/dev/null')
-            if result == 0:
-                return
-            # Fallback to default voice if Lekha not available
-            os.system(f'say "{clean_text}"')
-            return
-        except Exception as e:
-            print(f"macOS TTS Error: {e}")
-            # Fall through to pyttsx3
+
+def interrupt_speech():
+    """Stop speaking and drop queued speech (new command / user talking)"""
+    tts.interrupt()
+
+
+class SentenceStreamer:
+    """
+    Speaks a streamed reply sentence by sentence.
+    Feed it tokens as the LLM produces them; each complete sentence is
+    queued on the TTS service right away, so speech starts after the
+    first sentence and token generation is never blocked.
+    """
     
-    elif sys.platform == "win32":  # Windows
-        # Use pyttsx3 directly on Windows (works better than system commands)
-        try:
-            engine.say(text)
-            engine.runAndWait()
-            return
-        except Exception as e:
-            print(f"Windows TTS Error: {e}")
+    def __init__(self, speak_fn=None):
+        self.speak_fn = speak_fn
+        self.group = tts.new_group()
+        self.buffer = ""
+        self.handles = []
     
-    # Generic fallback for Linux or other platforms
-    try:
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"TTS Error: {e}")
+    def feed(self, token):
+        """Add streamed text; queue any sentences it completes"""
+        self.buffer += token
+        parts = SENTENCE_END.split(self.buffer)
+        for sentence in parts[:-1]:
+            self._say(sentence)
+        self.buffer = parts[-1]
+    
+    def flush(self, wait=False):
+        """Queue the trailing partial sentence and finish"""
+        self._say(self.buffer)
+        self.buffer = ""
+        if wait:
+            for handle in self.handles:
+                handle.wait()
+    
+    def cancel(self):
+        """Drop sentences not spoken yet (the reply was superseded) and finish"""
+        self.buffer = ""
+        tts.cancel(self.group)
+    
+    def _say(self, sentence):
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        if self.speak_fn:
+            self.speak_fn(sentence)
+        else:
+            self.handles.append(tts.say(sentence, group=self.group))
+
 
 def listen():
     """
@@ -161,107 +203,111 @@ def listen():
     Returns: command text or "none"
     """
     global continuous_mode, last_command_time
+    import speech_recognition as sr
+    from core.audio_capture import microphone
+    from core.recognition import recognizer
+    from core.wake_word import wake_word
+    
+    # Check if continuous mode timed out
+    if continuous_mode and (time.time() - last_command_time) > CONTINUOUS_TIMEOUT:
+        continuous_mode = False
+        print("⏰ Continuous mode timed out. Say 'Jarvis' to activate again.")
     
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        # Check if continuous mode timed out
-        if continuous_mode and (time.time() - last_command_time) > CONTINUOUS_TIMEOUT:
+    if continuous_mode:
+        print("🎤 Listening (continuous mode - no wake word needed)...")
+    else:
+        print("Listening...")
+    
+    try:
+        # The mic stays open between calls; its VAD has already segmented the speech
+        utterance = microphone.next_utterance(timeout=5)
+        if utterance is None:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        
+        # Outside continuous mode the on-device spotter decides whether "Jarvis"
+        # was said at all - other speech never reaches the recognizer
+        spotted = False
+        if not continuous_mode and wake_word.ready:
+            if not wake_word.detect(utterance):
+                print("Ignored (no wake word heard)")
+                return "none"
+            spotted = True
+        
+        print("Recognizing...")
+        
+        # Every configured language runs at once on the same audio; the most
+        # plausible transcript wins (recent winning language first)
+        result = recognizer.recognize(utterance)
+        recognized_text = result.text if result else None
+        if result:
+            print(f"{result.label}: {recognized_text}")
+        
+        if not recognized_text:
+            return "none"
+        
+        # Check for exit command in continuous mode
+        if continuous_mode and is_exit_command(recognized_text):
             continuous_mode = False
-            print("⏰ Continuous mode timed out. Say 'Jarvis' to activate again.")
+            print("✅ Exiting continuous mode. Say 'Jarvis' to activate again.")
+            speak("Continuous mode deactivated.")
+            return "none"
         
-        if continuous_mode:
-            print("🎤 Listening (continuous mode - no wake word needed)...")
-        else:
-            print("Listening...")
+        # Check for wake word
+        has_wake_word, command = detect_wake_word(recognized_text)
+        if spotted and not has_wake_word:
+            wake_word.report_false_alarm()
+        if has_wake_word and not command and wake_word.needs_templates:
+            # A lone "Jarvis" is a clean sample for the on-device spotter
+            wake_word.enroll(utterance)
         
-        r.pause_threshold = 0.8
-        r.adjust_for_ambient_noise(source, duration=1)
-        try:
-            audio = r.listen(source, timeout=5, phrase_time_limit=10)
-            print("Recognizing...")
-            
-            recognized_text = None
-            
-            # Try Hindi recognition first, fallback to English
-            try:
-                query = r.recognize_google(audio, language='hi-IN')
-                print(f"Hindi: {query}")
-                recognized_text = query
-            except:
-                try:
-                    query = r.recognize_google(audio, language='en-IN')
-                    print(f"English: {query}")
-                    recognized_text = query
-                except:
-                    # Final fallback to US English
-                    try:
-                        query = r.recognize_google(audio, language='en-US')
-                        print(f"English (US): {query}")
-                        recognized_text = query
-                    except:
-                        pass
-            
-            if not recognized_text:
-                return "none"
-            
-            # Check for exit command in continuous mode
-            if continuous_mode and is_exit_command(recognized_text):
-                continuous_mode = False
-                print("✅ Exiting continuous mode. Say 'Jarvis' to activate again.")
-                speak("Continuous mode deactivated.")
-                return "none"
-            
-            # Check for wake word
-            has_wake_word, command = detect_wake_word(recognized_text)
+        if continuous_mode:
+            # In continuous mode, accept any command
+            last_command_time = time.time()
             
-            if continuous_mode:
-                # In continuous mode, accept any command
+            # If wake word is present, remove it
+            if has_wake_word and command:
+                print(f"✅ Command: {command}")
+                return command.lower()
+            else:
+                # No wake word, but in continuous mode - accept full text
+                print(f"✅ Command: {recognized_text}")
+                return recognized_text.lower()
+        
+        else:
+            # Not in continuous mode - require wake word
+            if has_wake_word:
+                # Activate continuous mode
+                continuous_mode = True
                 last_command_time = time.time()
                 
-                # If wake word is present, remove it
-                if has_wake_word and command:
-                    print(f"✅ Command: {command}")
+                if command:
+                    print(f"✅ Continuous mode activated! Command: {command}")
+                    print("💡 Ab aap bina 'Jarvis' bole commands de sakte ho (30 sec tak)")
                     return command.lower()
                 else:
-                    # No wake word, but in continuous mode - accept full text
-                    print(f"✅ Command: {recognized_text}")
-                    return recognized_text.lower()
-            
-            else:
-                # Not in continuous mode - require wake word
-                if has_wake_word:
-                    # Activate continuous mode
-                    continuous_mode = True
-                    last_command_time = time.time()
-                    
-                    if command:
-                        print(f"✅ Continuous mode activated! Command: {command}")
-                        print("💡 Ab aap bina 'Jarvis' bole commands de sakte ho (30 sec tak)")
-                        return command.lower()
-                    else:
-                        # Wake word detected but no command
-                        print("✅ Continuous mode activated! Waiting for command...")
-                        print("💡 Ab aap bina 'Jarvis' bole commands de sakte ho (30 sec tak)")
-                        speak("Continuous mode activated. I'm listening.")
-                        return "none"
-                else:
-                    # No wake word detected
-                    print(f"Ignored (no wake word): {recognized_text}")
-                    print("💡 Tip: Say 'Jarvis' pehle, phir command")
+                    # Wake word detected but no command
+                    print("✅ Continuous mode activated! Waiting for command...")
+                    print("💡 Ab aap bina 'Jarvis' bole commands de sakte ho (30 sec tak)")
+                    speak("Continuous mode activated. I'm listening.")
                     return "none"
-            
-        except sr.WaitTimeoutError:
-            if continuous_mode:
-                print("Timeout in continuous mode...")
             else:
-                print("Timeout: No voice detected")
-            return "none"
-        except sr.UnknownValueError:
-            print("Could not understand")
-            return "none"
-        except Exception as e:
-            print(f"Error: {e}")
-            return "none"
+                # No wake word detected
+                print(f"Ignored (no wake word): {recognized_text}")
+                print("💡 Tip: Say 'Jarvis' pehle, phir command")
+                return "none"
+        
+    except sr.WaitTimeoutError:
+        if continuous_mode:
+            print("Timeout in continuous mode...")
+        else:
+            print("Timeout: No voice detected")
+        return "none"
+    except sr.UnknownValueError:
+        print("Could not understand")
+        return "none"
+    except Exception as e:
+        print(f"Error: {e}")
+        return "none"
 
 def reset_continuous_mode():
     """Reset continuous mode (useful for testing or manual reset)"""
@@ -283,18 +329,43 @@ class VoiceAssistant:
     
     def __init__(self):
         """Initialize voice assistant"""
-        self.engine = engine
+        import speech_recognition as sr
+        from core.audio_capture import microphone
+        
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # Shared always-on capture; the device is opened on the first listen()
+        self.microphone = microphone
         
+        # Render fixed phrases while idle so they play without synthesis delay
+        from core.tts import COMMON_PHRASES
+        from core.personal_assistant import PERSONALITY_RESPONSES
+        tts.precache(COMMON_PHRASES + [phrase for phrases in PERSONALITY_RESPONSES.values() for phrase in phrases])
+        
+    @property
+    def engine(self):
+        """pyttsx3 engine (initialized on first use)"""
+        return get_engine()
+    
     def speak(self, text):
-        """Speak text using TTS"""
-        speak(text)
+        """Speak text using TTS (queued - doesn't block)"""
+        return speak(text)
+    
+    def interrupt(self):
+        """Stop speaking right away (a new command arrived)"""
+        interrupt_speech()
+    
+    def sentence_streamer(self):
+        """Create a SentenceStreamer for speaking a streamed reply"""
+        return SentenceStreamer()
     
     def listen(self):
         """Listen for voice input"""
         return listen()
     
+    def stop_listening(self):
+        """Close the microphone (it reopens on the next listen())"""
+        self.microphone.stop()
+    
     def reset_continuous_mode(self):
         """Reset continuous listening mode"""
         reset_continuous_mode()
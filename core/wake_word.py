@@ -0,0 +1,315 @@
+"""
+On-device wake word spotting for JARVIS
+Decides whether an utterance contains "Jarvis" from the audio itself
+(MFCC features + template matching with DTW, plain NumPy), so speech
+near the mic that isn't meant for JARVIS never reaches the cloud
+recognizer.
+
+Templates are the user's own "Jarvis" recordings:
+- Enrolled automatically: while fewer than MIN_TEMPLATES exist, every
+  utterance is transcribed as before, and ones that are just the wake
+  word are kept as templates
+- Or explicitly: python -m core.wake_word enroll
+Until enough templates exist the detector reports not ready and listen()
+keeps using transcription for wake word detection.
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_TEMPLATE_PATH = os.path.expanduser("~/.jarvis_wake_word.npz")
+MIN_TEMPLATES = 3
+MAX_TEMPLATES = 6
+
+SAMPLE_RATE = 16000
+WINDOW = 400        # 25 ms
+HOP = 160           # 10 ms
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 12         # c1..c12; c0 (loudness) is dropped
+MIN_WORD_FRAMES = 20  # 200 ms
+
+
+def _mel_filterbank(sample_rate: int) -> np.ndarray:
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mels = np.linspace(hz_to_mel(60.0), hz_to_mel(sample_rate / 2), N_MELS + 2)
+    bins = np.floor((N_FFT + 1) * mel_to_hz(mels) / sample_rate).astype(int)
+    bank = np.zeros((N_MELS, N_FFT // 2 + 1), dtype=np.float32)
+    for m in range(1, N_MELS + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+def _dct_matrix() -> np.ndarray:
+    n = np.arange(N_MELS)
+    k = np.arange(1, N_MFCC + 1)[:, None]
+    return np.sqrt(2.0 / N_MELS) * np.cos(np.pi * k * (2 * n + 1) / (2 * N_MELS))
+
+
+_FILTERBANK = _mel_filterbank(SAMPLE_RATE)
+_DCT = _dct_matrix()
+_WINDOW = np.hamming(WINDOW).astype(np.float32)
+
+
+def mfcc(samples: np.ndarray, trim: bool = True, normalize: bool = True) -> np.ndarray:
+    """(frames, N_MFCC) MFCCs of 16 kHz int16/float audio, mean-normalized unless normalize=False"""
+    signal = np.asarray(samples, dtype=np.float32)
+    if signal.size < WINDOW:
+        signal = np.pad(signal, (0, WINDOW - signal.size))
+    signal = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+
+    count = 1 + (signal.size - WINDOW) // HOP
+    index = np.arange(WINDOW)[None, :] + HOP * np.arange(count)[:, None]
+    frames = signal[index] * _WINDOW
+
+    if trim:
+        # Drop leading/trailing frames near the noise floor (silence around the word)
+        energy = np.log(np.sum(frames * frames, axis=1) + 1e-6)
+        floor = np.percentile(energy, 10)
+        voiced = np.where(energy > floor + max(2.0, 0.3 * (energy.max() - floor)))[0]
+        # A stray click isn't a word - keep everything when too little stands out
+        if voiced.size and voiced[-1] - voiced[0] >= MIN_WORD_FRAMES:
+            frames = frames[voiced[0]:voiced[-1] + 1]
+
+    power = np.abs(np.fft.rfft(frames, N_FFT)) ** 2 / N_FFT
+    features = np.log(power @ _FILTERBANK.T + 1e-6) @ _DCT.T
+    if normalize:
+        features = features - features.mean(axis=0)
+    return features.astype(np.float32)
+
+
+def local_normalize(features: np.ndarray, width: int) -> np.ndarray:
+    """
+    Subtract a centered moving mean `width` frames wide, so a word inside a
+    longer phrase is normalized like a template of that length on its own
+    """
+    width = max(1, min(width, features.shape[0]))
+    padded = np.pad(features, ((width // 2, width - 1 - width // 2), (0, 0)), mode="edge")
+    totals = np.cumsum(np.vstack([np.zeros((1, features.shape[1])), padded]), axis=0)
+    means = (totals[width:] - totals[:-width]) / width
+    return (features - means).astype(np.float32)
+
+
+def dtw_distance(template: np.ndarray, features: np.ndarray) -> float:
+    """
+    Best match of the template anywhere inside features (subsequence DTW),
+    as average frame distance. Steps let the spoken word run between half
+    and twice the template's speed.
+    """
+    m = template.shape[0]
+    if features.shape[0] < max(2, m // 2):
+        return float("inf")
+    cost = np.sqrt(((template[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+
+    previous = cost[0].copy()           # a match may start at any frame
+    for i in range(1, m):
+        best = previous.copy()                          # (i-1, j)
+        best[1:] = np.minimum(best[1:], previous[:-1])  # (i-1, j-1)
+        best[2:] = np.minimum(best[2:], previous[:-2])  # (i-1, j-2)
+        previous = cost[i] + best
+    return float(previous.min() / m)
+
+
+class WakeWordDetector:
+    """
+    Usage:
+        from core.wake_word import wake_word
+
+        if wake_word.ready and not wake_word.detect(utterance):
+            ...   # not for JARVIS - skip speech recognition
+        wake_word.enroll(utterance)   # a recording of just "Jarvis"
+    """
+
+    def __init__(self, path: Optional[str] = None, margin: float = 1.25):
+        """
+        Args:
+            path: Where templates are stored (JARVIS_WAKE_WORD_PATH)
+            margin: Detection threshold as a multiple of the typical distance
+                between the user's own templates
+        """
+        self.path = os.path.expanduser(path or os.environ.get("JARVIS_WAKE_WORD_PATH", DEFAULT_TEMPLATE_PATH))
+        self.enabled = os.environ.get("JARVIS_WAKE_WORD", "1") != "0"
+        self.margin = margin
+
+        self.templates: List[np.ndarray] = []
+        # Each template's whole enrollment utterance (silence included), to calibrate against
+        self.recordings: List[np.ndarray] = []
+        self.threshold: Optional[float] = None
+        self.stats = {"checked": 0, "detected": 0, "rejected": 0, "false_alarms": 0, "enrolled": 0}
+
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Templates
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+            try:
+                with np.load(self.path) as data:
+                    count = sum(1 for key in data.files if key.startswith("t"))
+                    self.templates = [data[f"t{index}"] for index in range(count)]
+                    self.recordings = [data[f"r{index}"] for index in range(count)]
+                self._update_threshold()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  Wake word templates unreadable ({e}) - re-enrolling")
+                self.templates = []
+                self.recordings = []
+
+    def _save(self):
+        try:
+            with open(self.path, "wb") as f:
+                arrays = {f"t{index}": template for index, template in enumerate(self.templates)}
+                arrays.update({f"r{index}": recording for index, recording in enumerate(self.recordings)})
+                np.savez(f, **arrays)
+        except OSError as e:
+            print(f"⚠️  Could not save wake word templates: {e}")
+
+    def _update_threshold(self):
+        if len(self.templates) < 2:
+            self.threshold = None
+            return
+        # Each template against the other enrollment recordings, scored the way
+        # detect() scores live audio so the threshold fits it
+        distances = [self._distance(template, recording) for i, template in enumerate(self.templates)
+                     for j, recording in enumerate(self.recordings) if i != j]
+        distances = [d for d in distances if np.isfinite(d)]
+        self.threshold = float(np.median(distances)) * self.margin if distances else None
+
+    @property
+    def ready(self) -> bool:
+        """True once enough templates exist for on-device detection"""
+        self._load()
+        return self.enabled and len(self.templates) >= MIN_TEMPLATES and self.threshold is not None
+
+    @property
+    def needs_templates(self) -> bool:
+        self._load()
+        return self.enabled and len(self.templates) < MAX_TEMPLATES
+
+    def enroll(self, utterance) -> bool:
+        """Add a recording of just the wake word as a template"""
+        self._load()
+        samples = utterance.samples()
+        if samples.size < SAMPLE_RATE // 4 or samples.size > SAMPLE_RATE * 2:
+            return False  # not a lone "Jarvis"
+        features = mfcc(samples, normalize=False)
+        if features.shape[0] < MIN_WORD_FRAMES:
+            return False
+        with self._lock:
+            self.templates.append(features)
+            self.recordings.append(mfcc(samples, trim=False, normalize=False))
+            # Keep the newest - the user's voice, mic and room drift over time
+            self.templates = self.templates[-MAX_TEMPLATES:]
+            self.recordings = self.recordings[-MAX_TEMPLATES:]
+            self._update_threshold()
+            self._save()
+            self.stats["enrolled"] += 1
+        if len(self.templates) == MIN_TEMPLATES:
+            print("✅ Wake word learned - 'Jarvis' is now detected on-device")
+        return True
+
+    def reset(self):
+        with self._lock:
+            self.templates = []
+            self.recordings = []
+            self.threshold = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+
+    def score(self, utterance) -> float:
+        """Distance to the closest template (lower = more like "Jarvis")"""
+        self._load()
+        features = mfcc(utterance.samples(), trim=False, normalize=False)
+        return min((self._distance(template, features) for template in self.templates), default=float("inf"))
+
+    @staticmethod
+    def _distance(template: np.ndarray, features: np.ndarray) -> float:
+        """Templates and audio are stored raw; each side is mean-normalized over the template's length"""
+        return dtw_distance(template - template.mean(axis=0), local_normalize(features, template.shape[0]))
+
+    def detect(self, utterance) -> bool:
+        """True if the utterance contains the wake word (always True when not ready)"""
+        if not self.ready:
+            return True
+        detected = self.score(utterance) <= self.threshold
+        self.stats["checked"] += 1
+        self.stats["detected" if detected else "rejected"] += 1
+        return detected
+
+    def report_false_alarm(self):
+        """The spotter fired but the transcript had no wake word"""
+        self.stats["false_alarms"] += 1
+
+    def get_stats(self) -> Dict:
+        self._load()
+        return {
+            **self.stats,
+            "templates": len(self.templates),
+            "threshold": round(self.threshold, 2) if self.threshold is not None else None,
+            "ready": self.ready,
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    """python -m core.wake_word [enroll|test|reset]"""
+    # Under `python -m` this file is __main__; use the instances the rest of core sees
+    from core.wake_word import wake_word
+    from core.audio_capture import microphone
+
+    command = (argv if argv is not None else sys.argv[1:]) or ["test"]
+    if command[0] == "reset":
+        wake_word.reset()
+        print("✅ Wake word templates removed")
+        return
+
+    if command[0] == "enroll":
+        print(f"🎤 Say 'Jarvis' {MIN_TEMPLATES} times, pausing after each")
+        while len(wake_word.templates) < MIN_TEMPLATES:
+            utterance = microphone.next_utterance(timeout=10)
+            if utterance is None:
+                continue
+            if wake_word.enroll(utterance):
+                print(f"   ✅ Sample {len(wake_word.templates)} recorded ({utterance.duration:.1f}s)")
+            else:
+                print("   ⚠️  Say only 'Jarvis' (that was too short or too long)")
+        return
+
+    print("🎤 Speak - each utterance is scored against the wake word (Ctrl+C to stop)")
+    print(f"   Stats: {wake_word.get_stats()}")
+    while True:
+        utterance = microphone.next_utterance(timeout=None)
+        score = wake_word.score(utterance)
+        hit = wake_word.ready and score <= wake_word.threshold
+        print(f"   {'✅ Jarvis' if hit else '·  other '}  distance {score:.2f}  ({utterance.duration:.1f}s)")
+
+
+# Global instance (templates are loaded on first use)
+wake_word = WakeWordDetector()
+
+
+if __name__ == "__main__":
+    main()
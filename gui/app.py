@@ -14,6 +14,7 @@ import os
 import time
 import threading
 import json
+from concurrent.futures import CancelledError
 from pathlib import Path
 
 # Add parent directory to path
@@ -26,15 +27,28 @@ except ImportError as e:
     print(f"Installing tkinter...")
     sys.exit(1)
 
-# Import JARVIS core components
-try:
-    from core.registry import SkillRegistry
-    from core.engine import JarvisEngine
-    from core.voice import VoiceAssistant
-    JARVIS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ JARVIS core not available: {e}")
-    JARVIS_AVAILABLE = False
+from core.startup_profile import startup_profile
+from core.tracing import tracer
+
+# JARVIS core components are imported by _load_core() on the init thread,
+# so the window is drawn before ollama/numpy and the skills are loaded
+SkillRegistry = JarvisEngine = VoiceAssistant = None
+JARVIS_AVAILABLE = False
+
+
+def _load_core() -> bool:
+    """Import the engine, registry and voice modules (slow - call off the UI thread)"""
+    global SkillRegistry, JarvisEngine, VoiceAssistant, JARVIS_AVAILABLE
+    try:
+        from core.registry import SkillRegistry
+        from core.engine import JarvisEngine
+        from core.voice import VoiceAssistant
+        JARVIS_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ JARVIS core not available: {e}")
+        JARVIS_AVAILABLE = False
+    startup_profile.mark("core imported")
+    return JARVIS_AVAILABLE
 
 
 class JarvisGUI:
@@ -51,6 +65,10 @@ class JarvisGUI:
         self.engine = None
         self.voice = None
         self.listening = False
+        self.initialized = False
+        self.processing = False
+        # Latest (state, detail) from the engine's model manager
+        self.model_state = None
         
         # Config
         self.config_file = Path.home() / ".jarvis_config.json"
@@ -92,19 +110,20 @@ class JarvisGUI:
     def _init_jarvis(self):
         """Initialize JARVIS engine"""
         try:
-            if not JARVIS_AVAILABLE:
+            if not _load_core():
                 self.add_message("SYSTEM", "⚠️ JARVIS core not available. Running in demo mode.", "error")
                 self.update_status("Demo Mode", "#ff8800")
                 return
             
             # Initialize registry
             self.add_message("SYSTEM", "📦 Loading skills...", "system")
-            self.registry = SkillRegistry()
+            self.registry = SkillRegistry(lazy=True)
             
             # Load skills from skill folder
             skills_dir = Path(__file__).parent.parent / "skill"
             if skills_dir.exists():
                 self.registry.load_skills(str(skills_dir))
+            startup_profile.mark("skills loaded")
             
             # Get stats
             self.stats['total_skills'] = len(self.registry.list_skills())
@@ -113,6 +132,13 @@ class JarvisGUI:
             # Initialize engine
             self.add_message("SYSTEM", "🧠 Initializing AI engine...", "system")
             self.engine = JarvisEngine(self.registry)
+            startup_profile.mark("engine ready")
+            
+            # The model warms up in the background; show its progress
+            if self.engine.model_manager:
+                self.engine.model_manager.add_listener(
+                    lambda state, detail: self.root.after(0, self._on_model_state, state, detail)
+                )
             
             # Initialize voice
             try:
@@ -132,12 +158,16 @@ class JarvisGUI:
             if self.voice:
                 self.voice.speak("JARVIS ready! How can I help you?")
             
-            self.update_status("Ready", "#00ff00")
+            self.initialized = True
+            self.root.after(0, self._show_idle_status)
             
         except Exception as e:
             error_msg = f"❌ Initialization failed: {str(e)}\n\n💡 Make sure Ollama is running:\n   ollama serve"
             self.add_message("SYSTEM", error_msg, "error")
             self.update_status("Error", "#ff4444")
+        
+        finally:
+            startup_profile.finish("init finished")
     
     def _create_gui(self):
         """Create GUI interface"""
@@ -399,6 +429,7 @@ class JarvisGUI:
 🛠️  Total Tools: {self.stats['total_tools']}
 📊 Queries Processed: {self.stats['queries_processed']}
 ✅ Success Rate: {self.stats['success_rate']:.1f}%
+🧠 Model: {self._model_summary()}
 
 ╔══════════════════════════╗
 ║   LOADED SKILLS          ║
@@ -408,6 +439,27 @@ class JarvisGUI:
         if self.registry:
             for skill_name in self.registry.list_skills():
                 info_text += f"✓ {skill_name}\n"
+            
+            info_text += f"""
+╔══════════════════════════╗
+║   SKILL LOAD TIMES       ║
+╚══════════════════════════╝
+
+⏱️  Total: {self.registry.load_report.wall_ms:.0f} ms
+"""
+            for line in self.registry.load_report.format_lines():
+                info_text += f"• {line}\n"
+        
+        stages = tracer.stage_stats() if JARVIS_AVAILABLE else {}
+        if stages:
+            info_text += f"""
+╔══════════════════════════╗
+║   STAGE LATENCY p50/p95  ║
+╚══════════════════════════╝
+
+"""
+            for stage, stat in sorted(stages.items(), key=lambda item: -item[1]['p95_ms']):
+                info_text += f"• {stage}: {stat['p50_ms']:.0f} / {stat['p95_ms']:.0f} ms ({stat['count']}x)\n"
         
         self.info_display.delete('1.0', tk.END)
         self.info_display.insert('1.0', info_text)
@@ -591,6 +643,33 @@ class JarvisGUI:
         self.chat_display.insert(tk.END, f"{message}\n\n", msg_type)
         self.chat_display.see(tk.END)
     
+    def _on_model_state(self, state, detail):
+        """Model manager state change (runs on the Tk thread)"""
+        self.model_state = (state, detail)
+        if self.initialized:
+            self._update_stats_display()
+            if not self.processing:
+                self._show_idle_status()
+    
+    def _model_summary(self):
+        """One-line model state for the info panel"""
+        if not self.engine or not self.engine.model_manager:
+            return "not available"
+        status = self.engine.model_manager.status()
+        if status['state'] == "ready" and status['load_ms']:
+            return f"{status['model']} ready (loaded in {status['load_ms'] / 1000:.1f}s)"
+        return f"{status['model']} {status['state']} {status['detail']}".strip()
+    
+    def _show_idle_status(self):
+        """Status when no command is running: Ready, or what the model is doing"""
+        state, detail = self.model_state or ("ready", "")
+        if state == "ready":
+            self.update_status("Ready", "#00ff00")
+        elif state == "offline":
+            self.update_status("Ollama offline - limited mode", "#ff8800")
+        else:
+            self.update_status(detail or "Loading model...", "#ff8800")
+    
     def update_status(self, status, color):
         """Update status indicator"""
         self.status_label.config(text=status, fg=color)
@@ -632,17 +711,26 @@ class JarvisGUI:
     
     def execute_command(self, query):
         """Execute command through JARVIS engine"""
+        if self.voice:
+            # Barge-in: stop reading out the previous reply
+            self.voice.interrupt()
+        self.processing = True
         self.update_status("Processing...", "#ff8800")
         
         def _execute():
+            superseded = False
             try:
                 if not self.engine:
                     response = "⚠️ JARVIS engine not initialized. Please wait..."
                     self.add_message("JARVIS", response, "error")
                     return
                 
-                # Process through engine
-                response = self.engine.process_query(query)
+                # Process through engine; a newer command cancels this one
+                try:
+                    response = self.engine.submit_query(query).result()
+                except CancelledError:
+                    superseded = True
+                    return
                 
                 # Update stats
                 self.stats['queries_processed'] += 1
@@ -660,15 +748,20 @@ class JarvisGUI:
                 self.add_message("JARVIS", error_msg, "error")
                 self.stats['success_rate'] = (self.stats['success_rate'] * 0.9)  # Decrease success rate
             finally:
-                self.update_status("Ready", "#00ff00")
+                if not superseded:
+                    self.processing = False
+                    self.root.after(0, self._show_idle_status)
         
         threading.Thread(target=_execute, daemon=True).start()
 
 
 def main():
-    """Main entry point"""
+    """Main entry point (--profile-startup prints a startup time breakdown)"""
+    startup_profile.enable_from_argv()
     root = tk.Tk()
     app = JarvisGUI(root)
+    # First idle callback after mainloop starts = the window has been drawn
+    root.after_idle(startup_profile.mark, "window shown")
     root.mainloop()
 
 
@@ -17,6 +17,7 @@ import time
 import threading
 import queue
 import json
+from concurrent.futures import CancelledError
 from pathlib import Path
 from datetime import datetime
 
@@ -30,15 +31,28 @@ except ImportError:
     print("Installing tkinter...")
     sys.exit(1)
 
-# Import JARVIS core components
-try:
-    from core.registry import SkillRegistry
-    from core.engine import JarvisEngine
-    from core.voice import VoiceAssistant
-    JARVIS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ JARVIS core not available: {e}")
-    JARVIS_AVAILABLE = False
+from core.startup_profile import startup_profile
+from core.tracing import tracer
+
+# JARVIS core components are imported by _load_core() on the init thread,
+# so the window is drawn before ollama/numpy and the skills are loaded
+SkillRegistry = JarvisEngine = VoiceAssistant = None
+JARVIS_AVAILABLE = False
+
+
+def _load_core() -> bool:
+    """Import the engine, registry and voice modules (slow - call off the UI thread)"""
+    global SkillRegistry, JarvisEngine, VoiceAssistant, JARVIS_AVAILABLE
+    try:
+        from core.registry import SkillRegistry
+        from core.engine import JarvisEngine
+        from core.voice import VoiceAssistant
+        JARVIS_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ JARVIS core not available: {e}")
+        JARVIS_AVAILABLE = False
+    startup_profile.mark("core imported")
+    return JARVIS_AVAILABLE
 
 
 class ModernJarvisGUI:
@@ -59,6 +73,9 @@ class ModernJarvisGUI:
         self.engine = None
         self.voice = None
         self.listening = False
+        self.initialized = False
+        # Latest (state, detail) from the engine's model manager
+        self.model_state = None
         
         # Conversation history
         self.conversation_history = []
@@ -73,6 +90,7 @@ class ModernJarvisGUI:
             'total_tools': 0,
             'queries_processed': 0,
             'success_rate': 100.0,
+            'skill_load_ms': 0.0,
             'session_start': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
@@ -245,6 +263,12 @@ class ModernJarvisGUI:
         self._create_stat_item("Tools Available", "0", "🔧")
         self._create_stat_item("Queries Processed", "0", "💬")
         self._create_stat_item("Success Rate", "100%", "✅")
+        self._create_stat_item("Skill Load Time", "0 ms", "⏱️")
+        self._create_stat_item("Model", "–", "📦")
+        # p50 / p95 wall time per stage, from the tracer
+        self._create_stat_item("Turn Latency", "–", "⌛")
+        self._create_stat_item("LLM Latency", "–", "🧠")
+        self._create_stat_item("Tool Latency", "–", "🛠️")
         
         # Separator
         tk.Frame(right_panel, bg='#2a2a2a', height=1).pack(fill=tk.X, padx=15, pady=15)
@@ -400,27 +424,41 @@ class ModernJarvisGUI:
     def _init_jarvis(self):
         """Initialize JARVIS engine"""
         try:
-            if not JARVIS_AVAILABLE:
+            if not _load_core():
                 self.add_message("SYSTEM", "⚠️ JARVIS core not available. Running in demo mode.", "error")
                 self.update_status("Demo Mode", "#ff8800")
                 return
             
             # Initialize registry
             self.add_message("SYSTEM", "📦 Loading skills...", "system")
-            self.registry = SkillRegistry()
+            self.registry = SkillRegistry(lazy=True)
             
             # Load skills from skill folder
             skills_dir = Path(__file__).parent.parent / "skill"
             if skills_dir.exists():
                 self.registry.load_skills(str(skills_dir))
+            startup_profile.mark("skills loaded")
             
             # Get stats
             self.stats['total_skills'] = len(self.registry.list_skills())
             self.stats['total_tools'] = len(self.registry.list_tools())
+            self.stats['skill_load_ms'] = self.registry.load_report.wall_ms
+            
+            # Show slowest / failed skills so startup cost is visible
+            report_lines = self.registry.load_report.format_lines()
+            if report_lines:
+                self.add_message("SYSTEM", "⏱️ Skill load report:\n" + "\n".join(report_lines), "system")
             
             # Initialize engine
             self.add_message("SYSTEM", "🧠 Initializing AI engine...", "system")
             self.engine = JarvisEngine(self.registry)
+            startup_profile.mark("engine ready")
+            
+            # The model warms up in the background; show its progress
+            if self.engine.model_manager:
+                self.engine.model_manager.add_listener(
+                    lambda state, detail: self.root.after(0, self._on_model_state, state, detail)
+                )
             
             # Initialize voice
             try:
@@ -437,23 +475,28 @@ class ModernJarvisGUI:
             self.add_message("JARVIS", welcome, "jarvis")
             
             if self.voice:
-                threading.Thread(
-                    target=lambda: self.voice.speak("JARVIS ready! How can I help you?"),
-                    daemon=True
-                ).start()
+                self.voice.speak("JARVIS ready! How can I help you?")
             
-            self.update_status("Ready", "#00ff88")
+            self.initialized = True
+            self.root.after(0, self._show_idle_status)
             
         except Exception as e:
             error_msg = f"❌ Initialization failed: {str(e)}\n\n💡 Make sure Ollama is running:\n   ollama serve"
             self.add_message("SYSTEM", error_msg, "error")
             self.update_status("Error", "#ff4444")
+        
+        finally:
+            startup_profile.finish("init finished")
     
     def _process_commands(self):
         """Background thread for processing commands"""
         while True:
             try:
                 command = self.command_queue.get()
+                # Only the newest command matters - skip ones it superseded
+                while not self.command_queue.empty():
+                    command = self.command_queue.get_nowait()
+                self.processing = True
                 if command:
                     self._execute_command(command)
             except Exception as e:
@@ -476,19 +519,32 @@ class ModernJarvisGUI:
             # Display user message
             self.add_message("You", command, "user")
             
-            # Get AI response
+            # Get AI response, rendering and speaking it as it streams in
             if self.engine:
-                response = self.engine.process_query(command)
+                streamer = None
+                if self.voice and self.config.get('voice_enabled', True):
+                    streamer = self.voice.sentence_streamer()
                 
-                # Display JARVIS response
-                self.add_message("JARVIS", response, "jarvis")
+                self.root.after(0, self._begin_stream_message, "JARVIS", "jarvis")
                 
-                # Speak response if voice enabled
-                if self.voice and self.config.get('voice_enabled', True):
-                    threading.Thread(
-                        target=lambda: self.voice.speak(response),
-                        daemon=True
-                    ).start()
+                def on_token(token):
+                    self.root.after(0, self._append_stream_text, token)
+                    if streamer:
+                        streamer.feed(token)
+                
+                try:
+                    # Runs on the engine's event loop; a newer command cancels it
+                    self.engine.submit_query(command, on_token=on_token).result()
+                except CancelledError:
+                    self.root.after(0, self._append_stream_text, "\n⏹️ Stopped for your new command")
+                    if streamer:
+                        streamer.cancel()
+                        streamer = None
+                    return
+                finally:
+                    self.root.after(0, self._append_stream_text, "\n\n")
+                    if streamer:
+                        streamer.flush()
                 
                 # Update stats
                 self.stats['queries_processed'] += 1
@@ -496,7 +552,7 @@ class ModernJarvisGUI:
             else:
                 self.add_message("JARVIS", "Engine not initialized yet. Please wait...", "error")
             
-            self.update_status("Ready", "#00ff88")
+            self.root.after(0, self._show_idle_status)
             
         except Exception as e:
             self.add_message("SYSTEM", f"❌ Execution error: {str(e)}", "error")
@@ -506,10 +562,19 @@ class ModernJarvisGUI:
         """Send command from input"""
         command = self.input_entry.get().strip()
         
-        if command and command != "Type your command here..." and not self.processing:
-            self.processing = True
+        if command and command != "Type your command here...":
             self.input_entry.delete(0, tk.END)
-            self.command_queue.put(command)
+            self._queue_command(command)
+    
+    def _queue_command(self, command):
+        """Queue a command; one still running is cancelled instead of making this one wait"""
+        if self.processing and self.engine:
+            self.engine.cancel_current()
+        if self.voice:
+            # Barge-in: stop reading out the previous reply
+            self.voice.interrupt()
+        self.processing = True
+        self.command_queue.put(command)
     
     def _toggle_voice(self):
         """Toggle voice listening"""
@@ -535,7 +600,7 @@ class ModernJarvisGUI:
             command = self.voice.listen()
             
             if command:
-                self.command_queue.put(command)
+                self._queue_command(command)
             else:
                 self.add_message("SYSTEM", "⚠️ No voice detected", "error")
         except Exception as e:
@@ -567,11 +632,56 @@ class ModernJarvisGUI:
         self.chat_display.config(state='disabled')
         self.chat_display.see(tk.END)
     
+    def _begin_stream_message(self, sender, msg_type):
+        """Start a chat message whose text arrives incrementally"""
+        self.chat_display.config(state='normal')
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.chat_display.insert(tk.END, f"[{timestamp}] ", 'timestamp')
+        self.chat_display.insert(tk.END, f"🤖 {sender}: ", msg_type)
+        self.chat_display.config(state='disabled')
+        self.chat_display.see(tk.END)
+    
+    def _append_stream_text(self, text):
+        """Append streamed text to the message started by _begin_stream_message"""
+        self.chat_display.config(state='normal')
+        self.chat_display.insert(tk.END, text)
+        self.chat_display.config(state='disabled')
+        self.chat_display.see(tk.END)
+    
     def update_status(self, text, color):
         """Update status indicator"""
         self.status_label.config(text=text)
         self.status_indicator.config(fg=color)
     
+    def _on_model_state(self, state, detail):
+        """Model manager state change (runs on the Tk thread)"""
+        self.model_state = (state, detail)
+        
+        if state == "ready":
+            load_ms = self.engine.model_manager.load_ms if self.engine and self.engine.model_manager else None
+            text = f"Ready · {load_ms / 1000:.1f}s" if load_ms else "Ready"
+        elif state == "pulling" and detail.endswith("%"):
+            text = f"Downloading {detail.rsplit(' ', 1)[-1]}"
+        else:
+            text = state.capitalize()
+        try:
+            self.stat_model.config(text=text)
+        except:
+            pass
+        
+        if self.initialized and not self.processing:
+            self._show_idle_status()
+    
+    def _show_idle_status(self):
+        """Status when no command is running: Ready, or what the model is doing"""
+        state, detail = self.model_state or ("ready", "")
+        if state == "ready":
+            self.update_status("Ready", "#00ff88")
+        elif state == "offline":
+            self.update_status("⚠️ Ollama offline - limited mode", "#ff8800")
+        else:
+            self.update_status(f"🔄 {detail or 'Loading model...'}", "#ff8800")
+    
     def _update_stats_display(self):
         """Update statistics display"""
         try:
@@ -579,6 +689,15 @@ class ModernJarvisGUI:
             self.stat_tools_available.config(text=str(self.stats['total_tools']))
             self.stat_queries_processed.config(text=str(self.stats['queries_processed']))
             self.stat_success_rate.config(text=f"{self.stats['success_rate']:.1f}%")
+            self.stat_skill_load_time.config(text=f"{self.stats['skill_load_ms']:.0f} ms")
+            
+            stages = tracer.stage_stats()
+            for stage, widget in (("turn", self.stat_turn_latency),
+                                  ("llm", self.stat_llm_latency),
+                                  ("tool", self.stat_tool_latency)):
+                stat = stages.get(stage)
+                if stat:
+                    widget.config(text=f"p50 {stat['p50_ms']:.0f} · p95 {stat['p95_ms']:.0f} ms")
         except:
             pass
     
@@ -591,18 +710,18 @@ class ModernJarvisGUI:
     
     # Quick action methods
     def _quick_youtube(self):
-        self.command_queue.put("open youtube")
+        self._queue_command("open youtube")
     
     def _quick_browser(self):
-        self.command_queue.put("open browser")
+        self._queue_command("open browser")
     
     def _quick_movies(self):
-        self.command_queue.put("search movies")
+        self._queue_command("search movies")
     
     def _quick_search(self):
         query = self.input_entry.get().strip()
         if query and query != "Type your command here...":
-            self.command_queue.put(f"search {query}")
+            self._queue_command(f"search {query}")
         else:
             self.add_message("SYSTEM", "⚠️ Enter search query first", "error")
     
@@ -649,9 +768,12 @@ class ModernJarvisGUI:
 
 
 def main():
-    """Main entry point"""
+    """Main entry point (--profile-startup prints a startup time breakdown)"""
+    startup_profile.enable_from_argv()
     root = tk.Tk()
     app = ModernJarvisGUI(root)
+    # First idle callback after mainloop starts = the window has been drawn
+    root.after_idle(startup_profile.mark, "window shown")
     root.mainloop()
 
 
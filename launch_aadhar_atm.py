@@ -9,6 +9,7 @@ Simple interface for automated Aadhar ATM withdrawal
 import importlib.util
 import re
 import sys
+import threading
 import tkinter as tk
 from tkinter import messagebox
 from pathlib import Path
@@ -16,9 +17,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from skill.aadhar_atm_skill import AadharATMSkill
-
-SKILL_AVAILABLE = True
+from core.startup_profile import startup_profile
 
 
 def _module_available(module_name: str) -> bool:
@@ -65,14 +64,25 @@ class AadharATMGUI:
         self.root.configure(bg='#0d1117')
         self.root.resizable(False, False)
         
-        # Initialize skill
-        if SKILL_AVAILABLE:
-            self.skill = AadharATMSkill()
-        else:
-            self.skill = None
+        # The skill (pyautogui, OpenCV, OCR) is loaded on the first withdrawal
+        self._skill = None
+        self._skill_error = None
+        self._cancel_event = None
         
         self._create_gui()
     
+    @property
+    def skill(self):
+        """AadharATMSkill, imported on first use (None if it can't be loaded)"""
+        if self._skill is None and self._skill_error is None:
+            try:
+                from skill.aadhar_atm_skill import AadharATMSkill
+                self._skill = AadharATMSkill()
+            except Exception as e:
+                self._skill_error = e
+                print(f"⚠️  Aadhar ATM skill not available: {e}")
+        return self._skill
+    
     def _create_gui(self):
         """Create GUI interface"""
         
@@ -236,8 +246,8 @@ class AadharATMGUI:
         )
         instructions.pack(pady=(20, 0))
         
-        # Check if skill is available
-        if not SKILL_AVAILABLE:
+        # Check if skill is available (located, not imported - that happens on first use)
+        if not _module_available("skill.aadhar_atm_skill"):
             self.status_label.config(
                 text="⚠️ Skill not loaded. Install dependencies first.",
                 fg='#f85149'
@@ -308,49 +318,96 @@ class AadharATMGUI:
         if not confirm:
             return
         
-        # Disable button
-        self.start_btn.config(state='disabled', bg='#6e7681')
+        # Run on a worker thread so the window keeps repainting; the Start
+        # button becomes Cancel until the run finishes
+        self._cancel_event = threading.Event()
+        self.start_btn.config(text="⏹ Cancel", bg='#da3633', command=self._cancel_withdrawal)
+        self.voice_btn.config(state='disabled')
         self.status_label.config(
             text="🔄 Processing... Screen dekh raha hoon...",
             fg='#f0883e'
         )
-        self.root.update()
-        
-        # Execute withdrawal
+        threading.Thread(
+            target=self._run_withdrawal,
+            args=(aadhar, amount),
+            name="aadhar-withdrawal",
+            daemon=True
+        ).start()
+    
+    def _run_withdrawal(self, aadhar, amount):
+        """Worker thread: every UI update goes back through root.after()"""
+        result, error = None, None
         try:
             if self.skill:
-                result = self.skill.aadhar_withdraw_money(aadhar, amount)
-                
-                # Show result
-                messagebox.showinfo("Result", result)
-                
-                if "✅" in result:
-                    self.status_label.config(
-                        text=f"✅ Success! ₹{amount} nikla hai!",
-                        fg='#3fb950'
-                    )
-                else:
-                    self.status_label.config(
-                        text="⚠️ Check result message",
-                        fg='#f0883e'
-                    )
-            else:
-                messagebox.showerror("Error", "Skill not available!")
-                
+                result = self.skill.aadhar_withdraw_money(
+                    aadhar, amount,
+                    progress=lambda event: self.root.after(0, self._on_progress, event),
+                    cancel_event=self._cancel_event
+                )
         except Exception as e:
-            messagebox.showerror("Error", f"Error: {str(e)}")
+            error = e
+        self.root.after(0, self._on_withdrawal_done, amount, result, error)
+    
+    def _on_progress(self, event):
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            return  # keep showing "Cancelling..."
+        self.status_label.config(
+            text=f"{event['message']}  ({event['elapsed_ms'] / 1000:.1f}s)",
+            fg='#f0883e'
+        )
+    
+    def _cancel_withdrawal(self):
+        """Stops the run at its next step or wait"""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        self.start_btn.config(state='disabled', bg='#6e7681')
+        self.status_label.config(text="⏹️ Cancelling...", fg='#f0883e')
+    
+    def _on_withdrawal_done(self, amount, result, error):
+        cancelled = self._cancel_event is not None and self._cancel_event.is_set()
+        self._cancel_event = None
+        
+        # Restore the Start button
+        self.start_btn.config(
+            text="🚀 Start Auto Withdrawal",
+            state='normal',
+            bg='#238636',
+            command=self._start_withdrawal
+        )
+        self.voice_btn.config(state='normal')
+        
+        if error is not None:
+            messagebox.showerror("Error", f"Error: {str(error)}")
             self.status_label.config(
-                text=f"❌ Error: {str(e)[:50]}",
+                text=f"❌ Error: {str(error)[:50]}",
                 fg='#f85149'
             )
+            return
+        
+        if result is None:
+            messagebox.showerror("Error", "Skill not available!")
+            return
+        
+        # Show result
+        messagebox.showinfo("Result", result)
         
-        finally:
-            # Re-enable button
-            self.start_btn.config(state='normal', bg='#238636')
+        if cancelled or result.startswith("⏹️"):
+            self.status_label.config(text="⏹️ Withdrawal cancelled", fg='#8b949e')
+        elif result.startswith("🏧"):
+            self.status_label.config(
+                text=f"✅ Success! ₹{amount} nikla hai!",
+                fg='#3fb950'
+            )
+        else:
+            self.status_label.config(
+                text="⚠️ Check result message",
+                fg='#f0883e'
+            )
 
 
 def main():
-    """Main entry point"""
+    """Main entry point (--profile-startup prints a startup time breakdown)"""
+    startup_profile.enable_from_argv()
     
     print("\n" + "="*60)
     print("🏧 Aadhar ATM - Auto Withdrawal Agent")
@@ -398,6 +455,8 @@ def main():
     # Launch GUI
     root = tk.Tk()
     app = AadharATMGUI(root)
+    # First idle callback after mainloop starts = the window has been drawn
+    root.after_idle(startup_profile.finish, "window shown")
     root.mainloop()
 
 
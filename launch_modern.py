@@ -8,44 +8,45 @@ Quick launcher for the enhanced modern interface
 
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# --profile-startup: print an import/phase time breakdown once JARVIS is ready
+from core.startup_profile import startup_profile
+startup_profile.enable_from_argv()
+
 print("=" * 70)
 print("🤖 JARVIS - Modern AI Assistant")
 print("=" * 70)
 print()
 
-# Check dependencies
+# Check dependencies (find_spec only locates them - importing pyttsx3 etc. here would slow startup)
 print("📦 Checking dependencies...")
-try:
-    import tkinter
+if importlib.util.find_spec("tkinter"):
     print("   ✅ tkinter available")
-except ImportError:
+else:
     print("   ❌ tkinter not found")
     print("   💡 Install: sudo apt-get install python3-tk (Linux)")
     sys.exit(1)
 
-try:
-    import requests
+if importlib.util.find_spec("requests"):
     print("   ✅ requests available")
-except ImportError:
+else:
     print("   ⚠️  Installing requests...")
     os.system(f"{sys.executable} -m pip install requests")
 
-try:
-    import pyttsx3
+if importlib.util.find_spec("pyttsx3"):
     print("   ✅ pyttsx3 available")
-except ImportError:
+else:
     print("   ⚠️  Installing pyttsx3...")
     os.system(f"{sys.executable} -m pip install pyttsx3")
 
-try:
-    import speech_recognition
+if importlib.util.find_spec("speech_recognition"):
     print("   ✅ speech_recognition available")
-except ImportError:
+else:
     print("   ⚠️  Installing speech_recognition...")
     os.system(f"{sys.executable} -m pip install SpeechRecognition")
 
@@ -10,8 +10,9 @@ import importlib.util
 import sys
 import time
 import re
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -33,14 +34,22 @@ else:
     pytesseract = None
 
 from core.skill import Skill
+from core.llm_cache import llm_cache, KEEP_ALIVE
+
+
+class WithdrawalCancelled(Exception):
+    """Raised inside aadhar_withdraw_money when its cancel_event is set"""
 
 
 class AadharATMSkill(Skill):
     """AI Agent for Aadhar ATM automation with screen reading"""
     
+    serial = True  # Drives the ATM screen with mouse/keyboard - steps must stay in order
+    
     def __init__(self):
         self.aadhar_number = None
         self.withdrawal_amount = None
+        self._cancel_event: Optional[threading.Event] = None
         
         # Configure pyautogui
         if pyautogui:
@@ -164,10 +173,10 @@ class AadharATMSkill(Skill):
     def _ollama_available(self) -> bool:
         if not importlib.util.find_spec("requests"):
             return False
-        import requests
+        from core import http_client
 
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=1)
+            response = http_client.get("http://localhost:11434/api/tags", timeout=1, retry=False)
             return response.status_code == 200
         except Exception:
             return False
@@ -177,7 +186,7 @@ class AadharATMSkill(Skill):
         if not screen_text or not self._ollama_available():
             return {}
         import json
-        import requests
+        from core import http_client
 
         prompt = (
             "You are analyzing ATM OCR text. Return JSON with keys "
@@ -186,25 +195,30 @@ class AadharATMSkill(Skill):
             f"OCR_TEXT:\n{screen_text}"
         )
 
-        try:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={"model": "llama3.2", "prompt": prompt, "stream": False},
-                timeout=6,
-            )
-            if response.status_code != 200:
+        def suggest():
+            try:
+                response = http_client.post(
+                    "http://localhost:11434/api/generate",
+                    json={"model": "llama3.2", "prompt": prompt, "stream": False,
+                          "keep_alive": KEEP_ALIVE},
+                    timeout=6,
+                )
+                if response.status_code != 200:
+                    return {}
+                data = response.json()
+                content = data.get("response", "{}")
+                parsed = json.loads(content)
+                return {
+                    "aadhar_labels": parsed.get("aadhar_labels", []),
+                    "amount_labels": parsed.get("amount_labels", []),
+                    "submit_labels": parsed.get("submit_labels", []),
+                    "print_labels": parsed.get("print_labels", []),
+                }
+            except Exception:
                 return {}
-            data = response.json()
-            content = data.get("response", "{}")
-            parsed = json.loads(content)
-            return {
-                "aadhar_labels": parsed.get("aadhar_labels", []),
-                "amount_labels": parsed.get("amount_labels", []),
-                "submit_labels": parsed.get("submit_labels", []),
-                "print_labels": parsed.get("print_labels", []),
-            }
-        except Exception:
-            return {}
+
+        # The same ATM screen always yields the same labels
+        return llm_cache.cached("llama3.2", prompt, suggest)
     
     def find_text_on_screen(self, search_text):
         """Find text on screen and return its position"""
@@ -253,10 +267,11 @@ class AadharATMSkill(Skill):
         """Wait until any keyword appears on screen."""
         start = time.time()
         while time.time() - start < timeout:
+            self._check_cancelled()
             text = self.read_screen_text(region="full")
             if any(keyword.lower() in text.lower() for keyword in keywords):
                 return True
-            time.sleep(1)
+            self._pause(1)
         return False
     
     def click_button(self, button_text):
@@ -351,10 +366,29 @@ class AadharATMSkill(Skill):
             print(f"Balance extraction error: {e}")
             return None
     
-    def aadhar_withdraw_money(self, aadhar_number: str, amount: str) -> str:
+    def _pause(self, seconds):
+        """time.sleep that ends early - raising WithdrawalCancelled - when the run is cancelled"""
+        cancel = self._cancel_event
+        if cancel is None:
+            time.sleep(seconds)
+        elif cancel.wait(seconds):
+            raise WithdrawalCancelled()
+    
+    def _check_cancelled(self):
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise WithdrawalCancelled()
+    
+    def aadhar_withdraw_money(self, aadhar_number: str, amount: str,
+                              progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                              cancel_event: Optional[threading.Event] = None) -> str:
         """
         Automatically fill Aadhar ATM form and withdraw money
         Reads screen, fills form, clicks buttons, and confirms withdrawal
+        
+        Args:
+            progress: Called from this thread with {"phase", "message", "elapsed_ms"}
+                for every step (GUIs marshal it to their UI thread)
+            cancel_event: Set it to stop the run at the next step or wait
         """
         
         if not pyautogui or not pytesseract:
@@ -378,9 +412,40 @@ Also install Tesseract OCR:
         
         self.aadhar_number = aadhar_number
         self.withdrawal_amount = amount
+        self._cancel_event = cancel_event
+        
+        steps_log = []
+        timings = []        # [phase, ms] - the last one is still running
+        run_start = time.perf_counter()
+        phase_start = [run_start]
+        
+        def note(message, phase=None):
+            """Log a step; a new phase closes the previous phase's timing"""
+            now = time.perf_counter()
+            if phase:
+                if timings:
+                    timings[-1][1] = (now - phase_start[0]) * 1000
+                timings.append([phase, None])
+                phase_start[0] = now
+            steps_log.append(message)
+            if progress:
+                try:
+                    progress({"phase": timings[-1][0] if timings else "", "message": message,
+                              "elapsed_ms": (now - run_start) * 1000})
+                except Exception as e:
+                    print(f"Progress callback error: {e}")
+            # Step boundaries are where a cancel takes effect
+            self._check_cancelled()
+        
+        def timing_report():
+            if timings and timings[-1][1] is None:
+                timings[-1][1] = (time.perf_counter() - phase_start[0]) * 1000
+            lines = [f"   {phase:<24} {ms / 1000:6.1f}s" for phase, ms in timings]
+            lines.append(f"   {'Total':<24} {(time.perf_counter() - run_start):6.1f}s")
+            return "⏱️  Step timings:\n" + "\n".join(lines)
         
         try:
-            steps_log = []
+            note("📖 Reading screen...", phase="reading screen")
             screen_text = self.read_screen_text_raw()
             suggested = self._ollama_suggest_labels(screen_text)
             aadhar_labels = ["Aadhar", "Aadhaar", "Card Number", "Number"]
@@ -395,104 +460,108 @@ Also install Tesseract OCR:
                 print_labels = suggested.get("print_labels", []) + print_labels
             
             # Step 1: Wait for screen to be ready
-            steps_log.append("⏳ Waiting for ATM screen...")
+            note("⏳ Waiting for ATM screen...", phase="waiting for screen")
             self.wait_for_keywords(["Aadhar", "Aadhaar", "UID", "Aadhaar Number"], timeout=8)
             
             # Step 2: Find and fill Aadhar number field
-            steps_log.append("🔍 Looking for Aadhar number field...")
+            note("🔍 Looking for Aadhar number field...", phase="aadhar field")
             aadhar_field = None
             for label in aadhar_labels:
                 aadhar_field = self.find_input_field(label)
                 if aadhar_field:
                     break
+                self._check_cancelled()
             
             if aadhar_field:
-                steps_log.append(f"✅ Found Aadhar field at {aadhar_field}")
-                steps_log.append(f"⌨️  Typing Aadhar number: {aadhar_number}")
+                note(f"✅ Found Aadhar field at {aadhar_field}")
+                note(f"⌨️  Typing Aadhar number: {aadhar_number[:4]}****{aadhar_number[-4:]}")
                 self.type_in_field(aadhar_field, aadhar_number)
-                time.sleep(0.5)
+                self._pause(0.5)
             else:
-                steps_log.append("⚠️  Aadhar field not found, trying manual position...")
+                note("⚠️  Aadhar field not found, trying manual position...")
                 # Fallback: click center-left area where Aadhar field usually is
                 screen_width, screen_height = pyautogui.size()
                 pyautogui.click(screen_width // 2, screen_height // 2 - 50)
-                time.sleep(0.3)
+                self._pause(0.3)
                 pyautogui.write(aadhar_number, interval=0.1)
             
             # Step 3: Find and fill amount field
-            steps_log.append("🔍 Looking for amount field...")
+            note("🔍 Looking for amount field...", phase="amount field")
             amount_field = None
             for label in amount_labels:
                 amount_field = self.find_input_field(label)
                 if amount_field:
                     break
+                self._check_cancelled()
             
             if amount_field:
-                steps_log.append(f"✅ Found amount field at {amount_field}")
-                steps_log.append(f"⌨️  Typing amount: ₹{amount}")
+                note(f"✅ Found amount field at {amount_field}")
+                note(f"⌨️  Typing amount: ₹{amount}")
                 self.type_in_field(amount_field, amount)
-                time.sleep(0.5)
+                self._pause(0.5)
             else:
-                steps_log.append("⚠️  Amount field not found, trying next field...")
+                note("⚠️  Amount field not found, trying next field...")
                 # Press Tab to go to next field
                 pyautogui.press('tab')
-                time.sleep(0.2)
+                self._pause(0.2)
                 pyautogui.write(amount, interval=0.1)
             
             # Step 4: Click Submit button
-            steps_log.append("🔍 Looking for Submit button...")
-            time.sleep(0.5)
+            note("🔍 Looking for Submit button...", phase="submit")
+            self._pause(0.5)
 
             submit_clicked = False
             for button_text in submit_labels:
                 if self.click_button(button_text):
-                    steps_log.append(f"✅ Clicked {button_text} button")
+                    note(f"✅ Clicked {button_text} button")
                     submit_clicked = True
                     break
+                self._check_cancelled()
 
             if not submit_clicked:
-                steps_log.append("⚠️  Submit button not found, pressing Enter...")
+                note("⚠️  Submit button not found, pressing Enter...")
                 pyautogui.press('enter')
 
             # Wait for biometric prompt
-            steps_log.append("🖐️  Waiting for fingerprint prompt (Morpho)...")
+            note("🖐️  Waiting for fingerprint prompt (Morpho)...", phase="biometric prompt")
             self.wait_for_keywords(["fingerprint", "biometric", "morpho"], timeout=20)
-            time.sleep(3)
+            self._pause(3)
 
             # Step 5: Read screen for confirmation and balance
-            steps_log.append("📖 Reading screen for confirmation...")
+            note("📖 Reading screen for confirmation...", phase="reading confirmation")
 
             extracted_amount = self.extract_amount_from_screen()
             remaining_balance = self.extract_balance_from_screen()
 
             # Step 6: Click Print button
-            steps_log.append("🔍 Looking for Print button...")
+            note("🔍 Looking for Print button...", phase="printing receipt")
 
             print_clicked = False
             for button_text in print_labels:
                 if self.click_button(button_text):
-                    steps_log.append(f"✅ Clicked {button_text} button")
+                    note(f"✅ Clicked {button_text} button")
                     print_clicked = True
                     break
+                self._check_cancelled()
 
             if not print_clicked:
-                steps_log.append("⚠️  Print button not found")
+                note("⚠️  Print button not found")
 
             # Wait for print dialog
-            time.sleep(1)
+            self._pause(1)
 
             # Step 7: Click OK on print dialog
-            steps_log.append("🔍 Looking for OK button...")
+            note("🔍 Looking for OK button...", phase="closing dialog")
 
             ok_clicked = False
             for button_text in ["OK", "Ok", "Close", "Done"]:
                 if self.click_button(button_text):
-                    steps_log.append(f"✅ Clicked {button_text} button")
+                    note(f"✅ Clicked {button_text} button")
                     ok_clicked = True
                     break
 
             if not ok_clicked:
-                steps_log.append("⚠️  OK button not found, pressing Enter...")
+                note("⚠️  OK button not found, pressing Enter...")
                 pyautogui.press('enter')
             
             # Build final response
@@ -512,6 +581,7 @@ Also install Tesseract OCR:
                 response += f"📉 Remaining Balance: ₹{remaining_balance}\n"
             
             response += f"\n📝 Aadhar: {aadhar_number[:4]}****{aadhar_number[-4:]}"
+            response += f"\n\n{timing_report()}"
             
             # Voice confirmation
             if importlib.util.find_spec("core.voice"):
@@ -525,12 +595,23 @@ Also install Tesseract OCR:
                     pass
             
             return response
+        
+        except WithdrawalCancelled:
+            cancelled_msg = "⏹️ Withdrawal cancelled\n\n"
+            cancelled_msg += "📋 Steps completed:\n"
+            cancelled_msg += "\n".join(f"   {step}" for step in steps_log)
+            cancelled_msg += f"\n\n{timing_report()}"
+            return cancelled_msg
             
         except Exception as e:
             error_msg = f"❌ Error during withdrawal: {str(e)}\n\n"
             error_msg += "📋 Steps completed:\n"
             error_msg += "\n".join(f"   {step}" for step in steps_log)
+            error_msg += f"\n\n{timing_report()}"
             return error_msg
+        
+        finally:
+            self._cancel_event = None
 
 
 # Create skill instance
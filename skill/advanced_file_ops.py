@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Callable
 from core.skill import Skill
 
 class AdvancedFileSkill(Skill):
+    serial = True  # Moves/renames files - order matters
+
     @property
     def name(self) -> str:
         return "advanced_file_skill"
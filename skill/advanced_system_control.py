@@ -26,6 +26,8 @@ from pathlib import Path
 class AdvancedSystemControl:
     """Advanced system control with cross-platform support"""
     
+    serial = True  # Window hotkeys (win+up, alt+f4, alt+tab) via pyautogui - keep calls ordered
+    
     def __init__(self):
         self.platform = platform.system().lower()
         self.app_paths = self.load_app_database()
@@ -27,6 +27,8 @@ class AIGamePlayer(Skill):
     - Path planning
     """
     
+    serial = True  # Controls mouse/keyboard
+    
     def __init__(self):
         super().__init__()
         self.is_playing = False
@@ -9,6 +9,7 @@ Supports Hinglish and English commands
 
 import re
 from skill.advanced_system_control import system_control
+from core.intent_router import OrderedPatternSet
 
 
 class AISystemController:
@@ -17,6 +18,8 @@ class AISystemController:
     def __init__(self):
         self.system = system_control
         self.command_patterns = self.build_command_patterns()
+        # All patterns in one regex, checked in the order above
+        self._command_matcher = OrderedPatternSet(self.command_patterns, re.IGNORECASE)
     
     def build_command_patterns(self):
         """Build command patterns for NLU"""
@@ -165,14 +168,13 @@ class AISystemController:
         """Understand natural language command"""
         command = command.lower().strip()
         
-        # Try to match patterns
-        for action, patterns in self.command_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    # Extract parameters if any
-                    params = match.groups() if match.groups() else None
-                    return action, params
+        # First action (in pattern order) with any matching pattern
+        matched = self._command_matcher.search(command)
+        if matched:
+            action, groups = matched
+            # Extract parameters if any
+            params = groups if groups else None
+            return action, params
         
         return None, None
     
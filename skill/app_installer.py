@@ -14,6 +14,8 @@ class AppInstallerSkill(Skill):
     - Linux: apt/snap/flatpak
     """
     
+    serial = True  # Installers share the system package manager
+    
     # Windows - Microsoft Store IDs
     WINDOWS_APPS = {
         # Social & Communication
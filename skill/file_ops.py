@@ -4,6 +4,8 @@ from typing import List, Dict, Any, Callable
 from core.skill import Skill
 
 class FileSkill(Skill):
+    serial = True  # Reads may depend on earlier writes
+
     @property
     def name(self) -> str:
         return "file_skill"
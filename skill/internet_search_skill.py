@@ -3,7 +3,7 @@ Internet Search Skill - Real-time web data collection
 Connects JARVIS to the internet for live information
 """
 
-import requests
+from core import http_client
 from bs4 import BeautifulSoup
 import json
 from typing import Dict, Any
@@ -97,7 +97,7 @@ class InternetSearchSkill:
                 "skip_disambig": 1
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10)
             data = response.json()
             
             # Extract relevant information
@@ -134,7 +134,7 @@ class InternetSearchSkill:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             url = f"https://www.google.com/search?q={query}"
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Try to extract featured snippet
@@ -164,7 +164,7 @@ class InternetSearchSkill:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_client.get(url, headers=headers, timeout=15)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Remove script and style elements
@@ -201,7 +201,7 @@ class InternetSearchSkill:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             
             # Extract video IDs from response
             import re
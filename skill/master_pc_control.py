@@ -24,6 +24,8 @@ from typing import List, Dict, Any
 class MasterPCControl:
     """Complete PC control with AI automation"""
     
+    serial = True  # Volume and media keys via pyautogui - keystrokes must not interleave
+    
     def __init__(self):
         self.name = "master_pc_control"
         self.os_type = platform.system()  # Windows, Darwin (Mac), Linux
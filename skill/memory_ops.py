@@ -1,39 +1,24 @@
-import os
 import json
 from typing import List, Dict, Any, Callable
 from core.skill import Skill
+from core.memory_store import memory_store, DEFAULT_NAMESPACE
+from core.recall import recall_index, fact_ref, fact_text
 
 class MemorySkill(Skill):
     """Skill for persistent memory storage and retrieval."""
     
+    # Cap on memories returned by list/search so a large store can't flood the prompt
+    list_limit = 100
+    
     def __init__(self):
-        # Store memory in user's home directory
-        self.memory_file = os.path.expanduser("~/.jarvic_memory.json")
-        self._ensure_memory_file()
+        # SQLite store in the user's home directory (migrates ~/.jarvic_memory.json once)
+        self.store = memory_store
+        self.recall = recall_index
     
     @property
     def name(self) -> str:
         return "memory_skill"
 
-    def _ensure_memory_file(self):
-        """Create memory file if it doesn't exist."""
-        if not os.path.exists(self.memory_file):
-            with open(self.memory_file, 'w') as f:
-                json.dump({}, f)
-
-    def _load_memory(self) -> dict:
-        """Load memory from file."""
-        try:
-            with open(self.memory_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-
-    def _save_memory(self, memory: dict):
-        """Save memory to file."""
-        with open(self.memory_file, 'w') as f:
-            json.dump(memory, f, indent=2)
-
     def get_tools(self) -> List[Dict[str, Any]]:
         return [
             {
@@ -51,6 +36,10 @@ class MemorySkill(Skill):
                             "value": {
                                 "type": "string",
                                 "description": "The information to remember"
+                            },
+                            "namespace": {
+                                "type": "string",
+                                "description": "Optional memory group (e.g., 'work', 'family'). Defaults to 'default'"
                             }
                         },
                         "required": ["key", "value"]
@@ -68,12 +57,58 @@ class MemorySkill(Skill):
                             "item_name": {
                                 "type": "string",
                                 "description": "The name of the item to retrieve (e.g., 'user_name')"
+                            },
+                            "namespace": {
+                                "type": "string",
+                                "description": "Optional memory group (e.g., 'work', 'family'). Defaults to 'default'"
                             }
                         },
                         "required": ["item_name"]
                     }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_memory",
+                    "description": "Search remembered facts and past conversations by meaning (e.g., 'when is mom's birthday')",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "What to recall, in natural language"
+                            },
+                            "k": {
+                                "type": "integer",
+                                "description": "Maximum number of results (default 5)"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_memories_text",
+                    "description": "Find stored memories whose key or value contains the exact given text",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Text to look for (e.g., 'birthday', 'mom')"
+                            },
+                            "namespace": {
+                                "type": "string",
+                                "description": "Optional memory group (e.g., 'work', 'family'). Defaults to 'default'"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
@@ -81,7 +116,12 @@ class MemorySkill(Skill):
                     "description": "List all stored memories and their keys",
                     "parameters": {
                         "type": "object",
-                        "properties": {},
+                        "properties": {
+                            "namespace": {
+                                "type": "string",
+                                "description": "Optional memory group (e.g., 'work', 'family'). Defaults to 'default'"
+                            }
+                        },
                         "required": []
                     }
                 }
@@ -97,6 +137,10 @@ class MemorySkill(Skill):
                             "key": {
                                 "type": "string",
                                 "description": "The identifier for the memory to delete"
+                            },
+                            "namespace": {
+                                "type": "string",
+                                "description": "Optional memory group (e.g., 'work', 'family'). Defaults to 'default'"
                             }
                         },
                         "required": ["key"]
@@ -109,25 +153,28 @@ class MemorySkill(Skill):
         return {
             "remember_fact": self.remember_fact,
             "retrieve_memory": self.retrieve_memory,
+            "search_memory": self.search_memory,
+            "search_memories_text": self.search_memories_text,
             "list_all_memories": self.list_all_memories,
             "forget_fact": self.forget_fact
         }
 
-    def remember_fact(self, key: str, value: str) -> str:
+    def remember_fact(self, key: str, value: str, namespace: str = DEFAULT_NAMESPACE) -> str:
         """
         Store a fact in memory.
         
         Args:
             key: Memory identifier
             value: Value to store
+            namespace: Memory group
             
         Returns:
             JSON string with status
         """
         try:
-            memory = self._load_memory()
-            memory[key] = value
-            self._save_memory(memory)
+            namespace = namespace or DEFAULT_NAMESPACE
+            self.store.set(key, value, namespace)
+            self.recall.add("fact", fact_ref(namespace, key), fact_text(key, value))
             
             return json.dumps({
                 "status": "success",
@@ -141,81 +188,170 @@ class MemorySkill(Skill):
                 "message": f"Failed to store memory: {str(e)}"
             })
 
-    def retrieve_memory(self, item_name: str) -> str:
+    def retrieve_memory(self, item_name: str, namespace: str = DEFAULT_NAMESPACE) -> str:
         """
         Retrieve a fact from memory.
+        Falls back to prefix, then substring matches when the exact key is unknown.
         
         Args:
             item_name: Memory identifier
+            namespace: Memory group
             
         Returns:
             JSON string with the stored value
         """
         try:
-            memory = self._load_memory()
+            namespace = namespace or DEFAULT_NAMESPACE
+            record = self.store.get(item_name, namespace)
             
-            if item_name in memory:
+            if record:
                 return json.dumps({
                     "status": "success",
                     "item_name": item_name,
-                    "value": memory[item_name]
+                    "value": record["value"],
+                    "updated_at": record["updated_at"]
                 })
-            else:
+            
+            matches = self.store.search_prefix(item_name, namespace, limit=10) or \
+                self.store.search(item_name, namespace, limit=10)
+            if matches:
                 return json.dumps({
-                    "status": "not_found",
-                    "message": f"I don't remember anything about '{item_name}'"
+                    "status": "success",
+                    "item_name": item_name,
+                    "message": f"No exact memory for '{item_name}', but found related ones",
+                    "matches": {m["key"]: m["value"] for m in matches}
                 })
+            
+            return json.dumps({
+                "status": "not_found",
+                "message": f"I don't remember anything about '{item_name}'"
+            })
         except Exception as e:
             return json.dumps({
                 "status": "error",
                 "message": f"Failed to recall memory: {str(e)}"
             })
 
-    def list_all_memories(self) -> str:
+    def search_memory(self, query: str, k: int = 5) -> str:
+        """
+        Semantic search over remembered facts and past conversation turns.
+        Falls back to substring search when the vector index is unavailable.
+        
+        Args:
+            query: Natural language description of what to recall
+            k: Maximum number of results
+            
+        Returns:
+            JSON string with the most relevant snippets
+        """
+        try:
+            k = max(1, min(int(k or 5), 20))
+            if not self.recall.enabled:
+                return self.search_memories_text(query)
+            
+            results = self.recall.search(query, k=k)
+            if not results:
+                return json.dumps({
+                    "status": "not_found",
+                    "message": f"I don't remember anything related to '{query}'"
+                })
+            
+            return json.dumps({
+                "status": "success",
+                "count": len(results),
+                "results": [
+                    {"type": r["kind"], "text": r["text"], "score": r["score"]}
+                    for r in results
+                ]
+            }, ensure_ascii=False)
+        except Exception as e:
+            return json.dumps({
+                "status": "error",
+                "message": f"Failed to search memory: {str(e)}"
+            })
+
+    def search_memories_text(self, query: str, namespace: str = DEFAULT_NAMESPACE) -> str:
         """
-        List all stored memories.
+        Search memories by substring of key or value.
         
+        Args:
+            query: Text to search for
+            namespace: Memory group
+            
         Returns:
-            JSON string with all memories
+            JSON string with matching memories
         """
         try:
-            memory = self._load_memory()
+            matches = self.store.search(query, namespace or DEFAULT_NAMESPACE, limit=self.list_limit)
             
-            if not memory:
+            if not matches:
+                return json.dumps({
+                    "status": "not_found",
+                    "message": f"I don't have any memories matching '{query}'"
+                })
+            
+            return json.dumps({
+                "status": "success",
+                "count": len(matches),
+                "memories": {m["key"]: m["value"] for m in matches}
+            })
+        except Exception as e:
+            return json.dumps({
+                "status": "error",
+                "message": f"Failed to search memories: {str(e)}"
+            })
+
+    def list_all_memories(self, namespace: str = DEFAULT_NAMESPACE) -> str:
+        """
+        List stored memories (most recently updated first).
+        
+        Args:
+            namespace: Memory group
+            
+        Returns:
+            JSON string with memories
+        """
+        try:
+            namespace = namespace or DEFAULT_NAMESPACE
+            total = self.store.count(namespace)
+            
+            if not total:
                 return json.dumps({
                     "status": "success",
                     "message": "I don't have any memories stored yet",
                     "memories": {}
                 })
             
-            return json.dumps({
+            records = self.store.all(namespace, limit=self.list_limit)
+            result = {
                 "status": "success",
-                "count": len(memory),
-                "memories": memory
-            })
+                "count": total,
+                "memories": {r["key"]: r["value"] for r in records}
+            }
+            if total > len(records):
+                result["message"] = f"Showing the {len(records)} most recent of {total} memories"
+            return json.dumps(result)
         except Exception as e:
             return json.dumps({
                 "status": "error",
                 "message": f"Failed to list memories: {str(e)}"
             })
 
-    def forget_fact(self, key: str) -> str:
+    def forget_fact(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> str:
         """
         Delete a memory.
         
         Args:
             key: Memory identifier to delete
+            namespace: Memory group
             
         Returns:
             JSON string with status
         """
         try:
-            memory = self._load_memory()
-            
-            if key in memory:
-                del memory[key]
-                self._save_memory(memory)
-                
+            namespace = namespace or DEFAULT_NAMESPACE
+            if self.store.delete(key, namespace):
+                self.recall.remove("fact", fact_ref(namespace, key))
                 return json.dumps({
                     "status": "success",
                     "message": f"I have forgotten about '{key}'"
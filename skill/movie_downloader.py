@@ -2,7 +2,7 @@ import os
 import json
 import subprocess
 import time
-import requests
+from core import http_client
 from typing import List, Dict, Any, Callable
 from core.skill import Skill
 from bs4 import BeautifulSoup
@@ -20,6 +20,8 @@ class MovieDownloaderSkill(Skill):
     - Play in VLC player
     """
     
+    serial = True  # Drives a browser and launches VLC
+    
     @property
     def name(self) -> str:
         return "movie_downloader"
@@ -217,7 +219,7 @@ class MovieDownloaderSkill(Skill):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, stream=True)
+            response = http_client.get(url, headers=headers, stream=True)
             total_size = int(response.headers.get('content-length', 0))
             
             with open(save_path, 'wb') as f:
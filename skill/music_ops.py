@@ -2,7 +2,7 @@ import webbrowser
 import json
 import sys
 import random
-import requests
+from core import http_client
 import time
 import threading
 import atexit
@@ -18,6 +18,8 @@ class MusicSkill(Skill):
     Automatically fetches latest popular songs from YouTube and plays them
     """
     
+    serial = True  # Starts playback in the browser/player
+    
     # Class variable to store active driver instances
     active_drivers = []
     
@@ -169,7 +171,7 @@ class MusicSkill(Skill):
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers, timeout=10)
             
             # Extract video titles from response
             import re
@@ -7,6 +7,8 @@ from core.skill import Skill
 class ScreenshotSkill(Skill):
     """Skill for taking screenshots on macOS."""
     
+    serial = True  # Captures whatever the other UI tools just put on screen
+    
     def __init__(self):
         # Default screenshot directory
         self.screenshot_dir = os.path.expanduser("~/Desktop/JARVIC_Screenshots")
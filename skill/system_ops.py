@@ -9,6 +9,8 @@ from typing import List, Dict, Any, Callable
 from core.skill import Skill
 
 class SystemSkill(Skill):
+    serial = True  # Changes volume/brightness and launches apps
+
     @property
     def name(self) -> str:
         return "system_skill"
@@ -23,6 +25,21 @@ class SystemSkill(Skill):
                     "parameters": { "type": "object", "properties": { "level": {"type": "integer"} }, "required": ["level"] }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "adjust_volume",
+                    "description": "Turn the system volume up or down by a step (e.g. 'volume badhao', 'awaz kam karo')",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "direction": {"type": "string", "enum": ["up", "down"]},
+                            "step": {"type": "integer", "description": "Percent to change by (default 10)"}
+                        },
+                        "required": ["direction"]
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
@@ -62,6 +79,7 @@ class SystemSkill(Skill):
     def get_functions(self) -> Dict[str, Callable]:
         return {
             "set_volume": self.set_volume,
+            "adjust_volume": self.adjust_volume,
             "open_app": self.open_app,
             "open_system_location": self.open_system_location
         }
@@ -90,6 +108,36 @@ class SystemSkill(Skill):
         except Exception as e:
             return json.dumps({"error": str(e)})
 
+    def adjust_volume(self, direction, step=10):
+        try:
+            system = platform.system()
+            delta = step if direction == "up" else -step
+            
+            if system == "Darwin":  # macOS
+                os.system(
+                    "osascript -e 'set volume output volume "
+                    f"((output volume of (get volume settings)) + {delta})'"
+                )
+                return json.dumps({"status": "success", "direction": direction, "step": step})
+            elif system == "Windows":
+                from ctypes import cast, POINTER
+                from comtypes import CLSCTX_ALL
+                from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+                
+                devices = AudioUtilities.GetSpeakers()
+                interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+                volume_obj = cast(interface, POINTER(IAudioEndpointVolume))
+                current = round(volume_obj.GetMasterVolumeLevelScalar() * 100)
+                level = max(0, min(100, current + delta))
+                volume_obj.SetMasterVolumeLevelScalar(level / 100, None)
+                return json.dumps({"status": "success", "direction": direction, "level": level})
+            elif system == "Linux":
+                os.system(f"amixer -D pulse sset Master {step}%{'+' if delta > 0 else '-'}")
+            
+            return json.dumps({"status": "success", "direction": direction, "step": step})
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
     def _find_app_in_registry(self, app_name):
         """
         Search Windows Registry for installed application paths
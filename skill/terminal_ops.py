@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Callable
 from core.skill import Skill
 
 class TerminalSkill(Skill):
+    serial = True  # Commands may depend on earlier ones (cd, mkdir...)
+
     @property
     def name(self) -> str:
         return "terminal_skill"
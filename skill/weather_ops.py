@@ -75,7 +75,7 @@ class WeatherSkill(Skill):
             })
         
         try:
-            import requests
+            from core import http_client
             
             url = f"http://api.openweathermap.org/data/2.5/weather"
             params = {
@@ -93,7 +93,7 @@ class WeatherSkill(Skill):
             else:
                 params["q"] = city
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
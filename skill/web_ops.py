@@ -2,12 +2,14 @@ import webbrowser
 import json
 import sys
 import random
-import requests
+from core import http_client
 import time
 from typing import List, Dict, Any, Callable
 from core.skill import Skill
 
 class WebSkill(Skill):
+    serial = True  # Opens browser tabs in the order requested
+
     @property
     def name(self) -> str:
         return "web_skill"
@@ -124,7 +126,7 @@ class WebSkill(Skill):
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 }
                 
-                response = requests.get(url, headers=headers, timeout=5)
+                response = http_client.get(url, headers=headers, timeout=5)
                 
                 # Extract video titles
                 import re
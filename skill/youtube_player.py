@@ -25,6 +25,8 @@ class YouTubePlayerSkill(Skill):
     Uses Selenium for automation
     """
     
+    serial = True  # Drives a browser window
+    
     # Trending songs database (updated regularly)
     TRENDING_SONGS = [
         "Tauba Tauba Bad Newz",